@@ -1,4 +1,9 @@
 from django.contrib import admin
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from artvault.paginators import EstimatedCountPaginator
+from artworks.models import Artwork
 from .models import Artist
 
 
@@ -8,7 +13,20 @@ class ArtistAdmin(admin.ModelAdmin):
     list_filter = ('nationality',)
     search_fields = ('name', 'biography')
     readonly_fields = ('created_at', 'updated_at')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # A correlated subquery is evaluated only for the rows on the page,
+        # where a JOIN + GROUP BY would aggregate the whole artwork table.
+        artwork_count = (
+            Artwork.objects.filter(artist=OuterRef('pk')).order_by()
+            .values('artist').annotate(n=Count('pk')).values('n')
+        )
+        return super().get_queryset(request).annotate(
+            artwork_total=Coalesce(Subquery(artwork_count, output_field=IntegerField()), 0),
+        )
 
+    @admin.display(description='Artworks', ordering='artwork_total')
     def get_artwork_count(self, obj):
-        return obj.get_artwork_count()
-    get_artwork_count.short_description = 'Artworks'
+        return obj.artwork_total
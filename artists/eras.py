@@ -0,0 +1,200 @@
+"""
+Era browsing: artists active in a period and artworks made in it.
+
+An artist is active from their birth year to their death year, or to this
+year while alive. A B-tree index cannot search intervals like that, so
+each artist who has died gets one ``ArtistDecade`` row per decade they
+lived in, with a copy of their nationality. "French artists active in the
+1870s" is then a single range scan of the (nationality, decade) index,
+joined to the artists it finds; an exact year is checked against the
+artists' own years afterwards. Living artists have no rows, which would
+stop at the current decade and go stale when the next one starts; they
+are matched by birth year, since they are active every year since. An artwork has a single year, so artwork periods are
+plain ranges on the indexed ``year_created``.
+
+Timelines of the whole catalogue are the same for every visitor and are
+cached for a few minutes; filtered ones are counted on each request.
+Kiosks, whose snapshot has no decade rows, filter on the artists' years
+alone and show no artist timeline.
+
+Decade rows are rewritten whenever an artist's years or nationality are
+saved. Bulk loads are caught up by ``manage.py rebuild_artist_decades``.
+"""
+from django.conf import settings
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Artist, ArtistDecade
+
+DECADE = 10
+CENTURY = 100
+FIRST_YEAR = 1000
+BATCH_SIZE = 2000
+TIMELINE_CACHE_SECONDS = 600
+
+
+def period_start(year, size=DECADE):
+    return year // size * size
+
+
+def artist_decades(birth_year, death_year):
+    """The first year of each decade someone born and died in these years was alive in; none while alive."""
+    if death_year is None:
+        return []
+    return list(range(period_start(birth_year), period_start(death_year) + 1, DECADE))
+
+
+def _decade_rows(pk, birth_year, death_year, nationality):
+    return [
+        ArtistDecade(artist_id=pk, decade=decade, nationality=nationality)
+        for decade in artist_decades(birth_year, death_year)
+    ]
+
+
+def sync_artist_decades(artist):
+    """Bring one artist's decade rows in line with their years and nationality."""
+    with transaction.atomic():
+        ArtistDecade.objects.filter(artist=artist).delete()
+        ArtistDecade.objects.bulk_create(
+            _decade_rows(artist.pk, artist.birth_year, artist.death_year, artist.nationality)
+        )
+
+
+def rebuild_artist_decades(batch_size=BATCH_SIZE):
+    """Rewrite the decade rows of every artist, a batch per transaction; returns the rows written."""
+    written, last_pk = 0, 0
+    while True:
+        batch = list(
+            Artist.objects.filter(pk__gt=last_pk).order_by('pk')
+            .values_list('pk', 'birth_year', 'death_year', 'nationality')[:batch_size]
+        )
+        if not batch:
+            return written
+        last_pk = batch[-1][0]
+        with transaction.atomic():
+            ArtistDecade.objects.filter(artist_id__in=[row[0] for row in batch]).delete()
+            rows = [decade for row in batch for decade in _decade_rows(*row)]
+            ArtistDecade.objects.bulk_create(rows, batch_size=batch_size)
+        written += len(rows)
+
+
+def parse_years(year_from, year_to):
+    """(first, last) year of a period from form input, or None if neither end is given."""
+    if year_from is None and year_to is None:
+        return None
+    first = FIRST_YEAR if year_from is None else year_from
+    last = timezone.now().year if year_to is None else year_to
+    return min(first, last), max(first, last)
+
+
+def artists_active(queryset, first, last, nationality=''):
+    """Artists of ``queryset`` alive at some point from ``first`` to ``last``."""
+    if nationality:
+        queryset = queryset.filter(nationality=nationality)
+    active = Q(death_year__gte=first)
+    # Kiosks have no decade table, so the artists' own years are all there is.
+    if not settings.CATALOGUE_SNAPSHOT_READS:
+        decades = ArtistDecade.objects.filter(decade__range=(period_start(first), period_start(last)))
+        if nationality:
+            decades = decades.filter(nationality=nationality)
+        active &= Q(pk__in=decades.values('artist'))
+    if first <= timezone.now().year:
+        active |= Q(death_year__isnull=True)
+    return queryset.filter(active, birth_year__lte=last)
+
+
+def artworks_made(queryset, first, last):
+    """Artworks of ``queryset`` made from ``first`` to ``last``."""
+    return queryset.filter(year_created__range=(first, last))
+
+
+# ─── Timelines ───────────────────────────────────────────────────────────────
+
+def _chart_window(period):
+    """(bucket size, first, last year) to chart: centuries overall, decades of the centuries in view."""
+    if period is None or period[1] - period[0] >= CENTURY:
+        return CENTURY, None, None
+    return DECADE, period_start(period[0], CENTURY), period_start(period[1], CENTURY) + CENTURY - 1
+
+
+def _label(start, size):
+    if size == DECADE:
+        return f'{start}s'
+    number = start // CENTURY + 1
+    suffix = 'th' if 10 <= number % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(number % 10, 'th')
+    return f'{number}{suffix} c.'
+
+
+def _bars(counts, size, first, last, period):
+    """(first year, last year, label, count, height %, selected) per bucket, gaps filled with zeros."""
+    counts = dict(counts)
+    if not counts:
+        return []
+    first = min(counts) if first is None else first
+    last = max(counts) + size - 1 if last is None else last
+    tallest = max(counts.values())
+    bars = []
+    for start in range(period_start(first, size), last + 1, size):
+        count = counts.get(start, 0)
+        selected = period is not None and start <= period[1] and start + size - 1 >= period[0]
+        bars.append((start, start + size - 1, _label(start, size), count, round(100 * count / tallest), selected))
+    return bars
+
+
+def _living_counts(nationality, size):
+    """{bucket start: living artists born by its end}, from the earliest birth to this year's bucket."""
+    artists = Artist.objects.filter(death_year__isnull=True).order_by()
+    if nationality:
+        artists = artists.filter(nationality=nationality)
+    born = dict(
+        artists.annotate(bucket=F('birth_year') / size * size).values_list('bucket')
+        .annotate(artists=Count('pk'))
+    )
+    counts, running = {}, 0
+    for start in range(min(born, default=0), period_start(timezone.now().year, size) + 1, size):
+        running += born.get(start, 0)
+        if running:
+            counts[start] = running
+    return counts
+
+
+def artist_timeline(nationality='', period=None):
+    """Bars counting the artists active in each century, or each decade around ``period``."""
+    size, first, last = _chart_window(period)
+    rows = ArtistDecade.objects.order_by()
+    if nationality:
+        rows = rows.filter(nationality=nationality)
+    if size == DECADE:
+        # One row per artist and decade, so rows are artists.
+        counts = rows.filter(decade__range=(first, last)).values_list('decade').annotate(artists=Count('pk'))
+    else:
+        counts = (
+            rows.annotate(century=F('decade') / CENTURY * CENTURY).values_list('century')
+            .annotate(artists=Count('artist', distinct=True))
+        )
+    # Decade rows cover artists who have died; the living are counted from their birth years.
+    counts = Counter(dict(counts))
+    counts.update(_living_counts(nationality, size))
+    return _bars(counts, size, first, last, period)
+
+
+def artwork_timeline(queryset, period=None):
+    """Bars counting the artworks of ``queryset`` made in each century, or each decade around ``period``."""
+    size, first, last = _chart_window(period)
+    rows = queryset.order_by()
+    if size == DECADE:
+        rows = artworks_made(rows, first, last)
+    counts = (
+        rows.annotate(bucket=F('year_created') / size * size).values_list('bucket')
+        .annotate(artworks=Count('pk'))
+    )
+    return _bars(counts, size, first, last, period)
+
+
+def cached_timeline(name, build):
+    """A whole-catalogue timeline from ``build()``, shared by all visitors for a few minutes."""
+    return cache.get_or_set(f'eras:{name}', build, TIMELINE_CACHE_SECONDS)
@@ -1,6 +1,7 @@
 from django import forms
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from .eras import FIRST_YEAR, parse_years
 from .models import Artist
 
 
@@ -85,3 +86,24 @@ class ArtistReadOnlyForm(ArtistForm):
         )
         if self.instance and self.instance.pk:
             self.fields['created_at'].initial = self.instance.created_at.strftime('%d %B %Y')
+
+
+class EraFilterForm(forms.Form):
+    """Year range filter for the artist and artwork lists; ``period`` is (first, last) or None."""
+    year_from = forms.IntegerField(
+        required=False,
+        min_value=FIRST_YEAR,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'From year'}),
+        label='From Year',
+    )
+    year_to = forms.IntegerField(
+        required=False,
+        min_value=FIRST_YEAR,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'To year'}),
+        label='To Year',
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        cleaned_data['period'] = parse_years(cleaned_data.get('year_from'), cleaned_data.get('year_to'))
+        return cleaned_data
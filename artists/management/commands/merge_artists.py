@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from artists.matching import merge_artists
+from artists.models import Artist
+
+
+class Command(BaseCommand):
+    help = 'Merge duplicate artists into one, moving all of their artworks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('keeper', type=int, help='The artist to keep.')
+        parser.add_argument('duplicates', type=int, nargs='+', help='Artists to merge into the keeper.')
+
+    def handle(self, *args, **options):
+        try:
+            moved = merge_artists(options['keeper'], options['duplicates'])
+        except Artist.DoesNotExist as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f'Moved {moved} artworks to artist #{options["keeper"]} and removed '
+            f'{len(set(options["duplicates"]) - {options["keeper"]})} duplicates.'
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from artists.eras import BATCH_SIZE, rebuild_artist_decades
+
+
+class Command(BaseCommand):
+    help = (
+        'Rewrite the per-decade rows behind era browsing, e.g. after bulk loads or at the turn '
+        'of a decade, when living artists become active in the new one.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Artists per transaction.')
+
+    def handle(self, *args, **options):
+        written = rebuild_artist_decades(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} artist decade rows'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from artists.matching import DEFAULT_THRESHOLD, suggest_merges
+from artists.models import Artist
+
+
+class Command(BaseCommand):
+    help = 'Report artists that are probably the same person entered more than once.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help='Minimum match score (0–1) to suggest a merge.')
+
+    def handle(self, *args, **options):
+        suggestions = suggest_merges(options['threshold'])
+        pks = {pk for keeper, duplicates, _score in suggestions for pk in (keeper, *duplicates)}
+        artists = Artist.objects.only('pk', 'name', 'birth_year').in_bulk(pks)
+        for keeper, duplicates, score in suggestions:
+            self.stdout.write(f'[{score:.2f}] keep #{keeper} {artists[keeper].name} (b. {artists[keeper].birth_year})')
+            for pk in duplicates:
+                self.stdout.write(f'         merge #{pk} {artists[pk].name} (b. {artists[pk].birth_year})')
+            self.stdout.write(f'         python manage.py merge_artists {keeper} {" ".join(map(str, duplicates))}')
+        self.stdout.write(self.style.SUCCESS(f'{len(suggestions)} merge suggestions.'))
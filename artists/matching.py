@@ -0,0 +1,187 @@
+"""
+Fuzzy matching of artist names for de-duplication and imports.
+
+Names are normalised ("Monet, Claude" -> "claude monet") and blocked on the
+Soundex code of the surname plus the first initial, which is stored on
+``Artist.match_key``. Only artists sharing a block are ever compared, so a
+lookup is one indexed query and the merge report is a single ordered scan.
+"""
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from itertools import combinations, groupby
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+DEFAULT_THRESHOLD = 0.85
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'), **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'), 'l': '4', **dict.fromkeys('mn', '5'), 'r': '6',
+}
+
+
+def normalise_name(name):
+    """Lower-case, strip accents and punctuation, and undo "Surname, Given" order."""
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c)).lower()
+    if ',' in name:
+        surname, _, given = name.partition(',')
+        name = f'{given} {surname}'
+    return ' '.join(re.findall(r'[a-z0-9]+', name))
+
+
+def soundex(word):
+    if not word:
+        return ''
+    code, previous = word[0], SOUNDEX_CODES.get(word[0], '')
+    for char in word[1:]:
+        digit = SOUNDEX_CODES.get(char, '')
+        if digit and digit != previous:
+            code += digit
+        if char not in 'hw':
+            previous = digit
+    return (code + '000')[:4]
+
+
+def match_key(name):
+    tokens = normalise_name(name).split()
+    if not tokens:
+        return ''
+    initial = tokens[0][0] if len(tokens) > 1 else ''
+    return f'{soundex(tokens[-1])}{initial}'
+
+
+def _given_similarity(given, other):
+    if not given or not other:
+        return 0.8
+    scores = []
+    for a, b in zip(given, other):
+        if len(a) == 1 or len(b) == 1:
+            scores.append(1.0 if a[0] == b[0] else 0.0)
+        else:
+            scores.append(SequenceMatcher(None, a, b).ratio())
+    return sum(scores) / len(scores) - 0.05 * abs(len(given) - len(other))
+
+
+def match_score(name, birth_year, other_name, other_birth_year):
+    """Similarity in [0, 1] of two artists from their names and birth years."""
+    tokens, other = normalise_name(name).split(), normalise_name(other_name).split()
+    if not tokens or not other:
+        return 0.0
+    if tokens == other:
+        score = 1.0
+    else:
+        surname = SequenceMatcher(None, tokens[-1], other[-1]).ratio()
+        score = 0.6 * surname + 0.4 * _given_similarity(tokens[:-1], other[:-1])
+    if birth_year and other_birth_year:
+        gap = abs(birth_year - other_birth_year)
+        if gap == 0:
+            score = min(1.0, score + 0.1)
+        elif gap > 2:
+            score *= 0.5
+    return max(score, 0.0)
+
+
+def find_matching_artist(name, birth_year=None, threshold=DEFAULT_THRESHOLD):
+    """Best existing (artist, score) for an incoming name, or None."""
+    from .models import Artist
+    key = match_key(name)
+    if not key:
+        return None
+    candidates = Artist.objects.filter(match_key=key).only('pk', 'name', 'birth_year')
+    scored = [
+        (match_score(name, birth_year, artist.name, artist.birth_year), artist)
+        for artist in candidates
+    ]
+    scored = [(score, artist) for score, artist in scored if score >= threshold]
+    if not scored:
+        return None
+    score, artist = max(scored, key=lambda item: (item[0], -item[1].pk))
+    return artist, score
+
+
+def suggest_merges(threshold=DEFAULT_THRESHOLD):
+    """Group likely duplicate artists into clusters.
+
+    Returns a list of (keeper pk, [duplicate pks], best pair score), where
+    the keeper is the artist with the most artworks in its cluster.
+    """
+    from .models import Artist
+    rows = (
+        Artist.objects.exclude(match_key='').order_by('match_key', 'pk')
+        .values_list('pk', 'name', 'birth_year', 'match_key').iterator(chunk_size=5000)
+    )
+    parent, edges = {}, []
+
+    def root(pk):
+        while parent.get(pk, pk) != pk:
+            pk = parent[pk]
+        return pk
+
+    for _key, block in groupby(rows, key=lambda row: row[3]):
+        for (pk, name, year, _), (other, other_name, other_year, _) in combinations(list(block), 2):
+            score = match_score(name, year, other_name, other_year)
+            if score >= threshold:
+                edges.append((pk, other, score))
+                a, b = root(pk), root(other)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+    clusters, best = {}, {}
+    for pk, other, score in edges:
+        cluster = root(pk)
+        clusters.setdefault(cluster, set()).update((pk, other))
+        best[cluster] = max(best.get(cluster, 0), score)
+    members = {pk for cluster in clusters.values() for pk in cluster}
+    artwork_counts = dict(
+        Artist.objects.filter(pk__in=members).annotate(n=Count('artworks')).values_list('pk', 'n')
+    )
+    suggestions = []
+    for cluster_root, cluster in clusters.items():
+        keeper = max(cluster, key=lambda pk: (artwork_counts.get(pk, 0), -pk))
+        suggestions.append((keeper, sorted(cluster - {keeper}), best[cluster_root]))
+    return sorted(suggestions, key=lambda suggestion: (-suggestion[2], suggestion[0]))
+
+
+def merge_artists(keeper_pk, duplicate_pks):
+    """Re-point every artwork of ``duplicate_pks`` to the keeper and delete the duplicates.
+
+    Artworks move in a single UPDATE; the keeper inherits any details it is
+    missing. Returns the number of artworks moved.
+    """
+    from artworks.models import Artwork
+    from artworks.valuations import record_artwork_valuations
+    from changefeed.feed import record_many
+    from changefeed.models import Change
+    from .models import Artist
+    duplicate_pks = [pk for pk in duplicate_pks if pk != keeper_pk]
+    if not duplicate_pks:
+        return 0
+    with transaction.atomic():
+        artists = Artist.objects.select_for_update().in_bulk([keeper_pk, *duplicate_pks])
+        missing = {keeper_pk, *duplicate_pks} - set(artists)
+        if missing:
+            raise Artist.DoesNotExist(f'No artist with pk {", ".join(map(str, sorted(missing)))}')
+        keeper = artists[keeper_pk]
+        updated = []
+        for pk in duplicate_pks:
+            duplicate = artists[pk]
+            for field in ('death_year', 'profile_image_url'):
+                if not getattr(keeper, field) and getattr(duplicate, field):
+                    setattr(keeper, field, getattr(duplicate, field))
+                    updated.append(field)
+            if len(duplicate.biography) > len(keeper.biography):
+                keeper.biography = duplicate.biography
+                updated.append('biography')
+        moved_pks = list(Artwork.objects.filter(artist_id__in=duplicate_pks).values_list('pk', flat=True))
+        moved = Artwork.objects.filter(pk__in=moved_pks).update(
+            artist_id=keeper_pk, updated_at=timezone.now(),
+        )
+        record_many(Artwork, moved_pks, Change.Action.UPDATED)
+        record_artwork_valuations(moved_pks)
+        if updated:
+            keeper.save(update_fields=[*set(updated), 'updated_at'])
+        Artist.objects.filter(pk__in=duplicate_pks).delete()
+    return moved
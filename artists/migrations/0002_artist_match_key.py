@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:22
+
+from django.db import migrations, models
+
+
+def populate_match_keys(apps, schema_editor):
+    from artists.matching import match_key
+    Artist = apps.get_model('artists', 'Artist')
+    batch = []
+    for artist in Artist.objects.only('pk', 'name').iterator(chunk_size=2000):
+        artist.match_key = match_key(artist.name)
+        batch.append(artist)
+        if len(batch) == 2000:
+            Artist.objects.bulk_update(batch, ['match_key'])
+            batch = []
+    Artist.objects.bulk_update(batch, ['match_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artist',
+            name='match_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Blocking key for fuzzy name matching, derived from the name.', max_length=8),
+        ),
+        migrations.RunPython(populate_match_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:40
+
+import django.db.models.functions.text
+import django.db.models.lookups
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0002_artist_match_key'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='artist',
+            constraint=models.CheckConstraint(condition=django.db.models.lookups.GreaterThanOrEqual(django.db.models.functions.text.Length('name'), 2), name='artist_name_min_length', violation_error_message='The name must be at least 2 characters long.'),
+        ),
+        migrations.AddConstraint(
+            model_name='artist',
+            constraint=models.CheckConstraint(condition=models.Q(('birth_year__gte', 1000)), name='artist_birth_year_min', violation_error_message='Birth year must be 1000 or later.'),
+        ),
+        migrations.AddConstraint(
+            model_name='artist',
+            constraint=models.CheckConstraint(condition=models.Q(('death_year__isnull', True), ('death_year__gte', models.F('birth_year')), _connector='OR'), name='artist_death_year_after_birth_year', violation_error_message='Death year cannot be before birth year.'),
+        ),
+        migrations.AddConstraint(
+            model_name='artist',
+            constraint=models.CheckConstraint(condition=django.db.models.lookups.GreaterThanOrEqual(django.db.models.functions.text.Length('biography'), 20), name='artist_biography_min_length', violation_error_message='The biography must be at least 20 characters long.'),
+        ),
+    ]
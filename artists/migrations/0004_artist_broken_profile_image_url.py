@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0003_artist_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artist',
+            name='broken_profile_image_url',
+            field=models.URLField(blank=True, editable=False, help_text='Set by check_image_urls to the profile image URL when it stopped loading.'),
+        ),
+    ]
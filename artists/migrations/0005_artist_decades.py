@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_artist_decades(apps, schema_editor):
+    from artists.eras import artist_decades
+    Artist = apps.get_model('artists', 'Artist')
+    ArtistDecade = apps.get_model('artists', 'ArtistDecade')
+    batch = []
+    for pk, birth_year, death_year, nationality in (
+        Artist.objects.order_by('pk').values_list('pk', 'birth_year', 'death_year', 'nationality').iterator(chunk_size=2000)
+    ):
+        batch.extend(
+            ArtistDecade(artist_id=pk, decade=decade, nationality=nationality)
+            for decade in artist_decades(birth_year, death_year)
+        )
+        if len(batch) >= 2000:
+            ArtistDecade.objects.bulk_create(batch)
+            batch = []
+    ArtistDecade.objects.bulk_create(batch)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0004_artist_broken_profile_image_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtistDecade',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('decade', models.PositiveSmallIntegerField(help_text='First year of the decade, e.g. 1870.')),
+                ('nationality', models.CharField(help_text="Copy of the artist's nationality, so nationality and era filter on one index.", max_length=50)),
+            ],
+            options={
+                'verbose_name': 'Artist Decade',
+                'verbose_name_plural': 'Artist Decades',
+                'ordering': ['decade'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='artist',
+            index=models.Index(fields=['nationality', 'name'], name='artist_nationality_name'),
+        ),
+        migrations.AddField(
+            model_name='artistdecade',
+            name='artist',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='decades', to='artists.artist'),
+        ),
+        migrations.AddIndex(
+            model_name='artistdecade',
+            index=models.Index(fields=['nationality', 'decade', 'artist'], name='artist_decade_nationality'),
+        ),
+        migrations.AddConstraint(
+            model_name='artistdecade',
+            constraint=models.UniqueConstraint(fields=('decade', 'artist'), name='artist_decade_unique'),
+        ),
+        migrations.RunPython(populate_artist_decades, migrations.RunPython.noop),
+    ]
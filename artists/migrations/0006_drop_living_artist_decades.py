@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:45
+
+from django.db import migrations
+
+
+def drop_living_artist_decades(apps, schema_editor):
+    # Living artists are now matched by birth year instead of decade rows.
+    ArtistDecade = apps.get_model('artists', 'ArtistDecade')
+    ArtistDecade.objects.filter(artist__death_year__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0005_artist_decades'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_living_artist_decades, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,13 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Length
+from django.db.models.lookups import GreaterThanOrEqual
 from django.core.validators import MinLengthValidator, MaxValueValidator, MinValueValidator
 from django.utils import timezone
+from artvault.concurrency import OptimisticLockMixin
 
 
-class Artist(models.Model):
+class Artist(OptimisticLockMixin, models.Model):
 
     class Nationality(models.TextChoices):
         AMERICAN = 'American', 'American'
@@ -46,6 +50,18 @@ class Artist(models.Model):
         blank=True,
         help_text='Optional URL to the artist\'s profile image.',
     )
+    broken_profile_image_url = models.URLField(
+        blank=True,
+        editable=False,
+        help_text='Set by check_image_urls to the profile image URL when it stopped loading.',
+    )
+    match_key = models.CharField(
+        max_length=8,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text='Blocking key for fuzzy name matching, derived from the name.',
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -53,10 +69,56 @@ class Artist(models.Model):
         ordering = ['name']
         verbose_name = 'Artist'
         verbose_name_plural = 'Artists'
+        # The field validators and clean(), enforced by the database too so
+        # that bulk writes can skip full_clean() (see artvault.bulk).
+        constraints = [
+            models.CheckConstraint(
+                condition=GreaterThanOrEqual(Length('name'), 2),
+                name='artist_name_min_length',
+                violation_error_message='The name must be at least 2 characters long.',
+            ),
+            models.CheckConstraint(
+                condition=Q(birth_year__gte=1000),
+                name='artist_birth_year_min',
+                violation_error_message='Birth year must be 1000 or later.',
+            ),
+            models.CheckConstraint(
+                condition=Q(death_year__isnull=True) | Q(death_year__gte=F('birth_year')),
+                name='artist_death_year_after_birth_year',
+                violation_error_message='Death year cannot be before birth year.',
+            ),
+            models.CheckConstraint(
+                condition=GreaterThanOrEqual(Length('biography'), 20),
+                name='artist_biography_min_length',
+                violation_error_message='The biography must be at least 20 characters long.',
+            ),
+        ]
+        indexes = [models.Index(fields=['nationality', 'name'], name='artist_nationality_name')]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        from .matching import match_key
+        self.match_key = match_key(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'match_key'}
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if update_fields is None or {'birth_year', 'death_year', 'nationality'} & set(update_fields):
+                from .eras import sync_artist_decades
+                sync_artist_decades(self)
+
+    @property
+    def display_profile_image_url(self):
+        """The profile image to show: empty if check_image_urls found it broken."""
+        return '' if self.profile_image_url == self.broken_profile_image_url else self.profile_image_url
+
+    def get_active_years(self):
+        """(first, last) year the artist was alive; the last is this year while they live."""
+        return self.birth_year, self.death_year or timezone.now().year
+
     def get_lifespan(self):
         """Return a readable lifespan string."""
         if self.death_year:
@@ -70,3 +132,28 @@ class Artist(models.Model):
         from django.core.exceptions import ValidationError
         if self.death_year and self.death_year < self.birth_year:
             raise ValidationError({'death_year': 'Death year cannot be before birth year.'})
+
+
+class ArtistDecade(models.Model):
+    """One row per decade an artist was alive in, so era queries can use an index (see artists.eras)."""
+
+    artist = models.ForeignKey(Artist, on_delete=models.CASCADE, related_name='decades')
+    decade = models.PositiveSmallIntegerField(help_text='First year of the decade, e.g. 1870.')
+    nationality = models.CharField(
+        max_length=50,
+        help_text='Copy of the artist\'s nationality, so nationality and era filter on one index.',
+    )
+
+    class Meta:
+        ordering = ['decade']
+        verbose_name = 'Artist Decade'
+        verbose_name_plural = 'Artist Decades'
+        constraints = [
+            models.UniqueConstraint(fields=['decade', 'artist'], name='artist_decade_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['nationality', 'decade', 'artist'], name='artist_decade_nationality'),
+        ]
+
+    def __str__(self):
+        return f'{self.artist_id} in the {self.decade}s'
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .eras import artist_timeline, artists_active
+from .models import Artist
+
+
+# Templates resolve static URLs without running collectstatic first.
+@override_settings(STORAGES={
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class ArtistChangelistQueryTests(TestCase):
+    """The artist changelist runs a fixed number of queries however large the table is."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_catalogue', artists=300, artworks=600, exhibitions=0, seed=1, stdout=StringIO())
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        # Stand in for a large PostgreSQL table, whose size comes from the planner's estimate.
+        patcher = mock.patch('artvault.paginators.estimated_row_count', return_value=100_000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_changelist(self):
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('admin:artists_artist_changelist'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_changelist_sorted_by_artwork_count(self):
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('admin:artists_artist_changelist'), {'o': '5'})
+        self.assertEqual(response.status_code, 200)
+
+
+class EraTests(TestCase):
+    """Era filters and timelines stay right for living artists as decades turn."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.living = Artist.objects.create(
+            name='Still Painting', nationality='French', birth_year=1990, biography='Paints in Lyon to this day.',
+        )
+        cls.dead = Artist.objects.create(
+            name='Long Gone', nationality='French', birth_year=1850, death_year=1910,
+            biography='Painted the Seine for sixty years.',
+        )
+
+    def active(self, first, last):
+        return set(artists_active(Artist.objects.all(), first, last, nationality='French'))
+
+    def test_periods(self):
+        self.assertEqual(self.active(1870, 1880), {self.dead})
+        self.assertEqual(self.active(1905, 1995), {self.dead, self.living})
+        self.assertEqual(self.active(1995, 2000), {self.living})
+        self.assertEqual(self.active(1700, 1800), set())
+
+    def test_living_artist_is_active_in_a_new_decade_without_a_rebuild(self):
+        with mock.patch('artists.eras.timezone.now', return_value=datetime(2031, 1, 1, tzinfo=dt_timezone.utc)):
+            self.assertEqual(self.active(2030, 2031), {self.living})
+            bars = {start: count for start, _end, _label, count, _height, _selected in artist_timeline(
+                'French', (2000, 2031),
+            )}
+        self.assertEqual(bars[2030], 1)
+        self.assertEqual(bars[2040], 0)
+
+    def test_century_timeline(self):
+        bars = {start: count for start, _end, _label, count, _height, _selected in artist_timeline('French')}
+        self.assertEqual(bars, {1800: 1, 1900: 2, 2000: 1})
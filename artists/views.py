@@ -1,9 +1,12 @@
+from django.conf import settings
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
 from django.contrib import messages
+from artvault.concurrency import VersionedUpdateMixin
 from django.db.models import Q
+from .eras import artist_timeline, artists_active, cached_timeline
 from .models import Artist
-from .forms import ArtistForm
+from .forms import ArtistForm, EraFilterForm
 
 
 class ArtistListView(ListView):
@@ -20,7 +23,12 @@ class ArtistListView(ListView):
             queryset = queryset.filter(
                 Q(name__icontains=search) | Q(biography__icontains=search)
             )
-        if nationality:
+        self.era_form = EraFilterForm(self.request.GET)
+        self.period = self.era_form.cleaned_data['period'] if self.era_form.is_valid() else None
+        if self.period:
+            # Nationality and era together resolve on one index of the decade table.
+            queryset = artists_active(queryset, *self.period, nationality=nationality)
+        elif nationality:
             queryset = queryset.filter(nationality=nationality)
         return queryset
 
@@ -29,6 +37,14 @@ class ArtistListView(ListView):
         context['nationalities'] = Artist.Nationality.choices
         context['search_query'] = self.request.GET.get('q', '')
         context['selected_nationality'] = self.request.GET.get('nationality', '')
+        context['era_form'] = self.era_form
+        # Timelines are counted from the decade table, which kiosks do not have.
+        if settings.CATALOGUE_SNAPSHOT_READS:
+            return context
+        if self.period or context['selected_nationality']:
+            context['timeline'] = artist_timeline(context['selected_nationality'], self.period)
+        elif not context['search_query']:
+            context['timeline'] = cached_timeline('artists', artist_timeline)
         return context
 
 
@@ -39,7 +55,7 @@ class ArtistDetailView(DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['artworks'] = self.object.artworks.select_related('category').all()
+        context['artworks'] = self.object.artworks.select_related('artist', 'category').all()
         return context
 
 
@@ -64,7 +80,7 @@ class ArtistCreateView(CreateView):
         return super().form_invalid(form)
 
 
-class ArtistUpdateView(UpdateView):
+class ArtistUpdateView(VersionedUpdateMixin, UpdateView):
     model = Artist
     form_class = ArtistForm
     template_name = 'artists/artist_form.html'
@@ -76,9 +92,8 @@ class ArtistUpdateView(UpdateView):
         context['submit_label'] = 'Save Changes'
         return context
 
-    def form_valid(self, form):
-        messages.success(self.request, f'Artist "{form.instance.name}" was updated successfully.')
-        return super().form_valid(form)
+    def get_success_message(self, form):
+        return f'Artist "{form.instance.name}" was updated successfully.'
 
     def form_invalid(self, form):
         messages.error(self.request, 'Please correct the errors below.')
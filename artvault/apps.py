@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class ArtvaultConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'artvault'
+    verbose_name = 'ArtVault'
+
+    def ready(self):
+        from .metrics import install_cache_instrumentation
+        from .page_cache import install_query_tracking
+        install_cache_instrumentation()
+        install_query_tracking()
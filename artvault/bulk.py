@@ -0,0 +1,141 @@
+"""
+Bulk writes validated by the database instead of ``full_clean()``.
+
+The models' validation rules are mirrored as database constraints, so a
+bulk insert or update can skip per-instance ``full_clean()`` and let the
+database reject bad rows. When a batch is rejected it is retried row by
+row, so the valid rows are still written, and each violation is turned
+back into a field-level ``ValidationError`` like the one ``full_clean()``
+would have raised. Like ``bulk_create``, these helpers send no signals.
+"""
+import re
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import UniqueConstraint
+
+BATCH_SIZE = 1000
+
+# SQLite reports violations only in the message text.
+SQLITE_NAMED = re.compile(r"^CHECK constraint failed: (\w+)|^UNIQUE constraint failed: index '(\w+)'")
+SQLITE_COLUMN = re.compile(r'^(NOT NULL|UNIQUE) constraint failed: \w+\.(\w+)')
+NOT_NULL_VIOLATION = '23502'
+
+
+def _violation(exc):
+    """('constraint', name), ('unique', column) or ('null', column) for a driver error."""
+    cause = exc.__cause__
+    diag = getattr(cause, 'diag', None)
+    if diag is not None:
+        if cause.pgcode == NOT_NULL_VIOLATION:
+            return 'null', diag.column_name
+        return 'constraint', diag.constraint_name
+    message = str(exc)
+    match = SQLITE_NAMED.match(message)
+    if match:
+        return 'constraint', match.group(1) or match.group(2)
+    match = SQLITE_COLUMN.match(message)
+    if match:
+        return ('null' if match.group(1) == 'NOT NULL' else 'unique'), match.group(2)
+    return None, None
+
+
+def _first_field(model, constraint):
+    """The field a violation is reported against: the first one the constraint refers to."""
+    if isinstance(constraint, UniqueConstraint):
+        if constraint.fields:
+            return constraint.fields[0]
+        expressions = constraint.expressions
+    else:
+        expressions = [constraint.condition]
+    for expression in expressions:
+        for path in model._get_expr_references(expression):
+            return path[0]
+    return NON_FIELD_ERRORS
+
+
+def _unique_field(model, kind, name):
+    """The ``unique=True`` field behind a column-level unique violation, if any."""
+    for field in model._meta.concrete_fields:
+        if not field.unique or field.primary_key:
+            continue
+        if kind == 'unique' and name == field.column:
+            return field
+        # PostgreSQL names these <table>_<column>_key (or _<hash>_uniq when added later).
+        prefix = f'{model._meta.db_table}_{field.column}_'
+        if kind == 'constraint' and name and name.startswith(prefix) and name.endswith(('_key', '_uniq')):
+            return field
+    return None
+
+
+def constraint_error(model, exc):
+    """Translate an ``IntegrityError`` raised writing ``model`` into a ``ValidationError``."""
+    kind, name = _violation(exc)
+    if kind == 'constraint':
+        for constraint in model._meta.constraints:
+            if constraint.name == name:
+                return ValidationError({
+                    _first_field(model, constraint): ValidationError(
+                        constraint.get_violation_error_message(),
+                        code=constraint.violation_error_code or 'constraint',
+                    ),
+                })
+    field = _unique_field(model, kind, name)
+    if field is not None:
+        message = field.error_messages['unique'] % {
+            'model_name': model._meta.verbose_name, 'field_label': field.verbose_name,
+        }
+        return ValidationError({field.name: ValidationError(message, code='unique')})
+    if kind == 'null':
+        for field in model._meta.concrete_fields:
+            if field.column == name:
+                return ValidationError({field.name: ValidationError(field.error_messages['null'], code='null')})
+    return ValidationError({NON_FIELD_ERRORS: ValidationError(str(exc), code='integrity')})
+
+
+def _write_checked(model, objects, batch_size, write):
+    """Run ``write(batch)`` per batch, isolating rejected rows; returns ({index: error}, rows written)."""
+    errors, written = {}, 0
+    for start in range(0, len(objects), batch_size):
+        batch = objects[start:start + batch_size]
+        try:
+            with transaction.atomic():
+                written += write(batch)
+            continue
+        except IntegrityError:
+            pass
+        for index, obj in enumerate(batch, start):
+            try:
+                with transaction.atomic():
+                    written += write([obj])
+            except IntegrityError as exc:
+                errors[index] = constraint_error(model, exc)
+    return errors, written
+
+
+def bulk_create_checked(model, objects, batch_size=BATCH_SIZE):
+    """``bulk_create`` without ``full_clean()``; the database enforces the rules.
+
+    Returns (created objects, {index in ``objects``: ValidationError}).
+    """
+    objects = list(objects)
+    created = []
+
+    def write(batch):
+        created.extend(model.objects.bulk_create(batch))
+        return len(batch)
+
+    errors, _written = _write_checked(model, objects, batch_size, write)
+    return created, errors
+
+
+def bulk_update_checked(model, objects, fields, batch_size=BATCH_SIZE):
+    """``bulk_update`` without ``full_clean()``; the database enforces the rules.
+
+    Returns (rows updated, {index in ``objects``: ValidationError}).
+    """
+    objects = list(objects)
+    errors, updated = _write_checked(
+        model, objects, batch_size, lambda batch: model.objects.bulk_update(batch, fields),
+    )
+    return updated, errors
@@ -0,0 +1,69 @@
+"""
+Response compression: gzip for dynamic HTML, and pre-built gzip/brotli
+variants written next to static files at collectstatic time.
+"""
+import gzip
+import os
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip variants are always written.
+    brotli = None
+
+# Only text formats are worth compressing; images and fonts already are.
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ico', '.ttf', '.eot',
+}
+# (suffix, Content-Encoding), in order of preference when serving.
+ENCODINGS = (('.br', 'br'), ('.gz', 'gzip'))
+
+
+def compress_file(path):
+    """Write ``path.gz`` (and ``path.br`` when Brotli is installed) if they save space.
+
+    Returns the suffixes written.
+    """
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+        return []
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+    written = []
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(data) * 0.95:
+            with open(path + suffix, 'wb') as fh:
+                fh.write(compressed)
+            written.append(suffix)
+    return written
+
+
+def accepted_encodings(request):
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.partition(';')
+        params = params.replace(' ', '')
+        if params.startswith('q='):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class MinimumSizeGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves responses under ``GZIP_MIN_SIZE`` bytes alone.
+
+    Small bodies gain little from compression and still pay its CPU cost.
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.GZIP_MIN_SIZE:
+            return response
+        return super().process_response(request, response)
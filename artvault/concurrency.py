@@ -0,0 +1,112 @@
+"""
+Partial-field saves with optimistic locking on ``updated_at``.
+
+An edit form carries the ``updated_at`` the editor started from. Saving
+writes only the fields the form changed, in one
+``UPDATE ... WHERE id = %s AND updated_at = %s``; if another edit landed in
+between, no row matches and the editor is shown the conflict instead of
+silently overwriting it. A form with no changes is not written at all.
+"""
+from datetime import datetime
+
+from django import forms
+from django.contrib import messages
+from django.db import transaction
+from django.http import HttpResponseRedirect
+
+
+class StaleObjectError(Exception):
+    """The row changed (or vanished) after the editor loaded it."""
+
+
+class OptimisticLockMixin:
+    """Model mixin adding ``save_if_unchanged``; the model needs ``updated_at`` (auto_now)."""
+
+    def save_if_unchanged(self, version, update_fields):
+        """Save ``update_fields`` only if ``updated_at`` still equals ``version``."""
+        self._expected_version = version
+        try:
+            self.save(update_fields=[*update_fields, 'updated_at'])
+        finally:
+            self._expected_version = None
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected = getattr(self, '_expected_version', None)
+        if expected is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        updated = super()._do_update(
+            base_qs.filter(updated_at=expected), using, pk_val, values, update_fields, forced_update,
+        )
+        if not updated:
+            raise StaleObjectError
+        return updated
+
+
+def version_token(instance):
+    return instance.updated_at.isoformat()
+
+
+def parse_version_token(token):
+    try:
+        return datetime.fromisoformat(token)
+    except (TypeError, ValueError):
+        return None
+
+
+class VersionedUpdateMixin:
+    """UpdateView mixin: write only changed fields and refuse to overwrite a newer edit."""
+
+    unchanged_message = 'No changes to save.'
+    conflict_message = (
+        'Someone else saved this record while you were editing it. The form now shows '
+        'your edits against their version; save again to overwrite it.'
+    )
+
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        form.fields['version'] = forms.CharField(
+            widget=forms.HiddenInput,
+            required=False,
+            initial=version_token(self.object),
+        )
+        return form
+
+    def get_success_message(self, form):
+        return ''
+
+    def form_valid(self, form):
+        model_fields = {field.name for field in self.model._meta.concrete_fields}
+        many_to_many = {field.name for field in self.model._meta.many_to_many}
+        changed = [name for name in form.changed_data if name in model_fields]
+        if not changed and not many_to_many.intersection(form.changed_data):
+            messages.info(self.request, self.unchanged_message)
+            return HttpResponseRedirect(self.get_success_url())
+
+        version = parse_version_token(form.cleaned_data.get('version'))
+        self.object = form.save(commit=False)
+        try:
+            # A savepoint, so a conflict does not poison the request's transaction.
+            with transaction.atomic():
+                if version is None:
+                    self.object.save(update_fields=[*changed, 'updated_at'])
+                else:
+                    self.object.save_if_unchanged(version, changed)
+                form.save_m2m()
+        except StaleObjectError:
+            return self.version_conflict(form)
+        success_message = self.get_success_message(form)
+        if success_message:
+            messages.success(self.request, success_message)
+        return HttpResponseRedirect(self.get_success_url())
+
+    def version_conflict(self, form):
+        current = self.model._default_manager.filter(pk=self.object.pk).first()
+        if current is None:
+            messages.error(self.request, 'This record was deleted while you were editing it.')
+            return HttpResponseRedirect(self.get_success_url())
+        # Resubmitting the form now deliberately overwrites the newer version.
+        form.data = form.data.copy()
+        form.data[form.add_prefix('version')] = version_token(current)
+        form.add_error(None, self.conflict_message)
+        messages.error(self.request, 'Your changes were not saved.')
+        return self.render_to_response(self.get_context_data(form=form))
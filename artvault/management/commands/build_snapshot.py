@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from artvault.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Build or update the read-only SQLite snapshot of the public catalogue for kiosks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help='Rebuild from scratch instead of replaying the change feed.')
+        parser.add_argument('--path', type=Path, default=None,
+                            help='Snapshot file (default: CATALOGUE_SNAPSHOT_PATH).')
+
+    def handle(self, *args, **options):
+        summary = build_snapshot(full=options['full'], path=options['path'])
+        details = ', '.join(
+            f'{key} {value}' for key, value in summary.items() if key not in ('mode', 'seconds', 'size')
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{summary["mode"].capitalize()} snapshot build in {summary["seconds"]}s: {details} '
+            f'({summary["size"] / 1_000_000:.1f} MB)'
+        ))
@@ -0,0 +1,44 @@
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from artvault.profiling import load_profiles
+
+
+class Command(BaseCommand):
+    help = 'List the slowest captured request profiles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--url-name', help='Only show profiles for this URL name, e.g. artworks:list.')
+        parser.add_argument('--frames', type=int, default=0,
+                            help='Also show the N functions with the most self samples per profile.')
+
+    def handle(self, *args, **options):
+        profiles = load_profiles()
+        if options['url_name']:
+            profiles = [profile for profile in profiles if profile['url_name'] == options['url_name']]
+        if not profiles:
+            self.stdout.write(f'No profiles in {settings.PROFILING_DIR}.')
+            return
+        self.stdout.write(
+            f'{"ms":>9} {"sql":>5} {"sql ms":>8} {"tmpl%":>6} {"sql%":>5}  request'
+        )
+        for profile in profiles[:options['limit']]:
+            self.stdout.write(
+                f'{profile["duration_ms"]:>9.1f} {profile["sql_queries"]:>5} {profile["sql_ms"]:>8.1f} '
+                f'{profile["template_share"] * 100:>5.0f}% {profile["sql_share"] * 100:>4.0f}%  '
+                f'{profile["method"]} {profile["path"]} [{profile["status"]}] → {profile["folded"]}'
+            )
+            if options['frames']:
+                for frame, samples in self.hottest_frames(profile, options['frames']):
+                    self.stdout.write(f'{"":>38}{samples:>6}  {frame}')
+
+    def hottest_frames(self, profile, limit):
+        leaves = Counter()
+        with open(settings.PROFILING_DIR / profile['folded']) as fh:
+            for line in fh:
+                stack, _, count = line.rstrip('\n').rpartition(' ')
+                leaves[stack.rsplit(';', 1)[-1]] += int(count)
+        return leaves.most_common(limit)
@@ -0,0 +1,140 @@
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from artists.models import Artist
+from artworks.models import Artwork, Category
+from exhibitions.models import ArchivedExhibition, Exhibition
+from savedsearches.models import SavedSearch
+
+# Which model supplies the <pk> for a route, by namespace or full URL name.
+PK_MODELS = {
+    'artists': Artist,
+    'artworks': Artwork,
+    'artworks:category-update': Category,
+    'artworks:category-delete': Category,
+    'exhibitions': Exhibition,
+    'exhibitions:archived-detail': ArchivedExhibition,
+    'search': Artwork,
+    'savedsearches': SavedSearch,
+}
+SKIPPED_NAMESPACES = {'admin'}
+SKIPPED_ROUTES = {'metrics'}
+
+
+def discover_routes(patterns=None, namespace=''):
+    """Yield (qualified URL name, path kwargs) for every named route."""
+    for pattern in patterns if patterns is not None else get_resolver().url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace in SKIPPED_NAMESPACES:
+                continue
+            prefix = f'{namespace}{pattern.namespace}:' if pattern.namespace else namespace
+            yield from discover_routes(pattern.url_patterns, prefix)
+        elif isinstance(pattern, URLPattern) and pattern.name and pattern.name not in SKIPPED_ROUTES:
+            yield f'{namespace}{pattern.name}', list(pattern.pattern.converters)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class Command(BaseCommand):
+    help = 'Drive every public route of a running server concurrently and report latency per route.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=30, help='Seconds to run for.')
+        parser.add_argument('--route', action='append', dest='routes',
+                            help='Only drive these URL names (repeatable), e.g. artworks:list.')
+        parser.add_argument('--timeout', type=float, default=30)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.base_url = options['base_url'].rstrip('/')
+        self.timeout = options['timeout']
+        self.samples = {}
+        routes = [
+            (name, kwargs) for name, kwargs in discover_routes()
+            if not options['routes'] or name in options['routes']
+        ]
+        routes = [(name, kwargs) for name, kwargs in routes if self.pk_sample(name, kwargs) is not None]
+        if not routes:
+            raise CommandError('No routes to drive; seed the catalogue first (seed_catalogue).')
+
+        self.results = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.lock = threading.Lock()
+        deadline = time.monotonic() + options['duration']
+        self.stdout.write(
+            f'Driving {len(routes)} routes at concurrency {options["concurrency"]} '
+            f'for {options["duration"]:.0f}s against {self.base_url}'
+        )
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            workers = [
+                executor.submit(self.worker, routes, deadline, random.Random(self.rng.random()))
+                for _ in range(options['concurrency'])
+            ]
+        for worker in workers:
+            worker.result()
+        self.report(time.monotonic() - started)
+
+    def pk_sample(self, name, kwargs):
+        if not kwargs:
+            return []
+        model = PK_MODELS.get(name) or PK_MODELS.get(name.split(':')[0])
+        if model is None:
+            return None
+        if model not in self.samples:
+            self.samples[model] = list(model.objects.order_by('?').values_list('pk', flat=True)[:1000])
+        return self.samples[model] or None
+
+    def worker(self, routes, deadline, rng):
+        while time.monotonic() < deadline:
+            name, kwargs = rng.choice(routes)
+            pks = self.pk_sample(name, kwargs)
+            path = reverse(name, kwargs={kwarg: rng.choice(pks) for kwarg in kwargs})
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(self.base_url + path, timeout=self.timeout) as response:
+                    response.read()
+                failed = False
+            except urllib.error.HTTPError as exc:
+                # 429 means the server's rate limiter (RATELIMIT_ENABLED) cut the run short.
+                failed = exc.code >= 500 or exc.code == 429
+            except OSError:
+                failed = True
+            elapsed = time.perf_counter() - started
+            with self.lock:
+                self.results[name].append(elapsed)
+                if failed:
+                    self.errors[name] += 1
+
+    def report(self, wall_time):
+        self.stdout.write(
+            f'\n{"route":<32} {"reqs":>7} {"errors":>7} {"req/s":>8} '
+            f'{"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}'
+        )
+        total = 0
+        for name in sorted(self.results):
+            timings = sorted(self.results[name])
+            total += len(timings)
+            self.stdout.write(
+                f'{name:<32} {len(timings):>7} {self.errors[name]:>7} {len(timings) / wall_time:>8.1f} '
+                f'{percentile(timings, 0.50) * 1000:>8.1f} {percentile(timings, 0.95) * 1000:>8.1f} '
+                f'{percentile(timings, 0.99) * 1000:>8.1f}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'\n{total} requests in {wall_time:.1f}s ({total / wall_time:.1f} req/s)'
+        ))
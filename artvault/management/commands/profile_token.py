@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from artvault.profiling import PROFILE_HEADER, TOKEN_MAX_AGE, make_token
+
+
+class Command(BaseCommand):
+    help = 'Print a signed header value that makes the server profile a request.'
+
+    def handle(self, *args, **options):
+        header = PROFILE_HEADER[len('HTTP_'):].replace('_', '-').title()
+        self.stdout.write(f'{header}: {make_token()}')
+        self.stdout.write(f'Valid for {TOKEN_MAX_AGE // 60} minutes.')
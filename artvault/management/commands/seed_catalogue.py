@@ -0,0 +1,217 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from artists.eras import rebuild_artist_decades
+from artists.matching import match_key
+from artvault.bulk import bulk_create_checked
+from artists.models import Artist
+from artworks.models import Artwork, ArtworkTag, Category, Tag
+from artworks.tagging import recount_tags
+from artworks.valuations import record_artwork_valuations
+from changefeed.feed import record_many, record_membership
+from changefeed.models import Change
+from exhibitions.models import Exhibition
+
+GIVEN_NAMES = (
+    'Anna Berthe Camille Claude Diego Edgar Elena Frida Georgia Gustav Hilma Henri Isamu Jan '
+    'Johannes Kazimir Leonora Lucian Mary Marc Natalia Pablo Paula Pierre Rembrandt Rosa Sofonisba '
+    'Tamara Vincent Wassily Yayoi Zao'
+).split()
+SURNAMES = (
+    'Albers Bacon Bonheur Cassatt Cézanne Dalí Degas Ernst Friedrich Gentileschi Goya Hokusai Kahlo '
+    'Kandinsky Klimt Kusama Lempicka Magritte Malevich Matisse Modersohn Monet Morisot Munch '
+    "O'Keeffe Picasso Renoir Rothko Sargent Turner Vermeer Whistler"
+).split()
+ADJECTIVES = (
+    'Blue Silent Golden Distant Broken Quiet Burning Northern Pale Crimson Hidden Luminous '
+    'Winter Evening Endless Scattered'
+).split()
+NOUNS = (
+    'Harbour Garden Portrait Study Bathers Cathedral Lilies Horizon Orchard Market Bridge '
+    'Mountain Dancers Interior Still Life Composition'
+).split()
+MEDIUMS = (
+    'Oil on canvas', 'Watercolour on paper', 'Bronze', 'Charcoal on paper', 'Tempera on panel',
+    'Acrylic on canvas', 'Marble', 'Gouache', 'Ink on silk', 'Mixed media',
+)
+# (name, badge colour, parent name); parents come before their children.
+CATEGORIES = (
+    ('Painting', '#8b5a2b', None), ('Oil Painting', '#8b5a2b', 'Painting'), ('Impasto', '#a0522d', 'Oil Painting'),
+    ('Watercolour', '#4f9dd9', 'Painting'), ('Sculpture', '#7d7d7d', None), ('Bronze', '#b08d57', 'Sculpture'),
+    ('Drawing', '#343a40', None), ('Printmaking', '#6f42c1', None), ('Etching', '#5a32a3', 'Printmaking'),
+    ('Photography', '#20c997', None), ('Textile', '#d63384', None), ('Ceramics', '#fd7e14', None),
+)
+TAGS = (
+    'impressionism', 'baroque', 'renaissance', 'romanticism', 'cubism', 'surrealism', 'expressionism',
+    'minimalism', 'pop art', 'realism', 'landscape', 'portrait', 'still life', 'seascape', 'cityscape',
+    'religious', 'mythology', 'nude', 'interior', 'animals', 'flowers', 'night', 'winter', 'plein air',
+    'impasto', 'glazing', 'sfumato', 'chiaroscuro', 'pointillism', 'collage',
+)
+LOCATIONS = ('East Wing', 'West Wing', 'Main Hall', 'Sculpture Court', 'Print Room', 'Garden Pavilion')
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with a large synthetic catalogue for performance work.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--artists', type=int, default=1000)
+        parser.add_argument('--artworks', type=int, default=20000)
+        parser.add_argument('--exhibitions', type=int, default=200)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=None, help='Make the catalogue reproducible.')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.current_year = timezone.now().year
+        started = time.perf_counter()
+
+        categories = self.seed_categories()
+        artists = self.seed_artists(options['artists'])
+        artwork_pks = self.seed_artworks(options['artworks'], artists, categories)
+        # bulk_create skips signals, so book the opening values directly.
+        record_artwork_valuations(artwork_pks)
+        self.seed_tags(artwork_pks)
+        self.seed_exhibitions(options['exhibitions'], artwork_pks)
+        self.stdout.write(self.style.SUCCESS(f'Seeded catalogue in {time.perf_counter() - started:.1f}s'))
+
+    def bulk_create(self, model, objects):
+        # The database constraints validate the rows; rejected ones are reported and skipped.
+        created, errors = bulk_create_checked(model, objects, batch_size=self.batch_size)
+        if errors:
+            example = next(iter(errors.values())).messages[0]
+            self.stderr.write(
+                f'  skipped {len(errors)} invalid {model._meta.verbose_name_plural.lower()} ({example})'
+            )
+        return created
+
+    def seed_categories(self):
+        # Saved one by one: save() maintains the tree paths, which bulk_create would skip.
+        by_name = {category.name: category for category in Category.objects.all()}
+        for name, colour, parent in CATEGORIES:
+            if name not in by_name:
+                by_name[name] = Category.objects.create(
+                    name=name, colour_hex=colour, parent=by_name.get(parent),
+                    description=f'Works classed as {name.lower()}.',
+                )
+        return [category.pk for category in by_name.values()]
+
+    def seed_artists(self, count):
+        """Create artists and return (pk, birth_year, death_year, weight) tuples."""
+        rng = self.rng
+        created = []
+        for start in range(0, count, self.batch_size):
+            batch = []
+            for _ in range(min(self.batch_size, count - start)):
+                name = f'{rng.choice(GIVEN_NAMES)} {rng.choice(SURNAMES)}'
+                birth_year = rng.randint(1450, self.current_year - 20)
+                lifespan = rng.randint(30, 95)
+                death_year = birth_year + lifespan if birth_year + lifespan < self.current_year else None
+                nationality = rng.choice(Artist.Nationality.values)
+                batch.append(Artist(
+                    name=name,
+                    nationality=nationality,
+                    birth_year=birth_year,
+                    death_year=death_year,
+                    biography=f'{name} was a {nationality} artist born in {birth_year}, '
+                              f'known for {rng.choice(MEDIUMS).lower()} works.',
+                    match_key=match_key(name),
+                ))
+            created.extend(self.bulk_create(Artist, batch))
+            self.stdout.write(f'  {len(created)} artists')
+        # bulk_create skips the change feed too; its consumers (snapshots,
+        # the catalogue index) would otherwise never see these rows.
+        record_many(Artist, [artist.pk for artist in created], Change.Action.CREATED)
+        rebuild_artist_decades(self.batch_size)
+        # A few prolific artists account for most of the collection.
+        return [
+            (artist.pk, artist.birth_year, artist.death_year, rng.paretovariate(1.2))
+            for artist in created
+        ]
+
+    def seed_artworks(self, count, artists, categories):
+        rng = self.rng
+        weights = [weight for _pk, _birth, _death, weight in artists]
+        pks = []
+        for start in range(0, count, self.batch_size):
+            size = min(self.batch_size, count - start)
+            batch = []
+            for pk, birth_year, death_year, _weight in rng.choices(artists, weights=weights, k=size):
+                first = min(birth_year + 15, self.current_year)
+                last = min(death_year or self.current_year, self.current_year)
+                title = f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}'
+                if rng.random() < 0.3:
+                    title += f' No. {rng.randint(1, 40)}'
+                value = None
+                if rng.random() < 0.7:
+                    value = Decimal(round(rng.lognormvariate(10, 1.5), 2)).quantize(Decimal('0.01'))
+                batch.append(Artwork(
+                    title=title,
+                    artist_id=pk,
+                    category_id=rng.choice(categories) if rng.random() < 0.9 else None,
+                    description=f'{title}, {rng.choice(MEDIUMS).lower()}, from the artist\'s '
+                                f'{rng.choice(("early", "middle", "late"))} period.',
+                    year_created=rng.randint(first, max(first, last)),
+                    medium=rng.choice(MEDIUMS),
+                    dimensions=f'{rng.randint(10, 300)} × {rng.randint(10, 300)} cm',
+                    estimated_value=min(value, Decimal('9999999999.99')) if value is not None else None,
+                    is_on_display=rng.random() < 0.35,
+                ))
+            pks.extend(artwork.pk for artwork in self.bulk_create(Artwork, batch))
+            self.stdout.write(f'  {len(pks)} artworks')
+        record_many(Artwork, pks, Change.Action.CREATED)
+        return pks
+
+    def seed_tags(self, artwork_pks):
+        rng = self.rng
+        Tag.objects.bulk_create([Tag(name=name) for name in TAGS], ignore_conflicts=True)
+        tag_pks = list(Tag.objects.filter(name__in=TAGS).values_list('pk', flat=True))
+        # Popular tags are much more common than rare ones.
+        weights = [1 / rank for rank in range(1, len(tag_pks) + 1)]
+        for start in range(0, len(artwork_pks), self.batch_size):
+            self.bulk_create(ArtworkTag, [
+                ArtworkTag(artwork_id=artwork_pk, tag_id=tag_pk)
+                for artwork_pk in artwork_pks[start:start + self.batch_size]
+                for tag_pk in set(rng.choices(tag_pks, weights=weights, k=rng.randint(0, 4)))
+            ])
+        recount_tags()
+        self.stdout.write(f'  tagged {len(artwork_pks)} artworks')
+
+    def seed_exhibitions(self, count, artwork_pks):
+        rng = self.rng
+        today = date.today()
+        window = (today - date(2000, 1, 1)).days + 365
+        Membership = Exhibition.artworks.through
+        for start in range(0, count, self.batch_size):
+            batch = []
+            for _ in range(min(self.batch_size, count - start)):
+                opening = date(2000, 1, 1) + timedelta(days=rng.randrange(window))
+                closing = opening + timedelta(days=rng.randint(21, 180))
+                batch.append(Exhibition(
+                    title=f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}s',
+                    tagline=f'A season of {rng.choice(MEDIUMS).lower()}.',
+                    description='An exhibition drawn from the permanent collection and private lenders.',
+                    location=rng.choice(LOCATIONS),
+                    start_date=opening,
+                    end_date=closing,
+                    admission_price=Decimal(rng.choice((0, 0, 8, 12, 15, 20))),
+                    is_active=closing >= today or rng.random() < 0.2,
+                ))
+            exhibitions = self.bulk_create(Exhibition, batch)
+            memberships = [
+                Membership(exhibition_id=exhibition.pk, artwork_id=artwork_pk)
+                for exhibition in exhibitions
+                for artwork_pk in rng.sample(artwork_pks, min(len(artwork_pks), rng.randint(8, 60)))
+            ]
+            memberships = self.bulk_create(Membership, memberships)
+            record_many(Exhibition, [exhibition.pk for exhibition in exhibitions], Change.Action.CREATED)
+            record_membership(
+                sorted((member.exhibition_id, member.artwork_id) for member in memberships),
+                Change.Action.LINKED,
+            )
+            self.stdout.write(f'  {start + len(batch)} exhibitions')
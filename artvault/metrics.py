@@ -0,0 +1,356 @@
+"""
+Prometheus metrics for request latency, SQL, template rendering, caches and jobs.
+
+Each process aggregates into plain dicts behind one uncontended lock and
+snapshots them to ``METRICS_DIR/<pid>-<start>.json`` every
+``METRICS_FLUSH_INTERVAL`` seconds. The ``/metrics`` view sums every
+snapshot, so all worker processes behind the load balancer report together.
+
+Snapshots of processes that have exited (recycled workers, management
+commands) are folded into the scraping process's ``retired-<pid>.json``
+and deleted. Totals therefore never go backwards, and the directory holds
+about two files per live process.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    'artvault_http_requests_total': ('counter', 'Requests by URL name, method and status.'),
+    'artvault_http_request_duration_seconds': ('histogram', 'Request latency by URL name.'),
+    'artvault_db_queries_total': ('counter', 'SQL queries executed, by URL name.'),
+    'artvault_db_query_seconds_total': ('counter', 'Time spent in SQL, by URL name.'),
+    'artvault_template_render_seconds': ('histogram', 'Template rendering time by URL name.'),
+    'artvault_cache_requests_total': ('counter', 'Cache lookups by cache alias and result.'),
+    'artvault_jobs_total': ('counter', 'Background job attempts by task and outcome.'),
+    'artvault_job_duration_seconds': ('histogram', 'Background job run time by task.'),
+    'artvault_job_wait_seconds': ('histogram', 'Time background jobs waited past their run_at, by task.'),
+}
+
+
+class Registry:
+    """Per-process counters and histograms keyed by (metric, labels)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Held while writing the snapshot file, so threads never share it half-written.
+        self._flush_lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+        self._file = None
+        self._last_flush = 0.0
+
+    def inc(self, name, labels, amount=1.0):
+        with self._lock:
+            self.counters[name, labels] += amount
+
+    def observe(self, name, labels, value):
+        with self._lock:
+            histogram = self.histograms.get((name, labels))
+            if histogram is None:
+                histogram = self.histograms[name, labels] = [0] * len(BUCKETS) + [0.0, 0]
+            for i, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    histogram[i] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, list(labels), list(data)] for (name, labels), data in self.histograms.items()],
+            }
+
+    def flush(self, force=False):
+        """Write this process's snapshot if the interval has passed; a flush in progress elsewhere wins."""
+        if not force and time.monotonic() - self._last_flush < settings.METRICS_FLUSH_INTERVAL:
+            return
+        if not self._flush_lock.acquire(blocking=force):
+            return
+        try:
+            now = time.monotonic()
+            if not force and now - self._last_flush < settings.METRICS_FLUSH_INTERVAL:
+                return
+            self._last_flush = now
+            directory = settings.METRICS_DIR
+            directory.mkdir(parents=True, exist_ok=True)
+            if self._file is None:
+                self._file = directory / f'{os.getpid()}-{time.time_ns()}.json'
+            staged = self._file.with_name(f'{self._file.stem}.{threading.get_ident()}.tmp')
+            staged.write_text(json.dumps(self.snapshot()))
+            staged.replace(self._file)
+        except OSError:
+            # Metrics must never fail the request or job that triggered the flush.
+            logger.exception('Could not write metrics snapshot')
+        finally:
+            self._flush_lock.release()
+
+
+registry = Registry()
+atexit.register(lambda: registry.counters and registry.flush(force=True))
+
+
+def _labels(**labels):
+    return tuple(sorted(labels.items()))
+
+
+# ─── Collection ──────────────────────────────────────────────────────────────
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sql = [0, 0.0]
+
+        def time_query(execute, sql_text, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql_text, params, many, context)
+            finally:
+                sql[0] += 1
+                sql[1] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(time_query):
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = request.resolver_match
+        route = match.view_name if match else 'unresolved'
+        registry.inc('artvault_http_requests_total', _labels(
+            route=route, method=request.method, status=str(response.status_code),
+        ))
+        registry.observe('artvault_http_request_duration_seconds', _labels(route=route), duration)
+        if sql[0]:
+            registry.inc('artvault_db_queries_total', _labels(route=route), sql[0])
+            registry.inc('artvault_db_query_seconds_total', _labels(route=route), sql[1])
+        registry.flush()
+        return response
+
+    def process_template_response(self, request, response):
+        started = time.perf_counter()
+
+        def record(rendered):
+            match = request.resolver_match
+            route = match.view_name if match else 'unresolved'
+            registry.observe('artvault_template_render_seconds', _labels(route=route),
+                             time.perf_counter() - started)
+
+        response.add_post_render_callback(record)
+        return response
+
+
+def record_job(task, outcome, duration, wait):
+    """Count one job attempt; called by ``run_worker`` rather than middleware."""
+    registry.inc('artvault_jobs_total', _labels(task=task, outcome=outcome))
+    registry.observe('artvault_job_duration_seconds', _labels(task=task), duration)
+    registry.observe('artvault_job_wait_seconds', _labels(task=task), max(wait, 0.0))
+    registry.flush()
+
+
+_MISSING = object()
+_in_cache_call = threading.local()
+
+
+def _instrument_cache(alias, backend):
+    """Count hits and misses on one cache instance.
+
+    Only the outermost call is counted, since some backends implement
+    ``get`` with ``get_many`` and others the other way round.
+    """
+    get, get_many = backend.get, backend.get_many
+    hit_labels, miss_labels = _labels(cache=alias, result='hit'), _labels(cache=alias, result='miss')
+
+    def counted_get(key, default=None, version=None):
+        if getattr(_in_cache_call, 'active', False):
+            return get(key, default, version)
+        _in_cache_call.active = True
+        try:
+            value = get(key, _MISSING, version)
+        finally:
+            _in_cache_call.active = False
+        registry.inc('artvault_cache_requests_total', miss_labels if value is _MISSING else hit_labels)
+        return default if value is _MISSING else value
+
+    def counted_get_many(keys, version=None):
+        if getattr(_in_cache_call, 'active', False):
+            return get_many(keys, version)
+        keys = list(keys)
+        _in_cache_call.active = True
+        try:
+            found = get_many(keys, version)
+        finally:
+            _in_cache_call.active = False
+        if found:
+            registry.inc('artvault_cache_requests_total', hit_labels, len(found))
+        if len(keys) > len(found):
+            registry.inc('artvault_cache_requests_total', miss_labels, len(keys) - len(found))
+        return found
+
+    backend.get, backend.get_many = counted_get, counted_get_many
+    return backend
+
+
+def install_cache_instrumentation():
+    """Wrap every cache connection Django creates from now on."""
+    create_connection = caches.create_connection
+    if getattr(create_connection, 'instrumented', False):
+        return
+
+    def instrumented_create_connection(alias):
+        return _instrument_cache(alias, create_connection(alias))
+
+    instrumented_create_connection.instrumented = True
+    caches.create_connection = instrumented_create_connection
+
+
+# ─── Exposition ──────────────────────────────────────────────────────────────
+
+def _snapshot_pid(path):
+    try:
+        return int(path.stem.removeprefix('retired-').split('-')[0])
+    except ValueError:
+        return None
+
+
+def _process_alive(pid):
+    if os.name == 'nt':
+        # os.kill would terminate the process on Windows; keep every snapshot there.
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _merge(totals, snapshot):
+    counters, histograms = totals
+    for name, labels, value in snapshot['counters']:
+        counters[name, tuple(map(tuple, labels))] += value
+    for name, labels, data in snapshot['histograms']:
+        key = (name, tuple(map(tuple, labels)))
+        if key in histograms:
+            histograms[key] = [a + b for a, b in zip(histograms[key], data)]
+        else:
+            histograms[key] = data
+
+
+def _read(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+_retire_lock = threading.Lock()
+
+
+def retire_snapshots():
+    """Fold the snapshots of exited processes into this process's retired totals and delete them."""
+    directory = settings.METRICS_DIR
+    if not directory.exists():
+        return
+    with _retire_lock:
+        dead = []
+        for path in directory.glob('*.json'):
+            pid = _snapshot_pid(path)
+            if pid is None or pid == os.getpid() or _process_alive(pid):
+                continue
+            # Renaming claims the file; a concurrent scrape in another process loses the race.
+            claimed = path.with_name(f'{path.stem}.{os.getpid()}.claimed')
+            try:
+                path.rename(claimed)
+            except FileNotFoundError:
+                continue
+            dead.append(claimed)
+        if not dead:
+            return
+        retired = directory / f'retired-{os.getpid()}.json'
+        totals = (defaultdict(float), {})
+        for path in [retired, *dead]:
+            snapshot = _read(path)
+            if snapshot is not None:
+                _merge(totals, snapshot)
+        counters, histograms = totals
+        staged = retired.with_suffix('.tmp')
+        staged.write_text(json.dumps({
+            'counters': [[name, list(labels), value] for (name, labels), value in counters.items()],
+            'histograms': [[name, list(labels), data] for (name, labels), data in histograms.items()],
+        }))
+        staged.replace(retired)
+        for path in dead:
+            path.unlink(missing_ok=True)
+
+
+def collect():
+    """Merge the snapshots of every process into totals."""
+    registry.flush(force=True)
+    retire_snapshots()
+    totals = (defaultdict(float), {})
+    for path in settings.METRICS_DIR.glob('*.json'):
+        snapshot = _read(path)
+        if snapshot is not None:
+            _merge(totals, snapshot)
+    return totals
+
+
+def _format_labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ''
+    escaped = (
+        f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for key, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def render_text(counters, histograms):
+    lines = []
+    by_name = defaultdict(list)
+    for (name, labels), value in counters.items():
+        by_name[name].append((labels, value))
+    for (name, labels), data in histograms.items():
+        by_name[name].append((labels, data))
+    for name in sorted(by_name):
+        kind, help_text = HELP.get(name, ('untyped', name))
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(by_name[name]):
+            if kind != 'histogram':
+                lines.append(f'{name}{_format_labels(labels)} {value:g}')
+                continue
+            for bound, count in zip(BUCKETS, value):
+                lines.append(f'{name}_bucket{_format_labels(labels, le=f"{bound:g}")} {count}')
+            lines.append(f'{name}_bucket{_format_labels(labels, le="+Inf")} {value[-1]}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {value[-2]:g}')
+            lines.append(f'{name}_count{_format_labels(labels)} {value[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    allowed = settings.METRICS_ALLOWED_IPS
+    if allowed and request.META.get('REMOTE_ADDR') not in allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(
+        render_text(*collect()),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -0,0 +1,302 @@
+"""
+Whole-page cache for anonymous GET requests, purged by surrogate key.
+
+While a cacheable page renders, it is tagged with surrogate keys:
+
+* every catalogue object it loads, by primary key lookup or as one row of
+  a list or join, tags the page with that object, e.g. ``artwork:12`` or
+  ``artist:3``;
+* a list or count over a table tags it with the table's rows as a whole,
+  e.g. ``artwork:*``, since new and deleted rows change what it shows;
+* a grouped count or sum over a catalogue table tags it with
+  ``model:values``, since any edit can change the totals;
+* any read of another table (tags, valuations, memberships) tags it with
+  ``model:*``.
+
+Each surrogate key has a version number in the cache, and a stored page
+records the versions of its keys. The change feed (which sees every
+catalogue save, delete and bulk write) bumps ``model:pk`` for each object
+changed. A committed INSERT or DELETE bumps the table's ``*`` key, and any
+write bumps ``model:values``; an UPDATE of a catalogue table bumps no
+``*`` key, and for other tables every write bumps ``*``. A page is served
+only while all of its versions are current, so purging touches one counter
+per key however many pages carry it, and editing artwork 12 leaves other
+artworks' pages cached. If a table a page reads is written while it
+renders, the page is not stored.
+
+An edit that moves an object into a filtered list it was not on, such as
+a new category, reaches that list's stored pages when they expire, since
+neither the page nor the edit names the other.
+
+Only anonymous, message-free responses are cached: requests carrying a
+session or flash-message cookie, and responses that set cookies or vary
+on them (pages with a CSRF token), bypass the cache. Variants are keyed
+on the path and the query string with empty values, ``page=1`` and
+tracking parameters dropped and keys in order.
+
+Purges only reach workers sharing ``PAGE_CACHE`` (Memcached or Redis);
+with the local-memory cache each process only sees its own writes.
+"""
+import contextvars
+import hashlib
+import re
+import time
+from urllib.parse import urlencode
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import caches
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_init
+from django.http import HttpResponse
+
+KEY_PREFIX = 'pagecache'
+# Apps whose tables no public page renders, so writes to them purge nothing.
+UNTRACKED_APPS = {'admin', 'auth', 'contenttypes', 'sessions', 'changefeed', 'jobs'}
+# Models whose per-object keys the change feed bumps; other models are only tagged as a whole.
+OBJECT_KEYED_MODELS = {'artists.artist', 'artworks.artwork', 'artworks.category', 'exhibitions.exhibition'}
+IGNORED_PARAMS = {'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'fbclid', 'gclid'}
+
+_FROM = re.compile(r'FROM "(\w+)"')
+_JOIN = re.compile(r'JOIN "(\w+)"')
+_AGGREGATE = re.compile(r'\bGROUP BY\b|\b(?:SUM|AVG|MIN|MAX)\(')
+_WRITE_TARGET = re.compile(r'^\s*(?:INSERT(?: OR \w+)? INTO|(UPDATE)|DELETE FROM) "(\w+)"')
+_PK_LOOKUP = re.compile(
+    r'SELECT .+ FROM "(\w+)"(?: (?:INNER|LEFT OUTER) JOIN "\w+" ON \([^)]*\))* '
+    r'WHERE "\1"\."(\w+)" = %s(?: LIMIT \d+)?',
+    re.S,
+)
+
+_collector = contextvars.ContextVar('page_cache_keys', default=None)
+_tables = None
+
+
+def _table_map():
+    """{table: (key name, pk column, keyed per object)} for every tracked model, auto-created m2m tables included."""
+    global _tables
+    if _tables is None:
+        _tables = {
+            model._meta.db_table: (
+                model._meta.model_name, model._meta.pk.column, model._meta.label_lower in OBJECT_KEYED_MODELS,
+            )
+            for model in apps.get_models(include_auto_created=True)
+            if model._meta.app_label not in UNTRACKED_APPS
+        }
+    return _tables
+
+
+def _cache():
+    return caches[getattr(settings, 'PAGE_CACHE', 'default')]
+
+
+def _version_key(key):
+    return f'{KEY_PREFIX}:key:{key}'
+
+
+def _model_keys(name, keyed):
+    return [f'{name}:*', f'{name}:values'] if keyed else [f'{name}:*']
+
+
+def model_keys():
+    return [key for name, _pk, keyed in _table_map().values() for key in _model_keys(name, keyed)]
+
+
+# ─── Tagging and purging ─────────────────────────────────────────────────────
+
+def _tag_query(sql, params, keys):
+    tables = _table_map()
+    sources = _FROM.findall(sql)
+    joined = _JOIN.findall(sql)
+    lookup = _PK_LOOKUP.fullmatch(sql.strip())
+    if lookup and sources.count(lookup[1]) == 1 and lookup[1] in tables:
+        name, pk_column, keyed = tables[lookup[1]]
+        if keyed and lookup[2] == pk_column and params:
+            keys.add(f'{name}:{params[0]}')
+            sources.remove(lookup[1])
+    aggregate = _AGGREGATE.search(sql) is not None
+    for table in sources + joined:
+        if table not in tables:
+            continue
+        name, _pk, keyed = tables[table]
+        if not keyed:
+            keys.add(f'{name}:*')
+        elif aggregate:
+            keys.add(f'{name}:values')
+        elif table in sources:
+            # Joined catalogue rows are tagged one by one as they load.
+            keys.add(f'{name}:*')
+
+
+def _tag_instance(sender, instance, **kwargs):
+    keys = _collector.get()
+    if keys is not None and instance.pk is not None:
+        keys.add(f'{sender._meta.model_name}:{instance.pk}')
+
+
+def _track_queries(execute, sql, params, many, context):
+    match = _WRITE_TARGET.match(sql)
+    if match:
+        updated, table = match.groups()
+        entry = _table_map().get(table)
+        if entry:
+            name, _pk, keyed = entry
+            # The change feed purges the objects an UPDATE of a catalogue table changed.
+            purged = [f'{name}:values'] if keyed else []
+            if not (keyed and updated):
+                purged.append(f'{name}:*')
+            context['connection'].on_commit(lambda: purge(purged))
+    else:
+        keys = _collector.get()
+        if keys is not None:
+            _tag_query(sql, params, keys)
+    return execute(sql, params, many, context)
+
+
+def _install(sender, connection, **kwargs):
+    if _track_queries not in connection.execute_wrappers:
+        # At the bottom of the stack, so per-request wrappers can still push and pop above it.
+        connection.execute_wrappers.insert(0, _track_queries)
+
+
+def install_query_tracking():
+    """Watch the queries of every database connection, and the catalogue rows they load."""
+    if not getattr(settings, 'PAGE_CACHE_ENABLED', False):
+        return
+    connection_created.connect(_install, dispatch_uid='page_cache_query_tracking')
+    for connection in connections.all(initialized_only=True):
+        _install(None, connection)
+    for label in OBJECT_KEYED_MODELS:
+        post_init.connect(_tag_instance, sender=label, dispatch_uid=f'page_cache_rows:{label}')
+
+
+def purge(keys):
+    """Invalidate every cached page tagged with one of ``keys``."""
+    if not getattr(settings, 'PAGE_CACHE_ENABLED', False):
+        return
+    cache = _cache()
+    for key in set(keys):
+        try:
+            cache.incr(_version_key(key))
+        except ValueError:
+            # Never used, or evicted: no stored page can match it.
+            pass
+
+
+def purge_objects(model_name, pks, using='default'):
+    """Purge the pages of individual objects once the current transaction commits."""
+    keys = [f'{model_name}:{pk}' for pk in pks]
+    if keys:
+        transaction.on_commit(lambda: purge(keys), using=using)
+
+
+def _versions(cache, keys):
+    """Current version of each key, starting missing ones at a value never used before."""
+    found = cache.get_many([_version_key(key) for key in keys])
+    versions = {key: found.get(_version_key(key)) for key in keys}
+    missing = [key for key, version in versions.items() if version is None]
+    if missing:
+        start = time.time_ns() // 1000
+        for key in missing:
+            cache.add(_version_key(key), start)
+        found = cache.get_many([_version_key(key) for key in missing])
+        versions.update({key: found.get(_version_key(key)) for key in missing})
+    return versions
+
+
+# ─── Middleware ──────────────────────────────────────────────────────────────
+
+def normalise_query(query_dict):
+    """The query string with empty values, page=1 and tracking parameters dropped, keys in order."""
+    items = [
+        (key, value)
+        for key, values in query_dict.lists()
+        if key not in IGNORED_PARAMS
+        for value in values
+        if value.strip() and not (key == 'page' and value.strip() == '1')
+    ]
+    return urlencode(sorted(items, key=lambda item: item[0]))
+
+
+def page_key(request):
+    variant = f'{request.get_host()}{request.path}?{normalise_query(request.GET)}'
+    return f'{KEY_PREFIX}:page:{hashlib.sha1(variant.encode()).hexdigest()}'
+
+
+class PageCacheMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PAGE_CACHE_ENABLED', False)
+        self.timeout = getattr(settings, 'PAGE_CACHE_SECONDS', 300)
+        self.exempt_routes = set(getattr(settings, 'PAGE_CACHE_EXEMPT_ROUTES', ()))
+        self.private_cookies = {settings.SESSION_COOKIE_NAME, CookieStorage.cookie_name}
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        state = getattr(request, '_page_cache', None)
+        if state is not None and state != 'hit':
+            _collector.reset(state['token'])
+            if self.storable(request, response):
+                self.store(request, response, state)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.enabled or request.method not in ('GET', 'HEAD'):
+            return None
+        if self.private_cookies & request.COOKIES.keys():
+            return None
+        match = request.resolver_match
+        if not match or match.view_name in self.exempt_routes or match.namespace in self.exempt_routes:
+            return None
+        cache = _cache()
+        key = page_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            status, content, headers, versions = entry
+            if _versions(cache, versions) == versions:
+                request._page_cache = 'hit'
+                response = HttpResponse(content, status=status)
+                for name, value in headers:
+                    response.headers[name] = value
+                response.headers['X-Page-Cache'] = 'hit'
+                return response
+        request._page_cache = {
+            'key': key,
+            'models': _versions(cache, model_keys()),
+            'keys': set(),
+        }
+        request._page_cache['token'] = _collector.set(request._page_cache['keys'])
+        return None
+
+    def storable(self, request, response):
+        cache_control = response.headers.get('Cache-Control', '')
+        return (
+            request.method == 'GET'
+            and response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and 'cookie' not in response.headers.get('Vary', '').lower()
+            and 'private' not in cache_control
+            and 'no-store' not in cache_control
+        )
+
+    def store(self, request, response, state):
+        keys = state['keys']
+        if not keys:
+            return
+        cache = _cache()
+        versions = _versions(cache, keys | state['models'].keys())
+        keyed = {name for name, _pk, keyed in _table_map().values() if keyed}
+        touched = {
+            model_key
+            for name in {key.partition(':')[0] for key in keys}
+            for model_key in _model_keys(name, name in keyed)
+        }
+        if any(versions[key] != state['models'][key] for key in touched & state['models'].keys()):
+            # Something this page read was written while it rendered.
+            return
+        headers = [(name, value) for name, value in response.headers.items() if name != 'X-Page-Cache']
+        entry = (response.status_code, response.content, headers, {key: versions[key] for key in keys})
+        cache.set(state['key'], entry, self.timeout)
+        response.headers['X-Page-Cache'] = 'miss'
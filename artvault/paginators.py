@@ -0,0 +1,43 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Below this many rows an exact COUNT is cheap enough to keep.
+ESTIMATE_THRESHOLD = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that reads the planner's row estimate for unfiltered querysets.
+
+    A COUNT(*) over a large table is a full scan on PostgreSQL; an unfiltered
+    admin changelist only needs a rough total for its page links. Filtered
+    querysets, small tables and other databases fall back to an exact count.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is None or query.where or query.distinct:
+            return super().count
+        estimate = estimated_row_count(queryset.model, queryset.db)
+        if estimate is None or estimate < ESTIMATE_THRESHOLD:
+            return super().count
+        return estimate
+
+
+def estimated_row_count(model, using='default'):
+    """Row count from PostgreSQL statistics, or None when unavailable."""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 for a table that has never been vacuumed or analysed.
+    if not row or row[0] < 0:
+        return None
+    return int(row[0])
@@ -0,0 +1,176 @@
+"""
+Opt-in sampling profiler for live requests.
+
+A request is profiled when it carries a valid signed ``X-ArtVault-Profile``
+header (see ``manage.py profile_token``) or falls in the random
+``PROFILING_SAMPLE_RATE`` fraction. A background thread samples the request
+thread's stack every ``PROFILING_INTERVAL`` seconds and the result is written
+to ``PROFILING_DIR`` in folded-stack format, which flamegraph.pl and
+speedscope read directly, next to a JSON summary. Only the newest
+``PROFILING_MAX_PROFILES`` captures are kept. Unprofiled requests pay for
+one ``random()`` call and a header lookup.
+"""
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core import signing
+from django.db import connection
+
+PROFILE_HEADER = 'HTTP_X_ARTVAULT_PROFILE'
+TOKEN_SALT = 'artvault.profiling'
+TOKEN_MAX_AGE = 60 * 60
+
+TEMPLATE_MARKERS = ('django/template/', 'templatetags/')
+SQL_MARKERS = ('django/db/backends/', 'psycopg', 'sqlite3')
+
+
+def make_token():
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign('profile')
+
+
+def token_is_valid(token):
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def _frame_label(code):
+    filename = code.co_filename
+    for marker in ('site-packages/', 'lib/python'):
+        if marker in filename:
+            filename = filename.split(marker, 1)[1]
+            break
+    else:
+        filename = filename.replace(str(settings.BASE_DIR) + '/', '')
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'
+
+
+class StackSampler(threading.Thread):
+    """Counts the stacks of one thread at a fixed interval."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name='artvault-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                self.stacks[';'.join(reversed(labels))] += 1
+
+    def finish(self):
+        self._done.set()
+        self.join()
+        return self.stacks
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+        self.interval = getattr(settings, 'PROFILING_INTERVAL', 0.001)
+
+    def __call__(self, request):
+        token = request.META.get(PROFILE_HEADER)
+        sampled = self.sample_rate and random.random() < self.sample_rate
+        if not sampled and not (token and token_is_valid(token)):
+            return self.get_response(request)
+        return self.profile(request)
+
+    def profile(self, request):
+        queries = []
+
+        def time_query(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries.append(time.perf_counter() - started)
+
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            with connection.execute_wrapper(time_query):
+                response = self.get_response(request)
+                if hasattr(response, 'render') and not response.is_rendered:
+                    response.render()
+        finally:
+            stacks = sampler.finish()
+            duration = time.perf_counter() - started
+        write_profile(request, response, duration, queries, stacks)
+        return response
+
+
+def _share(stacks, markers):
+    total = sum(stacks.values())
+    if not total:
+        return 0.0
+    hits = sum(n for stack, n in stacks.items() if any(marker in stack for marker in markers))
+    return hits / total
+
+
+def write_profile(request, response, duration, queries, stacks):
+    directory = settings.PROFILING_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    match = request.resolver_match
+    url_name = match.view_name if match else 'unresolved'
+    now = time.time_ns()
+    # Sortable by capture time, which prune_profiles relies on.
+    stamp = f'{time.strftime("%Y%m%d-%H%M%S", time.localtime(now // 10**9))}-{now // 1000 % 10**6:06d}'
+    stem = f'{stamp}-{url_name.replace(":", "_")}'
+    with open(directory / f'{stem}.folded', 'w') as fh:
+        for stack, count in stacks.most_common():
+            fh.write(f'{stack} {count}\n')
+    summary = {
+        'path': request.get_full_path(),
+        'method': request.method,
+        'url_name': url_name,
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000, 2),
+        'sql_queries': len(queries),
+        'sql_ms': round(sum(queries) * 1000, 2),
+        'samples': sum(stacks.values()),
+        'template_share': round(_share(stacks, TEMPLATE_MARKERS), 3),
+        'sql_share': round(_share(stacks, SQL_MARKERS), 3),
+        'folded': f'{stem}.folded',
+    }
+    (directory / f'{stem}.json').write_text(json.dumps(summary))
+    prune_profiles(directory, getattr(settings, 'PROFILING_MAX_PROFILES', 500))
+
+
+def prune_profiles(directory, keep):
+    """Delete all but the newest ``keep`` captures; names start with their timestamp."""
+    stems = sorted(path.stem for path in directory.glob('*.json'))
+    for stem in stems[:max(len(stems) - keep, 0)]:
+        for suffix in ('.json', '.folded'):
+            # Another worker may be pruning the same capture.
+            (directory / f'{stem}{suffix}').unlink(missing_ok=True)
+
+
+def load_profiles():
+    """Summaries of every captured profile, slowest first."""
+    directory = settings.PROFILING_DIR
+    if not directory.exists():
+        return []
+    summaries = []
+    for path in directory.glob('*.json'):
+        try:
+            summaries.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return sorted(summaries, key=lambda summary: summary['duration_ms'], reverse=True)
@@ -0,0 +1,105 @@
+"""
+Per-client, per-route rate limiting with token buckets kept in the cache.
+
+Every request draws one token from one bucket, chosen by what makes it
+expensive: ``export`` for bulk-export routes, ``search`` when it carries a
+``q=`` (an unindexed ``icontains`` scan), ``deep_page`` past
+``RATELIMIT_DEEP_PAGE`` (a large OFFSET), and ``default`` otherwise.
+Buckets are keyed by bucket, route and client, so a crawler paging through
+one list does not use up its budget for another.
+
+A bucket holds ``capacity`` tokens and refills at ``capacity / period``
+tokens a second. Refilling continuously would mean reading the bucket and
+writing it back, so instead the bucket is a counter that refills in whole
+periods: the key carries the period number, a request is one atomic
+``cache.incr()`` and the key expires with its period. The first request
+in a period also costs an ``add()``. Over-budget requests get ``429`` with
+``Retry-After`` set to the seconds left in the period.
+
+Use a cache shared by all workers (Memcached or Redis) in production; the
+default local-memory cache keeps a separate bucket per process.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+KEY_PREFIX = 'ratelimit'
+
+
+class RateLimitMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'RATELIMIT_ENABLED', True)
+        self.budgets = getattr(settings, 'RATELIMITS', {})
+        self.deep_page = getattr(settings, 'RATELIMIT_DEEP_PAGE', 20)
+        self.export_routes = set(getattr(settings, 'RATELIMIT_EXPORT_ROUTES', ()))
+        self.exempt_routes = set(getattr(settings, 'RATELIMIT_EXEMPT_ROUTES', ()))
+        self.client_header = getattr(settings, 'RATELIMIT_CLIENT_HEADER', 'REMOTE_ADDR')
+        self.trusted_proxies = getattr(settings, 'RATELIMIT_TRUSTED_PROXIES', 0)
+        self.cache_alias = getattr(settings, 'RATELIMIT_CACHE', 'default')
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.enabled:
+            return None
+        match = request.resolver_match
+        route = match.view_name if match else None
+        if not route or route in self.exempt_routes or match.namespace in self.exempt_routes:
+            return None
+        bucket = self.bucket_for(request, route)
+        if bucket not in self.budgets:
+            return None
+        capacity, period = self.budgets[bucket]
+        client = self.client(request)
+        retry_after = take_token(caches[self.cache_alias], f'{bucket}:{route}:{client}', capacity, period)
+        if retry_after is None:
+            return None
+        response = HttpResponse(
+            f'Too many requests. Try again in {retry_after} seconds.\n',
+            status=429,
+            content_type='text/plain; charset=utf-8',
+        )
+        response['Retry-After'] = str(retry_after)
+        return response
+
+    def bucket_for(self, request, route):
+        if route in self.export_routes:
+            return 'export'
+        if request.GET.get('q', '').strip():
+            return 'search'
+        page = request.GET.get('page', '')
+        if page.isdigit() and int(page) > self.deep_page:
+            return 'deep_page'
+        return 'default'
+
+    def client(self, request):
+        # Behind a proxy, set RATELIMIT_CLIENT_HEADER to the header it puts the client address in.
+        # Each proxy appends the address it received from, and anything to the
+        # left of that is whatever the client sent, so count from the right:
+        # skip the entries added by RATELIMIT_TRUSTED_PROXIES inner proxies.
+        address = request.META.get(self.client_header) or request.META.get('REMOTE_ADDR', '')
+        addresses = [part.strip() for part in address.split(',') if part.strip()]
+        if not addresses:
+            return 'unknown'
+        return addresses[max(0, len(addresses) - 1 - self.trusted_proxies)]
+
+
+def take_token(cache, name, capacity, period, now=None):
+    """Draw a token from bucket ``name``; None if granted, else seconds until it refills."""
+    now = time.time() if now is None else now
+    window = int(now // period)
+    key = f'{KEY_PREFIX}:{name}:{window}'
+    try:
+        used = cache.incr(key)
+    except ValueError:
+        # First request of the period. add() is atomic, so if another
+        # worker creates the key first the incr() is simply retried.
+        used = 1 if cache.add(key, 1, timeout=period + 1) else cache.incr(key)
+    if used <= capacity:
+        return None
+    return max(1, math.ceil((window + 1) * period - now))
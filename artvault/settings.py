@@ -20,13 +20,24 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     # Project apps
+    'artvault',
     'artists',
     'artworks',
     'exhibitions',
+    'search',
+    'changefeed',
+    'savedsearches',
+    'jobs',
 ]
 
 MIDDLEWARE = [
+    'artvault.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'artvault.static_assets.StaticFilesMiddleware',
+    'artvault.compression.MinimumSizeGZipMiddleware',
+    'artvault.profiling.ProfilingMiddleware',
+    'artvault.ratelimit.RateLimitMiddleware',
+    'artvault.page_cache.PageCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -55,6 +66,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'artvault.wsgi.application'
 
+# Kiosk nodes serve catalogue reads from a local read-only snapshot
+# (manage.py build_snapshot) instead of the central database.
+CATALOGUE_SNAPSHOT_READS = os.environ.get('CATALOGUE_SNAPSHOT_READS', 'False') == 'True'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -63,8 +78,13 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD', 'postgres'),
         'HOST': os.environ.get('DB_HOST', 'localhost'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        # Each request commits as one transaction, so change-feed rows land
+        # atomically with the writes they describe. Read-only kiosks skip it
+        # so that a request never has to reach the central database.
+        'ATOMIC_REQUESTS': not CATALOGUE_SNAPSHOT_READS,
     }
 }
+DATABASE_ROUTERS = ['artvault.snapshot.SnapshotRouter']
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -82,7 +102,91 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# collectstatic writes content-hashed copies plus .gz/.br variants, which
+# StaticFilesMiddleware serves from STATIC_ROOT with immutable cache headers.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'artvault.static_assets.CompressedManifestStaticFilesStorage'},
+}
+
+# Dynamic responses smaller than this are sent uncompressed.
+GZIP_MIN_SIZE = 1024
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Local working files (indexes, snapshots) that are rebuilt, never committed.
+VAR_DIR = BASE_DIR / 'var'
+TEXT_INDEX_DIR = VAR_DIR / 'text_index'
+
+CATALOGUE_SNAPSHOT_PATH = Path(os.environ.get('CATALOGUE_SNAPSHOT_PATH', VAR_DIR / 'snapshot' / 'catalogue.sqlite3'))
+DATABASES['snapshot'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': f'file:{CATALOGUE_SNAPSHOT_PATH}?mode=ro',
+    'OPTIONS': {'uri': True},
+}
+
+# Request profiling: a random fraction of requests, plus any request carrying
+# a signed X-ArtVault-Profile header (manage.py profile_token). Only the
+# newest PROFILING_MAX_PROFILES captures are kept.
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', '0'))
+PROFILING_INTERVAL = 0.001
+PROFILING_DIR = VAR_DIR / 'profiles'
+PROFILING_MAX_PROFILES = 500
+
+# Prometheus metrics at /metrics. Each worker process snapshots its counters
+# to METRICS_DIR, and the endpoint sums them. Restrict scraping to the listed
+# addresses when set (comma-separated).
+METRICS_DIR = VAR_DIR / 'metrics'
+METRICS_FLUSH_INTERVAL = 5
+METRICS_ALLOWED_IPS = [ip for ip in os.environ.get('METRICS_ALLOWED_IPS', '').split(',') if ip]
+
+# Rate limiting: per client and route, each bucket allows (requests, per
+# seconds). Searches (q=), deep pages and exports have their own stricter
+# buckets. Buckets live in RATELIMIT_CACHE, which should be shared by all
+# workers in production.
+RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', 'True') == 'True'
+RATELIMIT_CACHE = 'default'
+RATELIMITS = {
+    'default': (120, 60),
+    'search': (30, 60),
+    'deep_page': (20, 60),
+    'export': (10, 60),
+}
+RATELIMIT_DEEP_PAGE = 20
+RATELIMIT_EXPORT_ROUTES = ['changefeed:changes']
+RATELIMIT_EXEMPT_ROUTES = ['admin', 'metrics']
+RATELIMIT_CLIENT_HEADER = os.environ.get('RATELIMIT_CLIENT_HEADER', 'REMOTE_ADDR')
+# Proxies behind the outermost one, each appending to RATELIMIT_CLIENT_HEADER.
+RATELIMIT_TRUSTED_PROXIES = int(os.environ.get('RATELIMIT_TRUSTED_PROXIES', '0'))
+
+# Whole-page cache for anonymous GETs, purged by surrogate key when the
+# objects a page shows change. Purges only reach other workers through a
+# shared cache (Memcached or Redis), so it is off by default.
+PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', 'False') == 'True'
+PAGE_CACHE = 'default'
+PAGE_CACHE_SECONDS = 300
+PAGE_CACHE_EXEMPT_ROUTES = ['admin', 'metrics', 'changefeed']
+
+# Rendered artwork cards, keyed by the rows they show, so an edit simply
+# stops matching the old entry and nothing needs purging.
+ARTWORK_CARD_CACHE = 'default'
+ARTWORK_CARD_CACHE_SECONDS = 60 * 60 * 24
+
+# Hidden exhibitions that closed longer ago than this are moved to the
+# archive tables by manage.py archive_exhibitions.
+EXHIBITION_ARCHIVE_AFTER_DAYS = 365
+
+# Background jobs (manage.py run_worker). Failed jobs are retried after
+# JOBS_RETRY_DELAY seconds, doubling up to JOBS_RETRY_MAX_DELAY. A job still
+# running after JOBS_LEASE_SECONDS is assumed to have lost its worker.
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_DELAY = 10
+JOBS_RETRY_MAX_DELAY = 60 * 60
+JOBS_LEASE_SECONDS = 15 * 60
+JOBS_KEEP_DAYS = 7
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Serve unsearched artwork list pages from an in-memory column index.
+ARTWORK_CATALOGUE_INDEX = os.environ.get('ARTWORK_CATALOGUE_INDEX', 'False') == 'True'
@@ -0,0 +1,272 @@
+"""
+Read-only SQLite snapshot of the public catalogue for kiosk nodes.
+
+``build_snapshot`` copies artists, categories, artworks, active exhibitions
+and their memberships into ``CATALOGUE_SNAPSHOT_PATH`` with the exact table
+layout Django creates, so the ordinary ORM reads it through the
+``snapshot`` database alias. With ``CATALOGUE_SNAPSHOT_READS`` on,
+``SnapshotRouter`` sends every read of those models there; SQLite opens
+the file read-only with nothing to load. Later builds replay the change
+feed from the cursor stored in the snapshot instead of copying everything.
+"""
+import hashlib
+import os
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+SNAPSHOT_ALIAS = 'snapshot'
+SNAPSHOT_TABLES = {
+    'artists.artist', 'artworks.category', 'artworks.artwork',
+    'exhibitions.exhibition', 'exhibitions.exhibition_artworks',
+}
+META_TABLE = 'snapshot_meta'
+BATCH_SIZE = 5000
+
+
+class SnapshotRouter:
+    """Route catalogue reads to the snapshot on kiosk nodes; everything else is unchanged."""
+
+    def db_for_read(self, model, **hints):
+        if not settings.CATALOGUE_SNAPSHOT_READS:
+            return None
+        # Be explicit for other models too: Django would otherwise follow an
+        # instance hint from a snapshot row into the snapshot database.
+        return SNAPSHOT_ALIAS if model._meta.label_lower in SNAPSHOT_TABLES else 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default' if settings.CATALOGUE_SNAPSHOT_READS else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {'default', SNAPSHOT_ALIAS}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        return False if db == SNAPSHOT_ALIAS else None
+
+
+def _catalogue_models():
+    from artists.models import Artist
+    from artworks.models import Artwork, Category
+    from exhibitions.models import Exhibition
+    return {model._meta.model_name: model for model in (Artist, Category, Artwork, Exhibition)}
+
+
+def _open(path):
+    """A writable Django SQLite connection to ``path``, outside the connection registry."""
+    settings_dict = {**connections.settings[SNAPSHOT_ALIAS], 'NAME': str(path), 'OPTIONS': {}}
+    return DatabaseWrapper(settings_dict, alias=SNAPSHOT_ALIAS)
+
+
+def schema_signature(connection):
+    models = _catalogue_models()
+    tables = [*models.values(), models['exhibition'].artworks.through]
+    columns = [
+        f'{model._meta.db_table}.{field.column}:{field.db_type(connection)}'
+        for model in tables for field in model._meta.local_concrete_fields
+    ]
+    return hashlib.sha1('\n'.join(columns).encode()).hexdigest()[:16]
+
+
+class SnapshotWriter:
+    def __init__(self, connection):
+        self.connection = connection
+        self.models = _catalogue_models()
+        self.exhibition = self.models['exhibition']
+        self.through = self.exhibition.artworks.through
+        quote = connection.ops.quote_name
+        self.sql = {}
+        for model in [*self.models.values(), self.through]:
+            table = quote(model._meta.db_table)
+            columns = [quote(field.column) for field in model._meta.concrete_fields]
+            updates = ', '.join(f'{column} = excluded.{column}' for column in columns[1:])
+            self.sql[model] = {
+                'insert': f'INSERT INTO {table} ({", ".join(columns)}) '
+                          f'VALUES ({", ".join(["%s"] * len(columns))})',
+                'upsert': f'INSERT INTO {table} ({", ".join(columns)}) '
+                          f'VALUES ({", ".join(["%s"] * len(columns))}) '
+                          f'ON CONFLICT ({columns[0]}) DO UPDATE SET {updates}',
+                'delete': f'DELETE FROM {table} WHERE {columns[0]} = %s',
+                'exists': f'SELECT 1 FROM {table} WHERE {columns[0]} = %s',
+            }
+        through = quote(self.through._meta.db_table)
+        self.sql['link'] = f'INSERT OR IGNORE INTO {through} ("exhibition_id", "artwork_id") VALUES (%s, %s)'
+        self.sql['unlink'] = f'DELETE FROM {through} WHERE "exhibition_id" = %s AND "artwork_id" = %s'
+        self.sql['unlink_exhibition'] = f'DELETE FROM {through} WHERE "exhibition_id" = %s'
+        self.sql['unlink_artwork'] = f'DELETE FROM {through} WHERE "artwork_id" = %s'
+
+    def prepare(self, model, values):
+        return [
+            field.get_db_prep_value(value, self.connection)
+            for field, value in zip(model._meta.concrete_fields, values)
+        ]
+
+    def copy(self, model, queryset):
+        """Bulk-insert every row of ``queryset``; returns the row count."""
+        fields = [field.attname for field in model._meta.concrete_fields]
+        count, batch = 0, []
+        with self.connection.cursor() as cursor:
+            for row in queryset.values_list(*fields).iterator(chunk_size=BATCH_SIZE):
+                batch.append(self.prepare(model, row))
+                if len(batch) >= BATCH_SIZE:
+                    cursor.executemany(self.sql[model]['insert'], batch)
+                    count, batch = count + len(batch), []
+            if batch:
+                cursor.executemany(self.sql[model]['insert'], batch)
+        return count + len(batch)
+
+    def copy_memberships(self, exhibition_pks=None):
+        queryset = self.through.objects.using('default').filter(exhibition__is_active=True)
+        if exhibition_pks is not None:
+            queryset = queryset.filter(exhibition_id__in=exhibition_pks)
+        return self.copy(self.through, queryset.order_by())
+
+    def apply(self, cursor, change):
+        """Replay one change-feed entry."""
+        from changefeed.models import Change
+        model = self.models.get(change.model)
+        if model is None:
+            return
+        if change.action == Change.Action.LINKED:
+            if self._exists(cursor, self.exhibition, change.object_id):
+                cursor.execute(self.sql['link'], [change.object_id, change.related_id])
+            return
+        if change.action == Change.Action.UNLINKED:
+            cursor.execute(self.sql['unlink'], [change.object_id, change.related_id])
+            return
+        hidden = model is self.exhibition and not (change.data or {}).get('is_active')
+        if change.action == Change.Action.DELETED or hidden:
+            if model is self.exhibition:
+                cursor.execute(self.sql['unlink_exhibition'], [change.object_id])
+            elif change.model == 'artwork':
+                cursor.execute(self.sql['unlink_artwork'], [change.object_id])
+            cursor.execute(self.sql[model]['delete'], [change.object_id])
+            return
+        values = [
+            field.to_python(change.data[field.attname]) if field.attname in change.data else field.get_default()
+            for field in model._meta.concrete_fields
+        ]
+        newly_shown = model is self.exhibition and not self._exists(cursor, model, change.object_id)
+        cursor.execute(self.sql[model]['upsert'], self.prepare(model, values))
+        if newly_shown:
+            # Its earlier link changes were skipped while it was inactive.
+            self.copy_memberships([change.object_id])
+
+    def _exists(self, cursor, model, pk):
+        cursor.execute(self.sql[model]['exists'], [pk])
+        return cursor.fetchone() is not None
+
+
+def _write_meta(connection, cursor_value):
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT OR REPLACE INTO {META_TABLE} (key, value) VALUES (%s, %s)',
+            [('cursor', str(cursor_value)), ('schema', schema_signature(connection)),
+             ('built_at', str(int(time.time())))],
+        )
+
+
+def _read_meta(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT name FROM sqlite_master WHERE type = 'table' AND name = '{META_TABLE}'")
+        if cursor.fetchone() is None:
+            return {}
+        cursor.execute(f'SELECT key, value FROM {META_TABLE}')
+        return dict(cursor.fetchall())
+
+
+def snapshot_cursor():
+    """The change feed cursor the kiosk's snapshot has been brought up to."""
+    return int(_read_meta(connections[SNAPSHOT_ALIAS]).get('cursor', 0))
+
+
+def build_full(path):
+    """Write a fresh snapshot beside ``path`` and swap it in atomically."""
+    staged = path.with_name(path.name + '.building')
+    staged.unlink(missing_ok=True)
+    from changefeed.feed import latest_cursor
+    # Rows read below may be newer than this cursor; replaying those
+    # changes again later is harmless.
+    cursor_value = latest_cursor()
+    connection = _open(staged)
+    counts = {}
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode = OFF')
+            cursor.execute('PRAGMA synchronous = OFF')
+        writer = SnapshotWriter(connection)
+        connection.set_autocommit(False)
+        # Indexes are deferred until the editor exits, after the rows are in.
+        with connection.schema_editor(atomic=False) as editor:
+            for model in writer.models.values():
+                editor.create_model(model)
+            editor.execute(f'CREATE TABLE {META_TABLE} (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            for label, model in writer.models.items():
+                queryset = model.objects.using('default').order_by()
+                if model is writer.exhibition:
+                    queryset = queryset.filter(is_active=True)
+                counts[label] = writer.copy(model, queryset)
+            counts['membership'] = writer.copy_memberships()
+        _write_meta(connection, cursor_value)
+        connection.commit()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+    finally:
+        connection.close()
+    os.replace(staged, path)
+    return counts, cursor_value
+
+
+def apply_changes(path):
+    """Replay the change feed into an existing snapshot.
+
+    Returns (changes applied, new cursor), or None when a full build is
+    needed: no usable snapshot, a schema change, or pruned changes.
+    """
+    from changefeed.feed import changes_since
+    if not path.exists():
+        return None
+    connection = _open(path)
+    try:
+        meta = _read_meta(connection)
+        if meta.get('schema') != schema_signature(connection) or 'cursor' not in meta:
+            return None
+        writer = SnapshotWriter(connection)
+        cursor_value, applied = int(meta['cursor']), 0
+        connection.set_autocommit(False)
+        with connection.cursor() as cursor:
+            while True:
+                changes, cursor_value, has_more, resync = changes_since(cursor_value, BATCH_SIZE)
+                if resync:
+                    connection.rollback()
+                    return None
+                for change in changes:
+                    writer.apply(cursor, change)
+                applied += len(changes)
+                if not has_more:
+                    break
+        _write_meta(connection, cursor_value)
+        connection.commit()
+    finally:
+        connection.close()
+    return applied, cursor_value
+
+
+def build_snapshot(full=False, path=None):
+    """Bring the snapshot up to date; returns a summary dict."""
+    path = path or settings.CATALOGUE_SNAPSHOT_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    result = None if full else apply_changes(path)
+    if result is not None:
+        applied, cursor_value = result
+        summary = {'mode': 'incremental', 'changes': applied}
+    else:
+        counts, cursor_value = build_full(path)
+        summary = {'mode': 'full', **counts}
+    summary.update(cursor=cursor_value, seconds=round(time.perf_counter() - started, 2),
+                   size=path.stat().st_size)
+    return summary
@@ -0,0 +1,85 @@
+"""
+Fingerprinted, precompressed static files.
+
+``collectstatic`` copies every file under a content-hashed name (listed in
+``staticfiles.json``) and writes gzip/brotli variants beside each text file.
+``StaticFilesMiddleware`` serves ``STATIC_ROOT`` straight from disk, picking
+the smallest variant the client accepts; hashed names never change content,
+so they are sent with a one-year immutable cache lifetime.
+"""
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .compression import ENCODINGS, accepted_encodings, compress_file
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=300'
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also precompresses the files it collects."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        names = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            names.add(name)
+            if hashed_name:
+                names.add(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for name in sorted(names):
+            if self.exists(name):
+                compress_file(self.path(name))
+
+
+class StaticFilesMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL if settings.STATIC_URL.startswith('/') else None
+        self.root = str(settings.STATIC_ROOT)
+        manifest = getattr(staticfiles_storage, 'hashed_files', {})
+        self.immutable = set(manifest.values())
+
+    def __call__(self, request):
+        if (
+            self.prefix is None
+            or request.method not in ('GET', 'HEAD')
+            or not request.path_info.startswith(self.prefix)
+        ):
+            return self.get_response(request)
+        name = request.path_info[len(self.prefix):]
+        try:
+            path = safe_join(self.root, name)
+        except SuspiciousFileOperation:
+            return self.get_response(request)
+        if not os.path.isfile(path):
+            return self.get_response(request)
+        return self.serve(request, name, path)
+
+    def serve(self, request, name, path):
+        stat = os.stat(path)
+        if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+            return HttpResponseNotModified()
+        content_type, _ = mimetypes.guess_type(name)
+        accepted = accepted_encodings(request)
+        encoding = None
+        for suffix, coding in ENCODINGS:
+            if coding in accepted and os.path.isfile(path + suffix):
+                path, encoding = path + suffix, coding
+                break
+        response = FileResponse(open(path, 'rb'), content_type=content_type or 'application/octet-stream')
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['Vary'] = 'Accept-Encoding'
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if name in self.immutable else DEFAULT_CACHE_CONTROL
+        return response
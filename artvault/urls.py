@@ -3,6 +3,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from . import views
+from .metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -10,6 +11,10 @@ urlpatterns = [
     path('artists/', include('artists.urls', namespace='artists')),
     path('artworks/', include('artworks.urls', namespace='artworks')),
     path('exhibitions/', include('exhibitions.urls', namespace='exhibitions')),
+    path('search/', include('search.urls', namespace='search')),
+    path('changes/', include('changefeed.urls', namespace='changefeed')),
+    path('saved-searches/', include('savedsearches.urls', namespace='savedsearches')),
+    path('metrics', metrics_view, name='metrics'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
 handler404 = 'artvault.views.custom_404'
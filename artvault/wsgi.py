@@ -3,3 +3,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'artvault.settings')
 application = get_wsgi_application()
+
+from artworks.catalogue_index import get_catalogue_index, index_enabled  # noqa: E402
+
+if index_enabled():
+    get_catalogue_index()
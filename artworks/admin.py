@@ -1,17 +1,40 @@
 from django.contrib import admin
-from .models import Artwork, Category
+
+from artvault.paginators import EstimatedCountPaginator
+from .models import Artwork, Category, ImageLinkCheck, Tag
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'colour_hex')
+    list_display = ('name', 'parent', 'colour_hex')
+    list_select_related = ('parent',)
     search_fields = ('name',)
+    autocomplete_fields = ('parent',)
+    readonly_fields = ('path',)
 
 
 @admin.register(Artwork)
 class ArtworkAdmin(admin.ModelAdmin):
     list_display = ('title', 'artist', 'category', 'year_created', 'is_on_display')
     list_filter = ('category', 'is_on_display')
+    list_select_related = ('artist', 'category')
     search_fields = ('title', 'artist__name')
     readonly_fields = ('created_at', 'updated_at')
-    raw_id_fields = ('artist',)
+    autocomplete_fields = ('artist', 'category')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'artwork_count')
+    search_fields = ('name',)
+    ordering = ('-artwork_count', 'name')
+
+
+@admin.register(ImageLinkCheck)
+class ImageLinkCheckAdmin(admin.ModelAdmin):
+    list_display = ('url', 'ok', 'status_code', 'error', 'checked_at')
+    list_filter = ('ok',)
+    search_fields = ('url',)
+    date_hierarchy = 'checked_at'
@@ -4,3 +4,6 @@ class ArtworksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'artworks'
     verbose_name = 'Artworks'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,64 @@
+"""
+Rendered artwork cards, cached per artwork.
+
+A card's key is built from everything it shows: the artwork's ``updated_at``
+and whether its image is flagged broken, the artist's ``updated_at``, and
+the category's name and colour (categories keep no timestamp). An edit to
+any of them changes the key, so stale cards are never served and never
+need purging; they just age out.
+
+A grid fetches all of its cards with one ``get_many``, renders only the
+misses and stores them with one ``set_many``. With ``select_related``
+loading the artist and category, a warm grid costs one query and one cache
+round trip.
+"""
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+CARD_TEMPLATE = 'partials/artwork_card.html'
+# Bump when the card template changes, so old markup is not served.
+CARD_VERSION = 1
+VARIANTS = ('standard', 'compact', 'manage')
+
+
+def _cache():
+    return caches[getattr(settings, 'ARTWORK_CARD_CACHE', 'default')]
+
+
+def _stamp(moment):
+    return int(moment.timestamp() * 1_000_000)
+
+
+def card_key(artwork, variant):
+    category = artwork.category
+    category_version = zlib.crc32(f'{category.name}|{category.colour_hex}'.encode()) if category else 0
+    return (
+        f'artworkcard:{CARD_VERSION}:{variant}:{artwork.pk}:{_stamp(artwork.updated_at)}:'
+        f'{int(bool(artwork.display_image_url))}:{artwork.artist_id}:{_stamp(artwork.artist.updated_at)}:'
+        f'{artwork.category_id or 0}:{category_version}'
+    )
+
+
+def render_cards(artworks, variant='standard'):
+    """The card markup of each artwork, in order, rendering only those not cached."""
+    if variant not in VARIANTS:
+        raise ValueError(f'Unknown artwork card variant {variant!r}.')
+    artworks = list(artworks)
+    if not artworks:
+        return []
+    cache = _cache()
+    keys = [card_key(artwork, variant) for artwork in artworks]
+    cards = cache.get_many(keys)
+    missing = {
+        key: render_to_string(CARD_TEMPLATE, {'artwork': artwork, 'variant': variant})
+        for key, artwork in zip(keys, artworks)
+        if key not in cards
+    }
+    if missing:
+        cache.set_many(missing, getattr(settings, 'ARTWORK_CARD_CACHE_SECONDS', 60 * 60 * 24))
+        cards.update(missing)
+    return [mark_safe(cards[key]) for key in keys]
@@ -0,0 +1,293 @@
+"""
+Per-process columnar index over the filterable Artwork fields.
+
+The artwork list only ever filters on a handful of small columns, so with
+``ARTWORK_CATALOGUE_INDEX`` enabled each worker keeps those columns in typed
+arrays, answers filter/sort/page requests from memory and only asks the
+database for the rows on the requested page.
+
+The index follows the change feed rather than this process's own writes,
+so it also sees other workers, management commands and bulk updates:
+before answering, ``get_catalogue_index()`` compares the feed's latest
+cursor with the one the index has reached and replays the artwork changes
+in between, or reloads if the feed was pruned past it. A committed write
+therefore shows up in every worker's next list request. On kiosk nodes
+the index is built from the snapshot and reloads when the snapshot's
+cursor moves.
+"""
+import math
+import threading
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import islice
+
+from django.conf import settings
+
+NO_CATEGORY = 0
+SORT_KEYS = ('year_created', '-year_created', 'title', '-title')
+INDEX_FIELDS = ('pk', 'artist_id', 'category_id', 'year_created', 'is_on_display', 'estimated_value', 'title')
+REPLAY_BATCH_SIZE = 1000
+
+
+def index_enabled():
+    return getattr(settings, 'ARTWORK_CATALOGUE_INDEX', False)
+
+
+def row_from_change(change):
+    """The indexed fields of an artwork from its change feed snapshot."""
+    return (change.object_id, *(change.data[field] for field in INDEX_FIELDS[1:]))
+
+
+def feed_cursor():
+    """The change feed cursor the catalogue this process reads has reached."""
+    if settings.CATALOGUE_SNAPSHOT_READS:
+        from artvault.snapshot import snapshot_cursor
+        return snapshot_cursor()
+    from changefeed.feed import latest_cursor
+    return latest_cursor()
+
+
+class CatalogueIndex:
+    """Typed column store for Artwork rows, kept current from the change feed."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.pks = array('q')
+        self.artist_ids = array('q')
+        self.category_ids = array('q')
+        self.years = array('l')
+        self.on_display = array('b')
+        self.values = array('d')
+        self.titles = []
+        self._slots = {}
+        self._by_year = array('q')
+        self._by_title = array('q')
+        self._counts = Counter()
+        self.cursor = 0
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._slots)
+
+    # ─── Loading and patching ────────────────────────────────────────────────
+
+    def load(self):
+        """(Re)build every column from the database."""
+        from .models import Artwork
+        # Rows read below may be newer than this cursor; replaying those
+        # changes later rewrites them with the same values.
+        cursor = feed_cursor()
+        rows = (
+            Artwork.objects.order_by('pk')
+            .values_list(*INDEX_FIELDS)
+            .iterator(chunk_size=10000)
+        )
+        with self._lock:
+            self._reset()
+            for row in rows:
+                slot = self._append(row)
+                self._counts[self._count_key(slot)] += 1
+            slots = range(len(self.pks))
+            self._by_year = array('q', sorted(slots, key=self._year_key))
+            self._by_title = array('q', sorted(slots, key=self._title_key))
+            self.cursor = cursor
+            self.loaded = True
+        return self
+
+    def sync(self):
+        """Apply the artwork changes committed since the index's cursor."""
+        latest = feed_cursor()
+        if latest <= self.cursor:
+            return self
+        with self._lock:
+            if latest <= self.cursor:
+                return self
+            if settings.CATALOGUE_SNAPSHOT_READS:
+                # The snapshot keeps no feed to replay.
+                return self.load()
+            from changefeed.feed import changes_since
+            from changefeed.models import Change
+            has_more = True
+            while has_more:
+                changes, cursor, has_more, resync = changes_since(
+                    self.cursor, REPLAY_BATCH_SIZE, models=['artwork'],
+                )
+                if resync:
+                    return self.load()
+                for change in changes:
+                    if change.action == Change.Action.DELETED:
+                        self.remove(change.object_id)
+                    else:
+                        self.upsert(row_from_change(change))
+                self.cursor = cursor if has_more else max(cursor, latest)
+        return self
+
+    def upsert(self, row):
+        """Insert or update one row of ``INDEX_FIELDS`` values."""
+        with self._lock:
+            slot = self._slots.get(row[0])
+            if slot is None:
+                slot = self._append(row)
+            else:
+                self._unlink(slot)
+                self._write(slot, row)
+            self._counts[self._count_key(slot)] += 1
+            insort(self._by_year, slot, key=self._year_key)
+            insort(self._by_title, slot, key=self._title_key)
+
+    def remove(self, pk):
+        with self._lock:
+            slot = self._slots.pop(pk, None)
+            if slot is not None:
+                self._unlink(slot)
+
+    def _append(self, row):
+        slot = len(self.pks)
+        self.pks.append(row[0])
+        self.artist_ids.append(0)
+        self.category_ids.append(0)
+        self.years.append(0)
+        self.on_display.append(0)
+        self.values.append(math.nan)
+        self.titles.append('')
+        self._write(slot, row)
+        self._slots[row[0]] = slot
+        return slot
+
+    def _write(self, slot, row):
+        _pk, artist_id, category_id, year, on_display, value, title = row
+        self.artist_ids[slot] = artist_id
+        self.category_ids[slot] = category_id or NO_CATEGORY
+        self.years[slot] = year
+        self.on_display[slot] = bool(on_display)
+        self.values[slot] = math.nan if value is None else float(value)
+        self.titles[slot] = title.casefold()
+
+    def _unlink(self, slot):
+        """Drop a slot from the sort orders and counters before it changes."""
+        self._counts[self._count_key(slot)] -= 1
+        for order, key in ((self._by_year, self._year_key), (self._by_title, self._title_key)):
+            del order[bisect_left(order, key(slot), key=key)]
+
+    def _year_key(self, slot):
+        return self.years[slot], self.pks[slot]
+
+    def _title_key(self, slot):
+        return self.titles[slot], self.pks[slot]
+
+    def _count_key(self, slot):
+        return self.category_ids[slot], self.on_display[slot]
+
+    # ─── Queries ─────────────────────────────────────────────────────────────
+
+    def _predicate(self, category_ids=None, on_display=None, artist_id=None):
+        if category_ids is None and on_display is None and artist_id is None:
+            return None
+        category_ids = None if category_ids is None else frozenset(category_ids)
+        cats, display, artists = self.category_ids, self.on_display, self.artist_ids
+
+        def matches(slot):
+            return (
+                (category_ids is None or cats[slot] in category_ids)
+                and (on_display is None or display[slot] == on_display)
+                and (artist_id is None or artists[slot] == artist_id)
+            )
+        return matches
+
+    def count(self, category_ids=None, on_display=None, artist_id=None):
+        with self._lock:
+            if artist_id is None:
+                category_ids = None if category_ids is None else frozenset(category_ids)
+                return sum(
+                    n for (category, display), n in self._counts.items()
+                    if (category_ids is None or category in category_ids)
+                    and (on_display is None or display == on_display)
+                )
+            matches = self._predicate(category_ids, on_display, artist_id)
+            return sum(1 for slot in self._slots.values() if matches(slot))
+
+    def page(self, sort='-year_created', offset=0, limit=None, **filters):
+        """Return the pks of one page, walking the presorted order with early exit."""
+        if sort not in SORT_KEYS:
+            raise ValueError(f'Unsupported sort key: {sort!r}')
+        with self._lock:
+            order = self._by_title if sort.endswith('title') else self._by_year
+            slots = reversed(order) if sort.startswith('-') else iter(order)
+            matches = self._predicate(**filters)
+            if matches is not None:
+                slots = filter(matches, slots)
+            stop = None if limit is None else offset + limit
+            return [self.pks[slot] for slot in islice(slots, offset, stop)]
+
+    def verify(self):
+        """Return the pks whose indexed row differs from the database."""
+        from .models import Artwork
+        with self._lock:
+            expected = dict(self._slots)
+            mismatched = []
+            rows = Artwork.objects.values_list(*INDEX_FIELDS).iterator(chunk_size=10000)
+            for row in rows:
+                slot = expected.pop(row[0], None)
+                if slot is None or self._row_at(slot) != self._normalise(row):
+                    mismatched.append(row[0])
+            mismatched.extend(expected)
+            return sorted(mismatched)
+
+    def _row_at(self, slot):
+        value = self.values[slot]
+        return (
+            self.pks[slot], self.artist_ids[slot], self.category_ids[slot], self.years[slot],
+            bool(self.on_display[slot]), None if math.isnan(value) else value, self.titles[slot],
+        )
+
+    @staticmethod
+    def _normalise(row):
+        pk, artist_id, category_id, year, on_display, value, title = row
+        return (
+            pk, artist_id, category_id or NO_CATEGORY, year,
+            bool(on_display), None if value is None else float(value), title.casefold(),
+        )
+
+
+class IndexedArtworkList:
+    """Sequence that lets Django's Paginator page through index results."""
+
+    def __init__(self, index, sort='-year_created', **filters):
+        self.index = index
+        self.sort = sort
+        self.filters = filters
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self.index.count(**self.filters)
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        from .models import Artwork
+        start = key.start or 0
+        limit = None if key.stop is None else max(key.stop - start, 0)
+        pks = self.index.page(sort=self.sort, offset=start, limit=limit, **self.filters)
+        artworks = Artwork.objects.select_related('artist', 'category').in_bulk(pks)
+        return [artworks[pk] for pk in pks if pk in artworks]
+
+
+_index = CatalogueIndex()
+
+
+def get_catalogue_index():
+    """The process-wide index, loaded on first use and synced on every call."""
+    if not _index.loaded:
+        with _index._lock:
+            if not _index.loaded:
+                return _index.load()
+    return _index.sync()
@@ -0,0 +1,37 @@
+"""
+Category tree helpers built on ``Category.path``.
+
+Every category stores the ids from the root down to itself, so subtree
+membership is a prefix match, ancestors are read straight off the path,
+and per-subtree totals roll up from one grouped count without recursion.
+"""
+from collections import Counter
+
+from django.db.models import Count
+
+from .models import Artwork
+
+
+def tree_order(categories):
+    """Categories depth-first, each parent before its children and siblings by name."""
+    categories = list(categories)
+    names = {category.pk: category.name.lower() for category in categories}
+    return sorted(categories, key=lambda category: [names.get(pk, '') for pk in category.path_ids()])
+
+
+def with_artwork_counts(categories):
+    """Set ``direct_artwork_count`` and subtree-wide ``artwork_count`` on each category."""
+    direct = dict(
+        Artwork.objects.order_by().filter(category__isnull=False)
+        .values_list('category').annotate(total=Count('pk'))
+    )
+    totals = Counter()
+    categories = list(categories)
+    paths = {category.pk: category.path_ids() for category in categories}
+    for category_pk, count in direct.items():
+        for ancestor_pk in paths.get(category_pk, [category_pk]):
+            totals[ancestor_pk] += count
+    for category in categories:
+        category.direct_artwork_count = direct.get(category.pk, 0)
+        category.artwork_count = totals[category.pk]
+    return categories
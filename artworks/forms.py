@@ -1,18 +1,42 @@
 from django import forms
+from django.conf import settings
+from django.forms.models import ModelChoiceIterator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from artists.forms import EraFilterForm
+from artists.models import Artist
+from .categories import tree_order
 from .models import Artwork, Category
+from .tagging import parse_tag_query, set_artwork_tags, split_tags
+
+
+class CategoryChoiceIterator(ModelChoiceIterator):
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for category in tree_order(self.queryset):
+            yield self.choice(category)
+
+
+class CategoryChoiceField(forms.ModelChoiceField):
+    """Category select listing the tree depth-first, with subcategories indented."""
+    iterator = CategoryChoiceIterator
+
+    def label_from_instance(self, obj):
+        return '— ' * obj.depth + obj.name
 
 
 class CategoryForm(forms.ModelForm):
     class Meta:
         model = Category
-        fields = ['name', 'description', 'colour_hex']
+        fields = ['name', 'parent', 'description', 'colour_hex']
+        field_classes = {'parent': CategoryChoiceField}
         widgets = {
             'name': forms.TextInput(attrs={
                 'class': 'form-control',
                 'placeholder': 'e.g. Oil Painting',
             }),
+            'parent': forms.Select(attrs={'class': 'form-select'}),
             'description': forms.Textarea(attrs={
                 'class': 'form-control',
                 'rows': 3,
@@ -24,6 +48,7 @@ class CategoryForm(forms.ModelForm):
             }),
         }
         labels = {
+            'parent': 'Parent Category',
             'colour_hex': 'Badge Colour',
         }
         error_messages = {
@@ -33,8 +58,24 @@ class CategoryForm(forms.ModelForm):
             }
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['parent'].empty_label = 'None (top level)'
+        if self.instance.pk:
+            # A category cannot move into its own subtree.
+            self.fields['parent'].queryset = Category.objects.exclude(path__startswith=self.instance.path)
+
 
 class ArtworkForm(forms.ModelForm):
+    tags = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'e.g. impressionism, landscape, plein air',
+        }),
+        help_text='Comma-separated tags for movement, subject or technique.',
+    )
+
     class Meta:
         model = Artwork
         fields = [
@@ -42,6 +83,7 @@ class ArtworkForm(forms.ModelForm):
             'year_created', 'medium', 'dimensions',
             'estimated_value', 'image_url', 'is_on_display',
         ]
+        field_classes = {'category': CategoryChoiceField}
         widgets = {
             'title': forms.TextInput(attrs={
                 'class': 'form-control',
@@ -98,6 +140,11 @@ class ArtworkForm(forms.ModelForm):
             'medium': {'required': 'Please specify the medium used.'},
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields['tags'].initial = ', '.join(tag.name for tag in self.instance.tags.all())
+
     def clean_year_created(self):
         year = self.cleaned_data.get('year_created')
         current_year = timezone.now().year
@@ -111,8 +158,15 @@ class ArtworkForm(forms.ModelForm):
             raise ValidationError('Estimated value cannot be negative.')
         return value
 
+    def _save_m2m(self):
+        # Runs after the artwork row is written, whether saved via save() or
+        # save(commit=False) followed by save_m2m().
+        super()._save_m2m()
+        if 'tags' in self.changed_data:
+            set_artwork_tags(self.instance, split_tags(self.cleaned_data['tags']))
 
-class ArtworkFilterForm(forms.Form):
+
+class ArtworkFilterForm(EraFilterForm):
     """Used on the artwork list page for filtering/sorting."""
     q = forms.CharField(
         required=False,
@@ -122,12 +176,27 @@ class ArtworkFilterForm(forms.Form):
         }),
         label='Search',
     )
-    category = forms.ModelChoiceField(
+    category = CategoryChoiceField(
         queryset=Category.objects.all(),
         required=False,
         empty_label='All Categories',
         widget=forms.Select(attrs={'class': 'form-select'}),
     )
+    tags = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'landscape, oil | tempera, -portrait',
+        }),
+        label='Tags',
+        help_text='Commas mean all of, | means any of, a leading - excludes.',
+    )
+    nationality = forms.ChoiceField(
+        choices=[('', 'All Nationalities'), *Artist.Nationality.choices],
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Artist Nationality',
+    )
     on_display = forms.ChoiceField(
         choices=[('', 'All'), ('yes', 'On Display'), ('no', 'Not on Display')],
         required=False,
@@ -146,3 +215,36 @@ class ArtworkFilterForm(forms.Form):
         widget=forms.Select(attrs={'class': 'form-select'}),
         label='Sort By',
     )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Tags live only in the central database, which kiosks do not read.
+        if settings.CATALOGUE_SNAPSHOT_READS:
+            del self.fields['tags']
+
+    def clean_tags(self):
+        """Parsed as (groups that must all match, excluded tags), or None."""
+        groups, excluded = parse_tag_query(self.cleaned_data.get('tags', ''))
+        return (groups, excluded) if groups or excluded else None
+
+
+class ColourSearchForm(forms.Form):
+    colour = forms.RegexField(
+        regex=r'^#[0-9a-fA-F]{6}$',
+        initial='#1a3c8f',
+        widget=forms.TextInput(attrs={
+            'class': 'form-control form-control-color',
+            'type': 'color',
+        }),
+        error_messages={'invalid': 'Enter a colour such as #1a3c8f.'},
+        label='Colour',
+    )
+
+
+class ValuationReportForm(forms.Form):
+    as_of = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+        label='Value as of',
+        help_text='Leave blank for today.',
+    )
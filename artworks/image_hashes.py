@@ -0,0 +1,214 @@
+"""
+Perceptual hashes for spotting the same artwork entered twice.
+
+Each image gets a 64-bit average hash and DCT hash. The pHash is also stored
+as four 16-bit bands: two hashes within Hamming distance 7 must agree on some
+band to within one bit, so a near-duplicate lookup is a handful of indexed
+``IN`` probes instead of a table scan. Whole-catalogue reports use a BK-tree.
+"""
+import math
+from io import BytesIO
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from .images import process_images
+
+HASH_SIZE = 8
+DCT_SIZE = 32
+BAND_BITS = 16
+BANDS = 64 // BAND_BITS
+MAX_DISTANCE = 7
+DEFAULT_DISTANCE = 6
+
+
+def _grayscale(data, size):
+    from PIL import Image
+    with Image.open(BytesIO(data)) as image:
+        return list(image.convert('L').resize((size, size), Image.Resampling.LANCZOS).getdata())
+
+
+def _bits_to_int(bits):
+    value = 0
+    for bit in bits:
+        value = (value << 1) | bit
+    return value
+
+
+def average_hash(data):
+    pixels = _grayscale(data, HASH_SIZE)
+    mean = sum(pixels) / len(pixels)
+    return _bits_to_int(pixel > mean for pixel in pixels)
+
+
+_COSINES = [
+    [math.cos(math.pi * k * (2 * n + 1) / (2 * DCT_SIZE)) for n in range(DCT_SIZE)]
+    for k in range(HASH_SIZE)
+]
+
+
+def perceptual_hash(data):
+    """DCT hash: the signs of the 8x8 lowest frequencies against their median."""
+    pixels = _grayscale(data, DCT_SIZE)
+    rows = [pixels[i * DCT_SIZE:(i + 1) * DCT_SIZE] for i in range(DCT_SIZE)]
+    # Only the low-frequency corner is needed, so transform rows then columns for k < 8.
+    row_dct = [[sum(c * p for c, p in zip(cosines, row)) for cosines in _COSINES] for row in rows]
+    low = [
+        sum(c * row_dct[n][v] for n, c in enumerate(_COSINES[u]))
+        for u in range(HASH_SIZE) for v in range(HASH_SIZE)
+    ]
+    median = sorted(low[1:])[len(low[1:]) // 2]
+    return _bits_to_int(value > median for value in low)
+
+
+def image_hashes(data):
+    return average_hash(data), perceptual_hash(data)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+def to_signed(value):
+    """Fit an unsigned 64-bit hash into a signed BigIntegerField."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def to_unsigned(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+def bands(value):
+    mask = (1 << BAND_BITS) - 1
+    return [(value >> (BAND_BITS * i)) & mask for i in range(BANDS)]
+
+
+def _band_probes(band):
+    return [band] + [band ^ (1 << bit) for bit in range(BAND_BITS)]
+
+
+def similar_image_hashes(phash, max_distance=DEFAULT_DISTANCE, exclude_pk=None):
+    """Return (artwork pk, distance) pairs for stored pHashes near ``phash``."""
+    from .models import ArtworkImageHash
+    if max_distance > MAX_DISTANCE:
+        raise ValueError(f'Band probing only guarantees distances up to {MAX_DISTANCE}.')
+    probes = Q()
+    for i, band in enumerate(bands(phash)):
+        probes |= Q(**{f'band{i}__in': _band_probes(band)})
+    candidates = ArtworkImageHash.objects.filter(probes).values_list('artwork_id', 'phash')
+    if exclude_pk is not None:
+        candidates = candidates.exclude(artwork_id=exclude_pk)
+    matches = []
+    for pk, other in candidates:
+        distance = hamming(phash, to_unsigned(other))
+        if distance <= max_distance:
+            matches.append((pk, distance))
+    return sorted(matches, key=lambda match: (match[1], match[0]))
+
+
+def possible_duplicates(artwork, limit=3):
+    """Artworks whose image looks like ``artwork``'s, once a worker has hashed its current image."""
+    from .models import Artwork, ArtworkImageHash
+    if not artwork.image_url:
+        return []
+    phash = (
+        ArtworkImageHash.objects.filter(artwork=artwork, source_url=artwork.image_url)
+        .exclude(phash=None).values_list('phash', flat=True).first()
+    )
+    if phash is None:
+        return []
+    matches = similar_image_hashes(to_unsigned(phash), exclude_pk=artwork.pk)[:limit]
+    artworks = Artwork.objects.in_bulk([pk for pk, _distance in matches])
+    return [artworks[pk] for pk, _distance in matches if pk in artworks]
+
+
+def pending_artworks(force=False):
+    """Artworks with an image whose hash is missing or was taken from another URL."""
+    from .models import Artwork
+    queryset = Artwork.objects.exclude(image_url='')
+    if not force:
+        queryset = queryset.exclude(image_hash__source_url=F('image_url'))
+    return queryset.order_by('pk').values_list('pk', 'image_url')
+
+
+def hash_record(pk, url, hashes):
+    """The row for one result; unreadable images keep no source URL, so later runs retry them."""
+    from .models import ArtworkImageHash
+    fields = {'artwork_id': pk, 'source_url': ''}
+    if hashes is not None:
+        fields['source_url'] = url
+        ahash, phash = hashes
+        fields.update(ahash=to_signed(ahash), phash=to_signed(phash))
+        fields.update({f'band{i}': band for i, band in enumerate(bands(phash))})
+    return ArtworkImageHash(**fields)
+
+
+def save_image_hashes(results):
+    from .models import ArtworkImageHash
+    with transaction.atomic():
+        ArtworkImageHash.objects.bulk_create(
+            [hash_record(*result) for result in results],
+            update_conflicts=True,
+            unique_fields=['artwork'],
+            update_fields=['source_url', 'ahash', 'phash', 'computed_at'] + [f'band{i}' for i in range(BANDS)],
+        )
+
+
+def compute_image_hashes(jobs, workers=None, batch_size=200):
+    """Hash and store (pk, image_url) pairs; yields per-batch counts."""
+    return process_images(image_hashes, jobs, save_image_hashes, workers, batch_size)
+
+
+class BKTree:
+    """Burkhard-Keller tree over Hamming distance for whole-catalogue scans."""
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value, item):
+        if self.root is None:
+            self.root = (value, [item], {})
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, [item], {})
+                return
+            node = child
+
+    def search(self, value, max_distance):
+        """Yield (item, distance) for every stored value within ``max_distance``."""
+        stack = [self.root] if self.root else []
+        while stack:
+            node_value, items, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= max_distance:
+                for item in items:
+                    yield item, distance
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+
+
+def duplicate_pairs(max_distance=DEFAULT_DISTANCE):
+    """Return (pk, other pk, phash distance, ahash distance) for near-duplicate images."""
+    from .models import ArtworkImageHash
+    tree = BKTree()
+    ahashes = {}
+    rows = (
+        ArtworkImageHash.objects.exclude(phash=None)
+        .order_by('artwork_id').values_list('artwork_id', 'ahash', 'phash').iterator(chunk_size=5000)
+    )
+    pairs = []
+    for pk, ahash, phash in rows:
+        ahash, phash = to_unsigned(ahash), to_unsigned(phash)
+        for other, distance in tree.search(phash, max_distance):
+            pairs.append((other, pk, distance, hamming(ahash, ahashes[other])))
+        tree.add(phash, pk)
+        ahashes[pk] = ahash
+    return sorted(pairs, key=lambda pair: (pair[2], pair[3], pair[0], pair[1]))
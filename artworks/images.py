@@ -0,0 +1,67 @@
+"""
+Shared plumbing for pipelines that derive data from artwork images.
+
+Workers run in a process pool that may not have Django configured, so
+everything they need is passed in explicitly.
+"""
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from urllib.parse import urlparse
+
+from django.conf import settings
+
+FETCH_TIMEOUT = 10
+# Larger downloads are refused rather than handed to Pillow.
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+
+
+def fetch_image_bytes(url, media_url=None, media_root=None, timeout=FETCH_TIMEOUT, max_bytes=MAX_IMAGE_BYTES):
+    """Read an image from MEDIA_URL, a file:// URL or over HTTP(S), refusing more than ``max_bytes``."""
+    media_url = media_url or settings.MEDIA_URL
+    media_root = media_root or settings.MEDIA_ROOT
+    if url.startswith(media_url):
+        return (Path(media_root) / url[len(media_url):]).read_bytes()
+    parsed = urlparse(url)
+    if parsed.scheme == 'file':
+        return Path(parsed.path).read_bytes()
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        data = response.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise ValueError(f'Image larger than {max_bytes} bytes: {url}')
+    return data
+
+
+def _run(analyse, job, media_url, media_root):
+    pk, url = job
+    try:
+        return pk, url, analyse(fetch_image_bytes(url, media_url, media_root))
+    except Exception:  # noqa: BLE001 - unreadable images are recorded as empty results
+        return pk, url, None
+
+
+def process_images(analyse, jobs, save, workers=None, batch_size=200):
+    """Run ``analyse(image_bytes)`` over (pk, url) jobs in a process pool.
+
+    Jobs are submitted a batch at a time, with the next batch queued while
+    the current one is collected, so memory stays bounded however many
+    jobs there are. Results are handed to ``save`` in batches of
+    (pk, url, result) tuples, with ``result`` None for images that could
+    not be fetched or decoded. Yields (processed, unreadable) counts after
+    each batch.
+    """
+    worker = partial(_run, analyse, media_url=settings.MEDIA_URL, media_root=str(settings.MEDIA_ROOT))
+    jobs = iter(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit():
+            return [executor.submit(worker, job) for job in islice(jobs, batch_size)]
+
+        running = submit()
+        while running:
+            queued = submit()
+            batch = [future.result() for future in running]
+            save(batch)
+            yield len(batch), sum(1 for result in batch if result[2] is None)
+            running = queued
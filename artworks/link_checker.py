@@ -0,0 +1,152 @@
+"""
+Concurrent health checks for image URLs, built on asyncio streams.
+
+Each URL gets a ``HEAD`` request, and a ``GET`` when the server rejects or
+mishandles ``HEAD``. Only the status line and headers are read before the
+connection is closed, so a check never downloads an image. Redirects are
+followed a few hops. A global semaphore bounds the number of open
+connections, a per-host one keeps a single slow or dead host from taking
+all of them, and every request is cut off after ``timeout`` seconds. Slots
+are taken per request, so each redirect hop counts against the host it
+actually goes to.
+``MEDIA_URL`` and ``file://`` images are checked on disk.
+
+``check_urls`` needs nothing from Django beyond the media settings, so it
+can be pointed at a local stub server.
+"""
+import asyncio
+import ssl
+from collections import defaultdict
+from contextlib import asynccontextmanager, nullcontext
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+from django.conf import settings
+
+CONCURRENCY = 64
+PER_HOST = 4
+TIMEOUT = 10
+MAX_REDIRECTS = 5
+REDIRECTS = {301, 302, 303, 307, 308}
+USER_AGENT = 'ArtVault-LinkChecker/1.0'
+
+
+class LinkError(Exception):
+    """A URL that could not be requested at all (bad scheme, DNS, refused, reset)."""
+
+
+class ConnectionSlots:
+    """At most ``concurrency`` open connections, and ``per_host`` to any one host."""
+
+    def __init__(self, concurrency, per_host):
+        self.total = asyncio.Semaphore(concurrency)
+        self.hosts = defaultdict(lambda: asyncio.Semaphore(per_host))
+
+    @asynccontextmanager
+    async def slot(self, url):
+        async with self.hosts[urlsplit(url).netloc], self.total:
+            yield
+
+
+def _local_path(url):
+    media_url = settings.MEDIA_URL
+    if url.startswith(media_url):
+        return Path(settings.MEDIA_ROOT) / url[len(media_url):]
+    parts = urlsplit(url)
+    if parts.scheme == 'file':
+        return Path(parts.path)
+    return None
+
+
+async def _request(method, url, timeout, ssl_context, slots=None):
+    """Send one request and return (status, headers) without reading the body."""
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise LinkError(f'Unsupported URL: {url}')
+    async with slots.slot(url) if slots else nullcontext():
+        return await _exchange(method, parts, timeout, ssl_context)
+
+
+async def _exchange(method, parts, timeout, ssl_context):
+    secure = parts.scheme == 'https'
+    port = parts.port or (443 if secure else 80)
+    target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+    host = parts.hostname if parts.port is None else f'{parts.hostname}:{parts.port}'
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parts.hostname, port, ssl=ssl_context if secure else None),
+            timeout,
+        )
+    except asyncio.TimeoutError:
+        raise
+    except (OSError, ssl.SSLError) as exc:
+        raise LinkError(str(exc) or exc.__class__.__name__) from exc
+    try:
+        writer.write(
+            f'{method} {target} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {USER_AGENT}\r\n'
+            f'Accept: image/*,*/*;q=0.5\r\nConnection: close\r\n\r\n'.encode('latin-1')
+        )
+        await writer.drain()
+        head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout)
+    except asyncio.TimeoutError:
+        raise
+    except (OSError, ssl.SSLError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as exc:
+        raise LinkError(str(exc) or exc.__class__.__name__) from exc
+    finally:
+        writer.close()
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    try:
+        status = int(status_line.split()[1])
+    except (IndexError, ValueError):
+        raise LinkError(f'Not an HTTP response: {status_line[:80]!r}') from None
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return status, headers
+
+
+async def _fetch(method, url, timeout, ssl_context, slots=None):
+    """Follow redirects; returns the final status."""
+    for _hop in range(MAX_REDIRECTS + 1):
+        status, headers = await _request(method, url, timeout, ssl_context, slots)
+        if status not in REDIRECTS or 'location' not in headers:
+            return status
+        url = urljoin(url, headers['location'])
+    raise LinkError('Too many redirects.')
+
+
+async def check_url(url, timeout=TIMEOUT, ssl_context=None, slots=None):
+    """(ok, status code or None, error message) for one URL; ``slots`` limits its connections."""
+    path = _local_path(url)
+    if path is not None:
+        return (True, None, '') if path.is_file() else (False, None, 'File not found.')
+    try:
+        status = await _fetch('HEAD', url, timeout, ssl_context, slots)
+        if not 200 <= status < 300:
+            # Plenty of image hosts answer HEAD with 403, 404 or 405 but serve GET.
+            status = await _fetch('GET', url, timeout, ssl_context, slots)
+    except asyncio.TimeoutError:
+        return False, None, f'No response within {timeout}s.'
+    except LinkError as exc:
+        return False, None, str(exc)[:200]
+    return 200 <= status < 300, status, '' if 200 <= status < 300 else f'HTTP {status}'
+
+
+async def _check_all(urls, concurrency, per_host, timeout):
+    ssl_context = ssl.create_default_context()
+    slots = ConnectionSlots(concurrency, per_host)
+
+    async def bounded(url):
+        return url, await check_url(url, timeout, ssl_context, slots)
+
+    results = {}
+    for done in asyncio.as_completed([bounded(url) for url in urls]):
+        url, result = await done
+        results[url] = result
+    return results
+
+
+def check_urls(urls, concurrency=CONCURRENCY, per_host=PER_HOST, timeout=TIMEOUT):
+    """Check ``urls`` concurrently; returns {url: (ok, status code or None, error message)}."""
+    return asyncio.run(_check_all(set(urls), concurrency, per_host, timeout))
@@ -0,0 +1,68 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from artworks.catalogue_index import SORT_KEYS, CatalogueIndex
+from artworks.models import Artwork, Category
+
+
+class Command(BaseCommand):
+    help = 'Compare artwork list filtering through the ORM and the catalogue index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--page-size', type=int, default=12)
+        parser.add_argument('--max-page', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        page_size = options['page_size']
+        categories = [None] + list(Category.objects.values_list('pk', flat=True))
+
+        started = time.perf_counter()
+        index = CatalogueIndex().load()
+        self.stdout.write(f'Loaded {len(index)} artworks in {time.perf_counter() - started:.2f}s')
+
+        workload = [
+            (
+                rng.choice(categories),
+                rng.choice((None, True, False)),
+                rng.choice(SORT_KEYS),
+                rng.randrange(options['max_page']) * page_size,
+            )
+            for _ in range(options['queries'])
+        ]
+        self.report('ORM', [self.time_orm(*query, page_size) for query in workload])
+        self.report('Index', [self.time_index(index, *query, page_size) for query in workload])
+
+    def time_orm(self, category_id, on_display, sort, offset, page_size):
+        started = time.perf_counter()
+        queryset = Artwork.objects.all()
+        if category_id is not None:
+            queryset = queryset.filter(category_id=category_id)
+        if on_display is not None:
+            queryset = queryset.filter(is_on_display=on_display)
+        queryset.count()
+        list(queryset.order_by(sort).values_list('pk', flat=True)[offset:offset + page_size])
+        return time.perf_counter() - started
+
+    def time_index(self, index, category_id, on_display, sort, offset, page_size):
+        started = time.perf_counter()
+        filters = {
+            'category_ids': None if category_id is None else [category_id],
+            'on_display': on_display,
+        }
+        index.count(**filters)
+        index.page(sort=sort, offset=offset, limit=page_size, **filters)
+        return time.perf_counter() - started
+
+    def report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) > 1 else timings[0]
+        self.stdout.write(
+            f'{label:>6}: mean {statistics.mean(timings) * 1000:.3f} ms, '
+            f'p95 {p95 * 1000:.3f} ms over {len(timings)} queries'
+        )
@@ -0,0 +1,50 @@
+from itertools import product
+
+from django.core.management.base import BaseCommand, CommandError
+
+from artworks.catalogue_index import CatalogueIndex
+from artworks.models import Artwork, Category
+
+
+class Command(BaseCommand):
+    help = 'Build the artwork catalogue index and check it against the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=12)
+
+    def handle(self, *args, **options):
+        index = CatalogueIndex().load()
+        self.stdout.write(f'Indexed {len(index)} artworks.')
+
+        mismatched = index.verify()
+        if mismatched:
+            raise CommandError(f'{len(mismatched)} rows differ from the database, e.g. {mismatched[:10]}')
+
+        page_size = options['page_size']
+        categories = [None] + list(Category.objects.values_list('pk', flat=True))
+        failures = 0
+        for category_id, on_display in product(categories, (None, True, False)):
+            queryset = Artwork.objects.all()
+            if category_id is not None:
+                queryset = queryset.filter(category_id=category_id)
+            if on_display is not None:
+                queryset = queryset.filter(is_on_display=on_display)
+            category_ids = None if category_id is None else [category_id]
+            expected_count = queryset.count()
+            expected_page = list(
+                queryset.order_by('-year_created', '-pk').values_list('pk', flat=True)[:page_size]
+            )
+            count = index.count(category_ids=category_ids, on_display=on_display)
+            page = index.page(
+                sort='-year_created', limit=page_size,
+                category_ids=category_ids, on_display=on_display,
+            )
+            if count != expected_count or page != expected_page:
+                failures += 1
+                self.stderr.write(
+                    f'category={category_id} on_display={on_display}: '
+                    f'count {count} != {expected_count} or first page differs'
+                )
+        if failures:
+            raise CommandError(f'{failures} filter combinations disagree with the ORM.')
+        self.stdout.write(self.style.SUCCESS('Catalogue index matches the database.'))
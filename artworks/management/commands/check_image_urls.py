@@ -0,0 +1,107 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from artists.models import Artist
+from artworks.link_checker import CONCURRENCY, PER_HOST, TIMEOUT, check_urls
+from artworks.models import Artwork, ImageLinkCheck
+from changefeed.feed import record_many
+from changefeed.models import Change
+from exhibitions.models import ArchivedExhibition, Exhibition
+
+# (model, URL field, field holding the URL while it is broken)
+IMAGE_FIELDS = [
+    (Artist, 'profile_image_url', 'broken_profile_image_url'),
+    (Artwork, 'image_url', 'broken_image_url'),
+    (Exhibition, 'cover_image_url', 'broken_cover_image_url'),
+    (ArchivedExhibition, 'cover_image_url', 'broken_cover_image_url'),
+]
+FEED_MODELS = {Artist, Artwork, Exhibition}
+CHUNK_SIZE = 1000
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    items = sorted(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class Command(BaseCommand):
+    help = 'Check every artist, artwork and exhibition image URL and flag the broken ones so pages skip them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age', type=float, default=24 * 7,
+                            help='Reuse results younger than this many hours (default a week; 0 rechecks all).')
+        parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help='Open connections in total.')
+        parser.add_argument('--per-host', type=int, default=PER_HOST, help='Open connections per host.')
+        parser.add_argument('--timeout', type=float, default=TIMEOUT, help='Seconds to wait for each response.')
+        parser.add_argument('--batch-size', type=int, default=2000, help='URLs checked and saved at a time.')
+        parser.add_argument('--url', action='append', dest='urls',
+                            help='Only check this URL and print the result (repeatable); nothing is saved.')
+
+    def handle(self, *args, **options):
+        check = {key: options[key] for key in ('concurrency', 'per_host', 'timeout')}
+        if options['urls']:
+            for url, (ok, status, error) in sorted(check_urls(options['urls'], **check).items()):
+                self.stdout.write(f'{"ok  " if ok else "DEAD"} {status or "-":>4} {url} {error}')
+            return
+
+        started = time.perf_counter()
+        urls = set()
+        for model, field, _broken in IMAGE_FIELDS:
+            urls.update(model.objects.exclude(**{field: ''}).order_by().values_list(field, flat=True).distinct())
+        fresh = set(
+            ImageLinkCheck.objects.filter(checked_at__gte=timezone.now() - timedelta(hours=options['max_age']))
+            .values_list('url', flat=True)
+        )
+        pending = sorted(urls - fresh)
+        self.stdout.write(f'{len(urls)} image URLs, {len(pending)} to check.')
+        for done, batch in enumerate(_chunks(pending, options['batch_size']), 1):
+            self.save_results(check_urls(batch, **check))
+            self.stdout.write(f'{min(done * options["batch_size"], len(pending))} checked…')
+
+        dead = set()
+        for chunk in _chunks(urls):
+            dead.update(ImageLinkCheck.objects.filter(url__in=chunk, ok=False).values_list('url', flat=True))
+        flagged, cleared = self.apply_flags(dead, urls - dead)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(dead)} broken of {len(urls)} URLs; {flagged} rows flagged, {cleared} cleared '
+            f'in {time.perf_counter() - started:.1f}s'
+        ))
+
+    def save_results(self, results):
+        now = timezone.now()
+        ImageLinkCheck.objects.bulk_create(
+            [
+                ImageLinkCheck(url=url, ok=ok, status_code=status, error=error, checked_at=now)
+                for url, (ok, status, error) in results.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['url'],
+            update_fields=['ok', 'status_code', 'error', 'checked_at'],
+        )
+
+    def apply_flags(self, dead, alive):
+        """Point each row's broken-URL field at its image if dead, clear it if alive again."""
+        flagged = cleared = 0
+        for model, field, broken in IMAGE_FIELDS:
+            changed = set()
+            with transaction.atomic():
+                for chunk in _chunks(dead):
+                    rows = model.objects.filter(**{f'{field}__in': chunk}).exclude(**{broken: F(field)})
+                    pks = list(rows.values_list('pk', flat=True))
+                    flagged += model.objects.filter(pk__in=pks).update(**{broken: F(field)})
+                    changed.update(pks)
+                for chunk in _chunks(alive):
+                    rows = model.objects.filter(**{f'{field}__in': chunk}).exclude(**{broken: ''})
+                    pks = list(rows.values_list('pk', flat=True))
+                    cleared += model.objects.filter(pk__in=pks).update(**{broken: ''})
+                    changed.update(pks)
+                # A bulk UPDATE sends no signals.
+                if model in FEED_MODELS:
+                    record_many(model, changed, Change.Action.UPDATED)
+        return flagged, cleared
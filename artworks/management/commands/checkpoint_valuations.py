@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from artworks.valuations import create_checkpoint
+
+
+class Command(BaseCommand):
+    help = 'Total the valuation ledger per artist and category, so value-as-of queries only sum newer entries.'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        checkpoint = create_checkpoint()
+        self.stdout.write(self.style.SUCCESS(
+            f'Checkpointed {checkpoint.totals.count()} artist and category totals as of '
+            f'{checkpoint.as_of:%Y-%m-%d %H:%M} in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from artworks.models import ArtworkPalette
+from artworks.palettes import extract_palettes, pending_artworks
+
+
+class Command(BaseCommand):
+    help = 'Extract dominant colours for artwork images whose palette is missing or stale.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Defaults to the CPU count.')
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--force', action='store_true', help='Re-process every artwork image.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        removed, _ = ArtworkPalette.objects.filter(artwork__image_url='').delete()
+        if removed:
+            self.stdout.write(f'Removed {removed} palettes for artworks without an image.')
+        jobs = pending_artworks(force=options['force']).iterator(chunk_size=2000)
+        processed = failed = 0
+        for done, unreadable in extract_palettes(jobs, options['workers'], options['batch_size']):
+            processed += done
+            failed += unreadable
+            self.stdout.write(f'{processed} images processed…')
+        self.stdout.write(self.style.SUCCESS(
+            f'Extracted {processed - failed} palettes ({failed} unreadable) '
+            f'in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from artworks.image_hashes import DEFAULT_DISTANCE, compute_image_hashes, duplicate_pairs, pending_artworks
+from artworks.models import Artwork
+
+
+class Command(BaseCommand):
+    help = 'Hash artwork images and report likely duplicate artworks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-distance', type=int, default=DEFAULT_DISTANCE,
+                            help='Largest pHash Hamming distance treated as a duplicate.')
+        parser.add_argument('--workers', type=int, default=None)
+        parser.add_argument('--skip-hashing', action='store_true',
+                            help='Report on stored hashes without hashing new or changed images.')
+        parser.add_argument('--force', action='store_true', help='Re-hash every artwork image.')
+
+    def handle(self, *args, **options):
+        if not 0 <= options['max_distance'] <= 64:
+            raise CommandError('--max-distance must be between 0 and 64.')
+        if not options['skip_hashing']:
+            jobs = pending_artworks(force=options['force']).iterator(chunk_size=2000)
+            hashed = 0
+            for done, _unreadable in compute_image_hashes(jobs, options['workers']):
+                hashed += done
+            self.stdout.write(f'Hashed {hashed} new or changed images.')
+
+        pairs = duplicate_pairs(options['max_distance'])
+        pks = {pk for pair in pairs for pk in pair[:2]}
+        artworks = Artwork.objects.select_related('artist').in_bulk(pks)
+        for pk, other, distance, ahash_distance in pairs:
+            first, second = artworks[pk], artworks[other]
+            self.stdout.write(
+                f'[pHash {distance:>2} / aHash {ahash_distance:>2}] '
+                f'#{pk} "{first.title}" ({first.artist}) ~ #{other} "{second.title}" ({second.artist})'
+            )
+        self.stdout.write(self.style.SUCCESS(f'{len(pairs)} possible duplicate pairs.'))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from artworks.models import Artwork
+from artworks.valuations import BATCH_SIZE, record_valuations
+
+
+class Command(BaseCommand):
+    help = 'Book artwork values missing from the valuation ledger, e.g. after bulk imports.'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = Artwork.objects.order_by('pk').values_list(
+            'pk', 'estimated_value', 'artist_id', 'category_id',
+        ).iterator(chunk_size=BATCH_SIZE)
+        checked = written = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == BATCH_SIZE:
+                written += record_valuations(batch)
+                checked += len(batch)
+                batch = []
+                self.stdout.write(f'{checked} artworks checked…')
+        written += record_valuations(batch)
+        checked += len(batch)
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} artworks and booked {written} ledger entries '
+            f'in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from artworks.tagging import recount_tags
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-tag artwork counts, e.g. after rows were changed outside the app.'
+
+    def handle(self, *args, **options):
+        corrected = recount_tags()
+        self.stdout.write(self.style.SUCCESS(f'Corrected {corrected} tag count{"s" if corrected != 1 else ""}'))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artworks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtworkPalette',
+            fields=[
+                ('artwork', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='palette', serialize=False, to='artworks.artwork')),
+                ('source_url', models.URLField(help_text='The image URL this palette was extracted from.')),
+                ('hex_colours', models.CharField(blank=True, help_text='Comma-separated colours, most dominant first. Empty if the image could not be read.', max_length=40)),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Artwork Palette',
+                'verbose_name_plural': 'Artwork Palettes',
+            },
+        ),
+        migrations.CreateModel(
+            name='PaletteColour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('l', models.SmallIntegerField()),
+                ('a', models.SmallIntegerField()),
+                ('b', models.SmallIntegerField()),
+                ('share', models.PositiveSmallIntegerField(help_text='Share of the image, in thousandths.')),
+                ('palette', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='colours', to='artworks.artworkpalette')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['l', 'a', 'b'], name='palette_colour_lab_idx')],
+            },
+        ),
+    ]
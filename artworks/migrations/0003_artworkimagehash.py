@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artworks', '0002_artworkpalette_palettecolour'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtworkImageHash',
+            fields=[
+                ('artwork', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='image_hash', serialize=False, to='artworks.artwork')),
+                ('source_url', models.URLField(help_text='The image URL these hashes were computed from.')),
+                ('ahash', models.BigIntegerField(blank=True, help_text='64-bit average hash.', null=True)),
+                ('phash', models.BigIntegerField(blank=True, help_text='64-bit DCT perceptual hash.', null=True)),
+                ('band0', models.PositiveIntegerField(blank=True, db_index=True, null=True)),
+                ('band1', models.PositiveIntegerField(blank=True, db_index=True, null=True)),
+                ('band2', models.PositiveIntegerField(blank=True, db_index=True, null=True)),
+                ('band3', models.PositiveIntegerField(blank=True, db_index=True, null=True)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Artwork Image Hash',
+                'verbose_name_plural': 'Artwork Image Hashes',
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0002_artist_match_key'),
+        ('artworks', '0003_artworkimagehash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ValuationRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.DecimalField(blank=True, decimal_places=2, help_text='Estimated value after this entry; empty when unappraised or deleted.', max_digits=12, null=True)),
+                ('change', models.DecimalField(decimal_places=2, help_text='Signed change in value.', max_digits=14)),
+                ('recorded_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('artist', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='artists.artist')),
+                ('artwork', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='valuations', to='artworks.artwork')),
+                ('category', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='artworks.category')),
+            ],
+            options={
+                'verbose_name': 'Valuation Record',
+                'verbose_name_plural': 'Valuation Records',
+                'ordering': ['recorded_at', 'id'],
+                'indexes': [models.Index(fields=['artwork', 'recorded_at'], name='valuation_artwork_time'), models.Index(fields=['artist', 'recorded_at'], name='valuation_artist_time'), models.Index(fields=['category', 'recorded_at'], name='valuation_category_time'), models.Index(fields=['recorded_at'], name='valuation_time')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:40
+
+import django.db.models.functions.text
+import django.db.models.lookups
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0003_artist_constraints'),
+        ('artworks', '0004_valuationrecord'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='artwork',
+            constraint=models.CheckConstraint(condition=django.db.models.lookups.GreaterThanOrEqual(django.db.models.functions.text.Length('title'), 2), name='artwork_title_min_length', violation_error_message='The title must be at least 2 characters long.'),
+        ),
+        migrations.AddConstraint(
+            model_name='artwork',
+            constraint=models.CheckConstraint(condition=django.db.models.lookups.GreaterThanOrEqual(django.db.models.functions.text.Length('description'), 10), name='artwork_description_min_length', violation_error_message='The description must be at least 10 characters long.'),
+        ),
+        migrations.AddConstraint(
+            model_name='artwork',
+            constraint=models.CheckConstraint(condition=models.Q(('year_created__gte', 1000)), name='artwork_year_created_min', violation_error_message='Year created must be 1000 or later.'),
+        ),
+        migrations.AddConstraint(
+            model_name='artwork',
+            constraint=models.CheckConstraint(condition=models.Q(('estimated_value__isnull', True), ('estimated_value__gte', 0), _connector='OR'), name='artwork_estimated_value_non_negative', violation_error_message='Estimated value cannot be negative.'),
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='category_name_ci_unique', violation_error_message='A category with this name already exists.'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Concat
+
+
+def fill_root_paths(apps, schema_editor):
+    # Every existing category becomes a top-level one.
+    Category = apps.get_model('artworks', 'Category')
+    Category.objects.update(path=Concat(Value('/'), Cast('id', CharField()), Value('/')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artworks', '0005_artwork_category_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='parent',
+            field=models.ForeignKey(blank=True, help_text='Leave blank for a top-level category.', null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='children', to='artworks.category'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, help_text='Ids from the root down to this category, e.g. /3/17/42/. Maintained by save().', max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_root_paths, migrations.RunPython.noop),
+    ]
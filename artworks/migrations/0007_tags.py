@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artworks', '0006_category_tree'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Lower case with single spaces, e.g. "abstract expressionism".', max_length=50, unique=True)),
+                ('artwork_count', models.PositiveIntegerField(default=0, editable=False, help_text='Number of artworks carrying this tag, kept in step by artworks.tagging.')),
+            ],
+            options={
+                'verbose_name': 'Tag',
+                'verbose_name_plural': 'Tags',
+                'ordering': ['name'],
+                'indexes': [models.Index(fields=['-artwork_count', 'name'], name='tag_popularity')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArtworkTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('artwork', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='artwork_tags', to='artworks.artwork')),
+                ('tag', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='artwork_tags', to='artworks.tag')),
+            ],
+            options={
+                'verbose_name': 'Artwork Tag',
+                'verbose_name_plural': 'Artwork Tags',
+            },
+        ),
+        migrations.AddField(
+            model_name='artwork',
+            name='tags',
+            field=models.ManyToManyField(blank=True, help_text='Curator tags (movement, subject, technique...). Set through artworks.tagging.', related_name='artworks', through='artworks.ArtworkTag', to='artworks.tag'),
+        ),
+        migrations.AddIndex(
+            model_name='artworktag',
+            index=models.Index(fields=['tag', 'artwork'], name='tag_artwork_lookup'),
+        ),
+        migrations.AddConstraint(
+            model_name='artworktag',
+            constraint=models.UniqueConstraint(fields=('artwork', 'tag'), name='artwork_tag_unique'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artworks', '0007_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageLinkCheck',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(unique=True)),
+                ('ok', models.BooleanField()),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('error', models.CharField(blank=True, max_length=200)),
+                ('checked_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Image Link Check',
+                'verbose_name_plural': 'Image Link Checks',
+                'ordering': ['url'],
+            },
+        ),
+        migrations.AddField(
+            model_name='artwork',
+            name='broken_image_url',
+            field=models.URLField(blank=True, editable=False, help_text='Set by check_image_urls to the image URL when it stopped loading.'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0005_artist_decades'),
+        ('artworks', '0008_image_link_checks'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='artwork',
+            index=models.Index(fields=['year_created'], name='artwork_year'),
+        ),
+        migrations.AddIndex(
+            model_name='artwork',
+            index=models.Index(fields=['artist', 'year_created'], name='artwork_artist_year'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artworks', '0009_artwork_year_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='artworkpalette',
+            name='source_url',
+            field=models.URLField(blank=True, help_text='The image URL this palette was extracted from. Empty if it could not be read, so it is retried.'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artworks', '0010_palette_source_url_blank'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='artworkimagehash',
+            name='source_url',
+            field=models.URLField(blank=True, help_text='The image URL these hashes were computed from. Empty if it could not be read, so it is retried.'),
+        ),
+    ]
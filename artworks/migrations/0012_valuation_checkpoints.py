@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0005_artist_decades'),
+        ('artworks', '0011_image_hash_source_url_blank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ValuationCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateTimeField(unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Valuation Checkpoint',
+                'verbose_name_plural': 'Valuation Checkpoints',
+                'ordering': ['as_of'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ValuationCheckpointTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.DecimalField(decimal_places=2, max_digits=16)),
+                ('artist', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='artists.artist')),
+                ('category', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='artworks.category')),
+                ('checkpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='totals', to='artworks.valuationcheckpoint')),
+            ],
+            options={
+                'verbose_name': 'Valuation Checkpoint Total',
+                'verbose_name_plural': 'Valuation Checkpoint Totals',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0005_artist_decades'),
+        ('artworks', '0012_valuation_checkpoints'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='artwork',
+            index=models.Index(condition=models.Q(('is_on_display', True)), fields=['-year_created', 'title'], name='artwork_on_display'),
+        ),
+    ]
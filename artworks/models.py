@@ -1,13 +1,33 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Concat, Length, Lower, Substr
+from django.db.models.lookups import GreaterThanOrEqual
 from django.core.validators import MinLengthValidator, MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from artists.models import Artist
+from artvault.concurrency import OptimisticLockMixin
 
 
 class Category(models.Model):
-    """Artistic medium/style category (e.g. Oil Painting, Sculpture)."""
+    """Artistic medium/style category (e.g. Painting → Oil Painting → Impasto)."""
 
     name = models.CharField(max_length=100, unique=True)
+    # Deleting a category moves its subcategories up a level (see signals),
+    # so the database is never asked to cascade.
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        related_name='children',
+        help_text='Leave blank for a top-level category.',
+    )
+    path = models.CharField(
+        max_length=255,
+        db_index=True,
+        editable=False,
+        help_text='Ids from the root down to this category, e.g. /3/17/42/. Maintained by save().',
+    )
     description = models.TextField(blank=True)
     colour_hex = models.CharField(
         max_length=7,
@@ -19,12 +39,62 @@ class Category(models.Model):
         ordering = ['name']
         verbose_name = 'Category'
         verbose_name_plural = 'Categories'
+        constraints = [
+            models.UniqueConstraint(
+                Lower('name'),
+                name='category_name_ci_unique',
+                violation_error_message='A category with this name already exists.',
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            if self.pk is None:
+                # The path ends in the row's own id, so it is filled in once the row exists.
+                super().save(*args, **kwargs)
+                args, kwargs = (), {'update_fields': ['path']}
+            previous, self.path = self.path, self.build_path()
+            if previous and previous != self.path:
+                if self.path.startswith(previous):
+                    raise ValueError('A category cannot be moved into its own subtree.')
+                # One UPDATE rewrites the path prefix of every descendant.
+                Category.objects.filter(path__startswith=previous).exclude(pk=self.pk).update(
+                    path=Concat(Value(self.path), Substr('path', len(previous) + 1)),
+                )
+                self._moved_from = previous
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'path'}
+            try:
+                super().save(*args, **kwargs)
+            finally:
+                self._moved_from = None
+
+    def build_path(self):
+        return f'{self.parent.path if self.parent_id else "/"}{self.pk}/'
+
+    def path_ids(self):
+        """Ids from the root category down to this one."""
+        return [int(pk) for pk in self.path.strip('/').split('/') if pk]
+
+    @property
+    def depth(self):
+        return max(self.path.count('/') - 2, 0)
 
-class Artwork(models.Model):
+    def subtree(self):
+        """This category and all its descendants, as one indexed prefix query."""
+        return Category.objects.filter(path__startswith=self.path)
+
+    def clean(self):
+        from django.core.exceptions import ValidationError
+        if self.pk and self.parent_id and self.parent.path.startswith(self.path):
+            raise ValidationError({'parent': 'A category cannot be placed inside itself or one of its subcategories.'})
+
+
+class Artwork(OptimisticLockMixin, models.Model):
     """A single artwork belonging to one artist and one category."""
 
     title = models.CharField(
@@ -74,7 +144,19 @@ class Artwork(models.Model):
         blank=True,
         help_text='Optional URL to an image of the artwork.',
     )
+    broken_image_url = models.URLField(
+        blank=True,
+        editable=False,
+        help_text='Set by check_image_urls to the image URL when it stopped loading.',
+    )
     is_on_display = models.BooleanField(default=True)
+    tags = models.ManyToManyField(
+        'Tag',
+        through='ArtworkTag',
+        related_name='artworks',
+        blank=True,
+        help_text='Curator tags (movement, subject, technique...). Set through artworks.tagging.',
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -82,10 +164,52 @@ class Artwork(models.Model):
         ordering = ['-year_created', 'title']
         verbose_name = 'Artwork'
         verbose_name_plural = 'Artworks'
+        # The field validators, enforced by the database too so that bulk
+        # writes can skip full_clean(). "Not in the future" depends on the
+        # date, so it stays in clean() only.
+        constraints = [
+            models.CheckConstraint(
+                condition=GreaterThanOrEqual(Length('title'), 2),
+                name='artwork_title_min_length',
+                violation_error_message='The title must be at least 2 characters long.',
+            ),
+            models.CheckConstraint(
+                condition=GreaterThanOrEqual(Length('description'), 10),
+                name='artwork_description_min_length',
+                violation_error_message='The description must be at least 10 characters long.',
+            ),
+            models.CheckConstraint(
+                condition=Q(year_created__gte=1000),
+                name='artwork_year_created_min',
+                violation_error_message='Year created must be 1000 or later.',
+            ),
+            models.CheckConstraint(
+                condition=Q(estimated_value__isnull=True) | Q(estimated_value__gte=0),
+                name='artwork_estimated_value_non_negative',
+                violation_error_message='Estimated value cannot be negative.',
+            ),
+        ]
+        indexes = [
+            # Era browsing: a decade or century is a year_created range.
+            models.Index(fields=['year_created'], name='artwork_year'),
+            models.Index(fields=['artist', 'year_created'], name='artwork_artist_year'),
+            # "On display" lists in their default order, without the
+            # off-display pieces that make up most of the table.
+            models.Index(
+                fields=['-year_created', 'title'],
+                condition=Q(is_on_display=True),
+                name='artwork_on_display',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.title} ({self.year_created})'
 
+    @property
+    def display_image_url(self):
+        """The image to show: empty if check_image_urls found it broken."""
+        return '' if self.image_url == self.broken_image_url else self.image_url
+
     def get_value_display(self):
         if self.estimated_value is None:
             return 'Not appraised'
@@ -95,3 +219,254 @@ class Artwork(models.Model):
         from django.core.exceptions import ValidationError
         if self.year_created and self.year_created > timezone.now().year:
             raise ValidationError({'year_created': 'Year created cannot be in the future.'})
+
+
+
+class Tag(models.Model):
+    """A normalised curator tag, with a maintained count for the tag cloud."""
+
+    name = models.CharField(
+        max_length=50,
+        unique=True,
+        help_text='Lower case with single spaces, e.g. "abstract expressionism".',
+    )
+    artwork_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Number of artworks carrying this tag, kept in step by artworks.tagging.',
+    )
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Tag'
+        verbose_name_plural = 'Tags'
+        indexes = [models.Index(fields=['-artwork_count', 'name'], name='tag_popularity')]
+
+    def __str__(self):
+        return self.name
+
+
+class ArtworkTag(models.Model):
+    """One artwork carrying one tag; (tag, artwork) is the tag's posting list."""
+
+    artwork = models.ForeignKey(Artwork, on_delete=models.CASCADE, related_name='artwork_tags', db_index=False)
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='artwork_tags', db_index=False)
+
+    class Meta:
+        verbose_name = 'Artwork Tag'
+        verbose_name_plural = 'Artwork Tags'
+        constraints = [
+            # Also serves artwork -> tags lookups.
+            models.UniqueConstraint(fields=['artwork', 'tag'], name='artwork_tag_unique'),
+        ]
+        indexes = [
+            # Tag -> artworks lookups read the posting list from the index alone.
+            models.Index(fields=['tag', 'artwork'], name='tag_artwork_lookup'),
+        ]
+
+    def __str__(self):
+        return f'{self.tag_id} on {self.artwork_id}'
+
+
+class ArtworkPalette(models.Model):
+    """Dominant colours extracted from an artwork's image."""
+
+    artwork = models.OneToOneField(
+        Artwork,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='palette',
+    )
+    source_url = models.URLField(
+        blank=True,
+        help_text='The image URL this palette was extracted from. Empty if it could not be read, so it is retried.',
+    )
+    hex_colours = models.CharField(
+        max_length=40,
+        blank=True,
+        help_text='Comma-separated colours, most dominant first. Empty if the image could not be read.',
+    )
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Artwork Palette'
+        verbose_name_plural = 'Artwork Palettes'
+
+    def __str__(self):
+        return f'Palette for {self.artwork_id}'
+
+    def get_colours(self):
+        return self.hex_colours.split(',') if self.hex_colours else []
+
+
+class PaletteColour(models.Model):
+    """One palette entry in CIELAB space, indexed for nearest-colour lookups."""
+
+    palette = models.ForeignKey(ArtworkPalette, on_delete=models.CASCADE, related_name='colours')
+    l = models.SmallIntegerField()  # noqa: E741
+    a = models.SmallIntegerField()
+    b = models.SmallIntegerField()
+    share = models.PositiveSmallIntegerField(help_text='Share of the image, in thousandths.')
+
+    class Meta:
+        indexes = [models.Index(fields=['l', 'a', 'b'], name='palette_colour_lab_idx')]
+
+    def __str__(self):
+        return f'L{self.l} a{self.a} b{self.b}'
+
+
+class ArtworkImageHash(models.Model):
+    """Perceptual hashes of an artwork's image, used to spot duplicate entries."""
+
+    artwork = models.OneToOneField(
+        Artwork,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='image_hash',
+    )
+    source_url = models.URLField(
+        blank=True,
+        help_text='The image URL these hashes were computed from. Empty if it could not be read, so it is retried.',
+    )
+    ahash = models.BigIntegerField(null=True, blank=True, help_text='64-bit average hash.')
+    phash = models.BigIntegerField(null=True, blank=True, help_text='64-bit DCT perceptual hash.')
+    # 16-bit slices of phash for multi-index near-duplicate lookups.
+    band0 = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    band1 = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    band2 = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    band3 = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Artwork Image Hash'
+        verbose_name_plural = 'Artwork Image Hashes'
+
+    def __str__(self):
+        return f'Image hash for {self.artwork_id}'
+
+
+class ImageLinkCheck(models.Model):
+    """The last health check of an image URL, shared by every row that uses it."""
+
+    url = models.URLField(unique=True)
+    ok = models.BooleanField()
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    error = models.CharField(max_length=200, blank=True)
+    checked_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ['url']
+        verbose_name = 'Image Link Check'
+        verbose_name_plural = 'Image Link Checks'
+
+    def __str__(self):
+        return f'{self.url} ({"ok" if self.ok else self.error or "broken"})'
+
+
+class ValuationRecord(models.Model):
+    """One entry in the append-only ledger of artwork valuations.
+
+    ``value`` is the artwork's estimated value after the entry and ``change``
+    the signed difference it made, so the portfolio value at any moment is
+    the sum of ``change`` up to it. Artist and category are copied from the
+    artwork at the time; a reattribution is booked as a transfer out of the
+    old pair and into the new one. References are kept without database
+    constraints so history survives deletes and artist merges.
+    """
+
+    # Indexed through the composite (reference, recorded_at) indexes below.
+    artwork = models.ForeignKey(
+        Artwork,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='valuations',
+    )
+    artist = models.ForeignKey(
+        Artist,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='+',
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    value = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text='Estimated value after this entry; empty when unappraised or deleted.',
+    )
+    change = models.DecimalField(max_digits=14, decimal_places=2, help_text='Signed change in value.')
+    recorded_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['recorded_at', 'id']
+        verbose_name = 'Valuation Record'
+        verbose_name_plural = 'Valuation Records'
+        indexes = [
+            models.Index(fields=['artwork', 'recorded_at'], name='valuation_artwork_time'),
+            models.Index(fields=['artist', 'recorded_at'], name='valuation_artist_time'),
+            models.Index(fields=['category', 'recorded_at'], name='valuation_category_time'),
+            models.Index(fields=['recorded_at'], name='valuation_time'),
+        ]
+
+    def __str__(self):
+        return f'{self.artwork_id}: {self.value} at {self.recorded_at:%Y-%m-%d}'
+
+
+class ValuationCheckpoint(models.Model):
+    """The valuation ledger totalled per artist and category up to ``as_of``.
+
+    "Value as of" queries start from the latest checkpoint at or before the
+    moment asked for and only sum the ledger entries booked after it.
+    """
+
+    as_of = models.DateTimeField(unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['as_of']
+        verbose_name = 'Valuation Checkpoint'
+        verbose_name_plural = 'Valuation Checkpoints'
+
+    def __str__(self):
+        return f'Valuations as of {self.as_of:%Y-%m-%d %H:%M}'
+
+
+class ValuationCheckpointTotal(models.Model):
+    """One artist and category's summed ``change`` at a checkpoint."""
+
+    checkpoint = models.ForeignKey(ValuationCheckpoint, on_delete=models.CASCADE, related_name='totals')
+    artist = models.ForeignKey(
+        Artist,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='+',
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    total = models.DecimalField(max_digits=16, decimal_places=2)
+
+    class Meta:
+        verbose_name = 'Valuation Checkpoint Total'
+        verbose_name_plural = 'Valuation Checkpoint Totals'
+
+    def __str__(self):
+        return f'{self.artist_id}/{self.category_id}: {self.total}'
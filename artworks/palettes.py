@@ -0,0 +1,135 @@
+"""
+Dominant-colour extraction and nearest-colour lookup for artwork images.
+
+Palettes are extracted with Pillow's median-cut quantizer in a process pool
+and stored as CIELAB rows, so "artworks close to #1a3c8f" is an indexed box
+query around the target colour followed by an exact distance ranking.
+"""
+import math
+from io import BytesIO
+
+from django.db import transaction
+from django.db.models import F
+
+from .images import process_images
+
+PALETTE_SIZE = 5
+THUMBNAIL_SIZE = (128, 128)
+
+
+def hex_to_rgb(value):
+    value = value.lstrip('#')
+    if len(value) != 6:
+        raise ValueError(f'Not a six-digit hex colour: {value!r}')
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def rgb_to_hex(rgb):
+    return '#{:02x}{:02x}{:02x}'.format(*rgb)
+
+
+def rgb_to_lab(rgb):
+    """Convert an sRGB triple to CIELAB (D65)."""
+    def linear(channel):
+        channel /= 255
+        return channel / 12.92 if channel <= 0.04045 else ((channel + 0.055) / 1.055) ** 2.4
+
+    r, g, b = (linear(c) for c in rgb)
+    x = (0.4124 * r + 0.3576 * g + 0.1805 * b) / 0.95047
+    y = 0.2126 * r + 0.7152 * g + 0.0722 * b
+    z = (0.0193 * r + 0.1192 * g + 0.9505 * b) / 1.08883
+
+    def f(t):
+        return t ** (1 / 3) if t > 0.008856 else 7.787 * t + 16 / 116
+
+    fx, fy, fz = f(x), f(y), f(z)
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def extract_palette(data, size=PALETTE_SIZE):
+    """Return [(rgb, share), ...] for the dominant colours of an encoded image."""
+    from PIL import Image
+    with Image.open(BytesIO(data)) as image:
+        image = image.convert('RGB')
+        image.thumbnail(THUMBNAIL_SIZE)
+        quantized = image.quantize(colors=size, method=Image.Quantize.MEDIANCUT)
+    palette = quantized.getpalette()
+    colours = sorted(quantized.getcolors(), reverse=True)
+    total = sum(count for count, _index in colours)
+    return [
+        (tuple(palette[index * 3:index * 3 + 3]), count / total)
+        for count, index in colours
+    ]
+
+
+def pending_artworks(force=False):
+    """Artworks with an image whose palette is missing or was taken from another URL."""
+    from .models import Artwork
+    queryset = Artwork.objects.exclude(image_url='')
+    if not force:
+        queryset = queryset.exclude(palette__source_url=F('image_url'))
+    return queryset.order_by('pk').values_list('pk', 'image_url')
+
+
+def save_palettes(results):
+    """Store (pk, url, colours) results; unreadable images keep no source URL, so later runs retry them."""
+    from .models import ArtworkPalette, PaletteColour
+    palettes = [
+        ArtworkPalette(
+            artwork_id=pk,
+            source_url=url if colours is not None else '',
+            hex_colours=','.join(rgb_to_hex(rgb) for rgb, _share in colours or ()),
+        )
+        for pk, url, colours in results
+    ]
+    entries = [
+        PaletteColour(
+            palette_id=pk,
+            l=round(l), a=round(a), b=round(b),
+            share=round(share * 1000),
+        )
+        for pk, _url, colours in results
+        for (l, a, b), share in ((rgb_to_lab(rgb), share) for rgb, share in colours or ())
+    ]
+    with transaction.atomic():
+        ArtworkPalette.objects.bulk_create(
+            palettes,
+            update_conflicts=True,
+            unique_fields=['artwork'],
+            update_fields=['source_url', 'hex_colours', 'extracted_at'],
+        )
+        PaletteColour.objects.filter(palette_id__in=[pk for pk, _url, _colours in results]).delete()
+        PaletteColour.objects.bulk_create(entries)
+
+
+def extract_palettes(jobs, workers=None, batch_size=200):
+    """Extract and store palettes for (pk, image_url) pairs; yields per-batch counts."""
+    return process_images(extract_palette, jobs, save_palettes, workers, batch_size)
+
+
+def artworks_near_colour(hex_colour, limit=24, radius=8, max_radius=64):
+    """Return (artwork pk, distance) pairs ranked by CIELAB distance to ``hex_colour``.
+
+    The search box starts small and doubles until it holds enough artworks,
+    so the common case touches only a thin slice of the colour index.
+    """
+    from .models import PaletteColour
+    l, a, b = rgb_to_lab(hex_to_rgb(hex_colour))
+    while True:
+        rows = PaletteColour.objects.filter(
+            l__range=(l - radius, l + radius),
+            a__range=(a - radius, a + radius),
+            b__range=(b - radius, b + radius),
+        ).values_list('palette_id', 'l', 'a', 'b', 'share')
+        best = {}
+        for pk, cl, ca, cb, share in rows:
+            distance = math.dist((l, a, b), (cl, ca, cb))
+            if distance <= radius:
+                key = (distance, -share)
+                if pk not in best or key < best[pk]:
+                    best[pk] = key
+        if len(best) >= limit or radius >= max_radius:
+            break
+        radius *= 2
+    ranked = sorted(best.items(), key=lambda item: (item[1], item[0]))[:limit]
+    return [(pk, distance) for pk, (distance, _share) in ranked]
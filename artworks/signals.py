@@ -0,0 +1,71 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from jobs.queue import enqueue
+
+from .models import Artwork, ArtworkImageHash, ArtworkPalette, Category, Tag
+from .tasks import extract_artwork_palette, hash_artwork_image
+from .valuations import LEDGER_FIELDS, record_artwork_valuations, record_valuations
+
+
+@receiver(pre_delete, sender=Category)
+def lift_subcategories(sender, instance, **kwargs):
+    # Subcategories move up to the deleted category's parent, taking their
+    # own subtrees with them.
+    for child in instance.children.all():
+        child.parent = instance.parent
+        child.save(update_fields=['parent'])
+
+
+# ─── Valuation history ───────────────────────────────────────────────────────
+
+@receiver(post_save, sender=Artwork)
+def record_valuation_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not LEDGER_FIELDS.intersection(update_fields)):
+        return
+    record_valuations([(instance.pk, instance.estimated_value, instance.artist_id, instance.category_id)])
+
+
+@receiver(post_delete, sender=Artwork)
+def record_valuation_on_delete(sender, instance, **kwargs):
+    record_valuations([(instance.pk, None, instance.artist_id, instance.category_id)])
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_artworks(sender, instance, **kwargs):
+    instance._valued_artwork_pks = list(
+        instance.artworks.filter(estimated_value__isnull=False).values_list('pk', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Category)
+def record_valuations_on_category_delete(sender, instance, **kwargs):
+    # The artworks were moved to "no category" by a bulk UPDATE.
+    record_artwork_valuations(getattr(instance, '_valued_artwork_pks', []))
+
+
+# ─── Tags ────────────────────────────────────────────────────────────────────
+
+@receiver(pre_delete, sender=Artwork)
+def release_artwork_tags(sender, instance, **kwargs):
+    # The ArtworkTag rows go with the artwork in a cascade that skips signals.
+    Tag.objects.filter(artwork_tags__artwork=instance).update(artwork_count=F('artwork_count') - 1)
+
+
+# ─── Palettes and image hashes ───────────────────────────────────────────────
+
+@receiver(post_save, sender=Artwork)
+def queue_image_analysis(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Fetching and decoding the image would hold up the curator's POST, and
+    # would let a form make the web server fetch any URL, so a worker does
+    # it; repeated saves share one queued job per pipeline.
+    if raw or (update_fields is not None and 'image_url' not in update_fields):
+        return
+    for job, name, model in (
+        (extract_artwork_palette, 'palette', ArtworkPalette),
+        (hash_artwork_image, 'image-hash', ArtworkImageHash),
+    ):
+        # Without an image there is only work to do if a stale result is left to drop.
+        if instance.image_url or (not created and model.objects.filter(artwork_id=instance.pk).exists()):
+            enqueue(job, dedupe_key=f'{name}:{instance.pk}', artwork_pk=instance.pk)
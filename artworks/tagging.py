@@ -0,0 +1,114 @@
+"""
+Curator tags and tag-set queries.
+
+``ArtworkTag`` is an inverted index: its (tag, artwork) index holds each
+tag's posting list. A query such as ``landscape, oil | tempera, -portrait``
+means landscape AND (oil OR tempera) AND NOT portrait. It is answered with
+one grouped scan over the posting lists of the tags involved, keeping the
+artworks that hit every group (``HAVING COUNT(*) = n``), instead of one join
+per tag. ``Tag.artwork_count`` is adjusted on every write so the tag cloud
+never has to count.
+"""
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .models import ArtworkTag, Tag
+
+TAG_MAX_LENGTH = 50
+CLOUD_SIZE = 30
+
+
+def normalise_tag(name):
+    """Lower case, single spaces, no leading '#'."""
+    return ' '.join(name.casefold().lstrip('#').split())[:TAG_MAX_LENGTH]
+
+
+def split_tags(text):
+    """Normalised, de-duplicated tag names from comma-separated input."""
+    names = (normalise_tag(part) for part in text.split(','))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def set_artwork_tags(artwork, names):
+    """Make ``names`` the artwork's complete tag set, keeping tag counts in step."""
+    names = {normalise_tag(name) for name in names} - {''}
+    with transaction.atomic():
+        Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+        wanted = set(Tag.objects.filter(name__in=names).values_list('pk', flat=True))
+        current = set(artwork.artwork_tags.values_list('tag_id', flat=True))
+        added, removed = wanted - current, current - wanted
+        ArtworkTag.objects.bulk_create([ArtworkTag(artwork=artwork, tag_id=pk) for pk in added])
+        ArtworkTag.objects.filter(artwork=artwork, tag_id__in=removed).delete()
+        Tag.objects.filter(pk__in=added).update(artwork_count=F('artwork_count') + 1)
+        Tag.objects.filter(pk__in=removed).update(artwork_count=F('artwork_count') - 1)
+
+
+def recount_tags():
+    """Recompute every tag's count, e.g. after bulk loads; returns the tags corrected."""
+    counts = dict(
+        ArtworkTag.objects.order_by().values_list('tag').annotate(total=Count('artwork'))
+    )
+    stale = [tag for tag in Tag.objects.only('artwork_count') if tag.artwork_count != counts.get(tag.pk, 0)]
+    for tag in stale:
+        tag.artwork_count = counts.get(tag.pk, 0)
+    Tag.objects.bulk_update(stale, ['artwork_count'], batch_size=1000)
+    return len(stale)
+
+
+def tag_cloud(size=CLOUD_SIZE):
+    """The most used tags, alphabetically, each with a ``weight`` from 1 to 5."""
+    tags = list(Tag.objects.filter(artwork_count__gt=0).order_by('-artwork_count', 'name')[:size])
+    if tags:
+        most = tags[0].artwork_count
+        for tag in tags:
+            tag.weight = 1 + round(4 * tag.artwork_count / most)
+    return sorted(tags, key=lambda tag: tag.name)
+
+
+# ─── Queries ─────────────────────────────────────────────────────────────────
+
+def parse_tag_query(text):
+    """Parse ``a, b | c, -d`` into ([{'a'}, {'b', 'c'}], {'d'}).
+
+    Commas separate terms that must all match, ``|`` separates alternatives
+    within a term and a leading ``-`` excludes a tag.
+    """
+    groups, excluded = [], set()
+    for term in text.split(','):
+        term = term.strip()
+        if term.startswith('-'):
+            if '|' in term:
+                raise ValidationError('Exclude tags one at a time, e.g. "-portrait, -still life".')
+            name = normalise_tag(term[1:])
+            if name:
+                excluded.add(name)
+            continue
+        alternatives = {normalise_tag(name) for name in term.split('|')} - {''}
+        if alternatives and alternatives not in groups:
+            groups.append(alternatives)
+    return groups, excluded
+
+
+def filter_by_tags(queryset, groups, excluded=()):
+    """Restrict an Artwork queryset to a parsed tag query."""
+    names = set(excluded).union(*groups)
+    tag_pks = dict(Tag.objects.filter(name__in=names).values_list('name', 'pk'))
+    group_pks = [{tag_pks[name] for name in group if name in tag_pks} for group in groups]
+    if not all(group_pks):
+        return queryset.none()
+    if group_pks:
+        postings = ArtworkTag.objects.order_by().filter(tag__in=set().union(*group_pks)).values('artwork')
+        if all(len(group) == 1 for group in group_pks):
+            # Each artwork has a tag at most once, so hitting every tag means COUNT(*) = n.
+            matching = postings.annotate(hits=Count('*')).filter(hits=len(group_pks))
+        else:
+            hits = {f'group_{i}': Count('pk', filter=Q(tag__in=group)) for i, group in enumerate(group_pks)}
+            matching = postings.annotate(**hits).filter(**{f'{name}__gt': 0 for name in hits})
+        queryset = queryset.filter(pk__in=matching.values('artwork'))
+    excluded_pks = [tag_pks[name] for name in excluded if name in tag_pks]
+    if excluded_pks:
+        queryset = queryset.exclude(
+            pk__in=ArtworkTag.objects.filter(tag__in=excluded_pks).values('artwork'),
+        )
+    return queryset
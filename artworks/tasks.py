@@ -0,0 +1,30 @@
+from jobs.queue import task
+
+from .image_hashes import image_hashes, save_image_hashes
+from .images import fetch_image_bytes
+from .models import Artwork, ArtworkImageHash, ArtworkPalette
+from .palettes import extract_palette, save_palettes
+
+
+@task(max_attempts=3)
+def extract_artwork_palette(artwork_pk):
+    """Extract the palette of a new or changed artwork image (raises on fetch errors, so it is retried)."""
+    url = Artwork.objects.filter(pk=artwork_pk).values_list('image_url', flat=True).first()
+    if not url:
+        ArtworkPalette.objects.filter(artwork_id=artwork_pk).delete()
+        return
+    if ArtworkPalette.objects.filter(artwork_id=artwork_pk, source_url=url).exists():
+        return
+    save_palettes([(artwork_pk, url, extract_palette(fetch_image_bytes(url)))])
+
+
+@task(max_attempts=3)
+def hash_artwork_image(artwork_pk):
+    """Hash a new or changed artwork image for duplicate detection (raises on fetch errors, so it is retried)."""
+    url = Artwork.objects.filter(pk=artwork_pk).values_list('image_url', flat=True).first()
+    if not url:
+        ArtworkImageHash.objects.filter(artwork_id=artwork_pk).delete()
+        return
+    if ArtworkImageHash.objects.filter(artwork_id=artwork_pk, source_url=url).exists():
+        return
+    save_image_hashes([(artwork_pk, url, image_hashes(fetch_image_bytes(url)))])
@@ -0,0 +1,11 @@
+from django import template
+
+from artworks.cards import render_cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def artwork_cards(artworks, variant='standard'):
+    """Returns the card markup of each artwork, fetched from the card cache in one round trip."""
+    return render_cards(artworks, variant)
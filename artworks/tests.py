@@ -0,0 +1,261 @@
+import asyncio
+import threading
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from artists.matching import merge_artists
+from artvault.page_cache import install_query_tracking
+
+from .catalogue_index import CatalogueIndex
+from .link_checker import check_urls
+from .models import Artwork, Category, ValuationRecord
+from .valuations import create_checkpoint, portfolio_value, record_artwork_valuations, value_rollup
+
+
+# Templates resolve static URLs without running collectstatic first.
+@override_settings(STORAGES={
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class ArtworkChangelistQueryTests(TestCase):
+    """The artwork changelist runs a fixed number of queries however large the table is."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_catalogue', artists=300, artworks=600, exhibitions=0, seed=1, stdout=StringIO())
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        # Stand in for a large PostgreSQL table, whose size comes from the planner's estimate.
+        patcher = mock.patch('artvault.paginators.estimated_row_count', return_value=100_000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_changelist(self):
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse('admin:artworks_artwork_changelist'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_changelist_filtered_by_category(self):
+        category = Category.objects.get(name='Painting')
+        with self.assertNumQueries(7):
+            response = self.client.get(reverse('admin:artworks_artwork_changelist'), {'category__id__exact': category.pk})
+        self.assertEqual(response.status_code, 200)
+
+
+class CatalogueIndexSyncTests(TestCase):
+    """An index catches up with writes made outside its own process."""
+
+    def test_sync_replays_the_change_feed(self):
+        call_command('seed_catalogue', artists=20, artworks=80, exhibitions=0, seed=1, stdout=StringIO())
+        index = CatalogueIndex().load()
+        keeper, duplicate = Artwork.objects.values_list('artist_id', flat=True).distinct().order_by('artist_id')[:2]
+        merge_artists(keeper, [duplicate])
+        Category.objects.get(name='Oil Painting').delete()
+        artwork = Artwork.objects.order_by('pk').first()
+        artwork.title = 'Renamed'
+        artwork.save()
+        Artwork.objects.order_by('-pk').first().delete()
+        call_command('seed_catalogue', artists=5, artworks=10, exhibitions=0, seed=2, stdout=StringIO())
+        self.assertTrue(index.verify())
+
+        with self.assertNumQueries(3):
+            index.sync()
+        self.assertEqual(index.verify(), [])
+        with self.assertNumQueries(1):
+            index.sync()
+
+
+@override_settings(
+    PAGE_CACHE_ENABLED=True,
+    CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'page-cache-tests',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }},
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+)
+class PageCachePurgeTests(TestCase):
+    """Editing one artwork purges only the pages that show it."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_catalogue', artists=20, artworks=80, exhibitions=0, seed=1, stdout=StringIO())
+
+    def setUp(self):
+        install_query_tracking()
+        artworks = Artwork.objects.exclude(category=None).order_by('pk')
+        self.edited = artworks.first()
+        self.other = artworks.exclude(artist_id=self.edited.artist_id).exclude(category_id=self.edited.category_id).first()
+
+    def get(self, artwork):
+        response = self.client.get(reverse('artworks:detail', args=[artwork.pk]), HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200)
+        return response.headers.get('X-Page-Cache')
+
+    def test_edit_keeps_other_artwork_pages_cached(self):
+        for artwork in (self.edited, self.other):
+            self.assertEqual(self.get(artwork), 'miss')
+            self.assertEqual(self.get(artwork), 'hit')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.edited.title = 'Renamed'
+            self.edited.save()
+
+        self.assertEqual(self.get(self.other), 'hit')
+        self.assertEqual(self.get(self.edited), 'miss')
+
+
+class ValuationCheckpointTests(TestCase):
+    """Value-as-of queries agree with the raw ledger before, at and after checkpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_catalogue', artists=20, artworks=80, exhibitions=0, seed=1, stdout=StringIO())
+        cls.start = timezone.now() + timedelta(days=1)
+        artworks = Artwork.objects.filter(estimated_value__isnull=False).order_by('pk')
+        pks = list(artworks.values_list('pk', flat=True))
+        artists = list(artworks.values_list('artist_id', flat=True).distinct()[:2])
+        cls.book(0, pks)
+        Artwork.objects.filter(pk__in=pks[::3]).update(estimated_value=F('estimated_value') * 2)
+        cls.book(1, pks[::3])
+        Artwork.objects.filter(pk__in=pks[1::4]).update(artist_id=artists[0])
+        cls.book(2, pks[1::4])
+        Artwork.objects.filter(pk__in=pks[2::5]).update(estimated_value=None)
+        cls.book(3, pks[2::5])
+        Artwork.objects.filter(pk__in=pks[::7]).update(estimated_value=Decimal('1.00'), artist_id=artists[1])
+        cls.book(4, pks[::7])
+
+    @classmethod
+    def book(cls, day, pks):
+        with mock.patch('artworks.valuations.timezone.now', return_value=cls.start + timedelta(days=day)):
+            record_artwork_valuations(pks)
+
+    def expected(self, as_of, field=None):
+        # Summed in Python: SQLite's SUM() goes through floats.
+        ledger = ValuationRecord.objects.filter(recorded_at__lte=as_of)
+        if field is None:
+            return sum(ledger.values_list('change', flat=True), Decimal('0.00'))
+        totals = defaultdict(Decimal)
+        for key, change in ledger.values_list(field, 'change'):
+            totals[key] += change
+        return {key: total for key, total in totals.items() if total > 0}
+
+    def assert_matches_ledger(self):
+        for hours in range(-12, 24 * 5, 6):
+            as_of = self.start + timedelta(hours=hours)
+            with self.subTest(as_of=as_of):
+                self.assertEqual(portfolio_value(as_of), self.expected(as_of))
+                self.assertEqual(dict(value_rollup('artist', as_of)), self.expected(as_of, 'artist_id'))
+                self.assertEqual(dict(value_rollup('category', as_of)), self.expected(as_of, 'category_id'))
+                artist = ValuationRecord.objects.values_list('artist_id', flat=True).first()
+                self.assertEqual(
+                    portfolio_value(as_of, artist=artist),
+                    self.expected(as_of, 'artist_id').get(artist, Decimal('0.00')),
+                )
+
+    def test_without_checkpoints(self):
+        self.assert_matches_ledger()
+
+    def test_across_checkpoints(self):
+        create_checkpoint(self.start + timedelta(days=1, hours=12))
+        # Built from the first checkpoint plus the entries after it.
+        create_checkpoint(self.start + timedelta(days=3))
+        self.assert_matches_ledger()
+
+    def test_rollup_reads_one_checkpoint_and_the_tail(self):
+        create_checkpoint(self.start + timedelta(days=3))
+        with self.assertNumQueries(3):
+            value_rollup('artist', self.start + timedelta(days=4))
+
+
+class StubImageHost:
+    """An HTTP server on a background event loop that answers by path and counts open connections."""
+
+    def __init__(self, redirect_to=''):
+        self.redirect_to = redirect_to
+        self.open = self.most_open = 0
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        self.server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self.handle, '127.0.0.1', 0), self.loop,
+        ).result()
+        return f'http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}'
+
+    def stop(self):
+        async def close():
+            self.server.close()
+            await self.server.wait_closed()
+        asyncio.run_coroutine_threadsafe(close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    async def handle(self, reader, writer):
+        self.open += 1
+        self.most_open = max(self.most_open, self.open)
+        try:
+            method, target, _version = (await reader.readuntil(b'\r\n\r\n')).decode().split(' ', 2)
+            path = target.split('?')[0]
+            if path == '/slow':
+                await reader.read()  # Until the checker gives up and hangs up.
+                return
+            await asyncio.sleep(0.02)
+            status, headers = {
+                '/ok': (200, ''),
+                '/hop': (302, f'Location: {self.redirect_to}/ok?{target.partition("?")[2]}\r\n'),
+                '/loop': (302, 'Location: /loop\r\n'),
+                '/no-head': (405 if method == 'HEAD' else 200, ''),
+            }.get(path, (404, ''))
+            writer.write(f'HTTP/1.1 {status} Stub\r\n{headers}Content-Length: 0\r\n\r\n'.encode())
+            await writer.drain()
+        finally:
+            self.open -= 1
+            writer.close()
+
+
+class LinkCheckerTests(SimpleTestCase):
+    """check_urls against a local stub server."""
+
+    def start_host(self, **kwargs):
+        host = StubImageHost(**kwargs)
+        base = host.start()
+        self.addCleanup(host.stop)
+        return host, base
+
+    def test_results(self):
+        _host, base = self.start_host()
+        urls = {name: f'{base}/{name}' for name in ('ok', 'missing', 'no-head', 'loop', 'slow')}
+        results = check_urls(urls.values(), timeout=0.5)
+        self.assertEqual(results, {
+            urls['ok']: (True, 200, ''),
+            urls['missing']: (False, 404, 'HTTP 404'),
+            urls['no-head']: (True, 200, ''),
+            urls['loop']: (False, None, 'Too many redirects.'),
+            urls['slow']: (False, None, 'No response within 0.5s.'),
+        })
+
+    def test_redirect_hops_count_against_the_host_they_reach(self):
+        target, target_base = self.start_host()
+        origins = [self.start_host(redirect_to=target_base)[1] for _ in range(2)]
+        urls = [f'{base}/hop?{n}' for base in origins for n in range(6)]
+        results = check_urls(urls, per_host=2, timeout=5)
+        self.assertEqual(set(results.values()), {(True, 200, '')})
+        self.assertEqual(target.most_open, 2)
@@ -7,6 +7,8 @@ urlpatterns = [
     # Artworks
     path('', views.ArtworkListView.as_view(), name='list'),
     path('add/', views.ArtworkCreateView.as_view(), name='create'),
+    path('by-colour/', views.ArtworkColourSearchView.as_view(), name='colour-search'),
+    path('valuations/', views.ValuationReportView.as_view(), name='valuations'),
     path('<int:pk>/', views.ArtworkDetailView.as_view(), name='detail'),
     path('<int:pk>/edit/', views.ArtworkUpdateView.as_view(), name='update'),
     path('<int:pk>/delete/', views.ArtworkDeleteView.as_view(), name='delete'),
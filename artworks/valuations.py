@@ -0,0 +1,226 @@
+"""
+Valuation history: an append-only ledger of artwork estimated values.
+
+``record_valuations`` compares artworks with their latest ledger entry and
+books whatever changed: a new value, a removed value (unappraised or
+deleted), or a reattribution to another artist or category, which is a
+transfer out of the old pair and into the new one. Since every entry
+carries its signed ``change``, "value as of" questions are sums over an
+indexed time range and never need to reconstruct per-artwork state.
+
+Those sums would still grow with the ledger, so ``create_checkpoint`` (run
+periodically by ``manage.py checkpoint_valuations``) stores per artist and
+category totals up to a moment. A query reads the latest checkpoint at or
+before its ``as_of`` plus the entries booked since. Checkpoints stop
+``CHECKPOINT_LAG`` short of now, so entries still being written when one is
+taken are left to the tail rather than missed.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.db import transaction
+from django.db.models import DecimalField, F, Sum, Value, Window
+from django.db.models.functions import Coalesce, RowNumber, TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import Artwork, ValuationCheckpoint, ValuationCheckpointTotal, ValuationRecord
+
+ZERO = Decimal('0.00')
+BATCH_SIZE = 2000
+LEDGER_FIELDS = {'estimated_value', 'artist', 'artist_id', 'category', 'category_id'}
+PERIODS = {'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+CHECKPOINT_LAG = timedelta(minutes=10)
+
+
+def latest_valuations(artwork_pks=None, as_of=None):
+    """Each artwork's most recent ledger entry (up to ``as_of``), picked by ROW_NUMBER()."""
+    queryset = ValuationRecord.objects.all()
+    if artwork_pks is not None:
+        queryset = queryset.filter(artwork_id__in=artwork_pks)
+    if as_of is not None:
+        queryset = queryset.filter(recorded_at__lte=as_of)
+    return queryset.annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=[F('artwork_id')],
+            order_by=[F('recorded_at').desc(), F('id').desc()],
+        ),
+    ).filter(position=1)
+
+
+def _ledger_entries(row, latest, now):
+    pk, value, artist_id, category_id = row
+    previous = latest.value if latest else None
+    if latest and (latest.artist_id, latest.category_id) != (artist_id, category_id):
+        entries = []
+        if previous is not None:
+            entries.append(ValuationRecord(
+                artwork_id=pk, artist_id=latest.artist_id, category_id=latest.category_id,
+                value=None, change=-previous, recorded_at=now,
+            ))
+        if value is not None:
+            entries.append(ValuationRecord(
+                artwork_id=pk, artist_id=artist_id, category_id=category_id,
+                value=value, change=value, recorded_at=now,
+            ))
+        return entries
+    if value == previous:
+        return []
+    return [ValuationRecord(
+        artwork_id=pk, artist_id=artist_id, category_id=category_id,
+        value=value, change=(value or ZERO) - (previous or ZERO), recorded_at=now,
+    )]
+
+
+def record_valuations(rows):
+    """Book ledger entries for (pk, value, artist_id, category_id) rows.
+
+    Pass ``value=None`` for a deleted artwork. Returns the entries written.
+    """
+    rows = list(rows)
+    now = timezone.now()
+    written = 0
+    for start in range(0, len(rows), BATCH_SIZE):
+        chunk = rows[start:start + BATCH_SIZE]
+        latest = {record.artwork_id: record for record in latest_valuations([row[0] for row in chunk])}
+        entries = [entry for row in chunk for entry in _ledger_entries(row, latest.get(row[0]), now)]
+        ValuationRecord.objects.bulk_create(entries)
+        written += len(entries)
+    return written
+
+
+def record_artwork_valuations(artwork_pks):
+    """Book current values for artworks changed by a bulk UPDATE."""
+    rows = Artwork.objects.filter(pk__in=artwork_pks).order_by().values_list(
+        'pk', 'estimated_value', 'artist_id', 'category_id',
+    )
+    return record_valuations(rows)
+
+
+# ─── Queries ─────────────────────────────────────────────────────────────────
+
+def value_history(artwork_pk, start=None, end=None):
+    queryset = ValuationRecord.objects.filter(artwork_id=artwork_pk)
+    if start is not None:
+        queryset = queryset.filter(recorded_at__gte=start)
+    if end is not None:
+        queryset = queryset.filter(recorded_at__lte=end)
+    return queryset.order_by('recorded_at', 'id')
+
+
+def _ledger(as_of=None, artist=None, category=None):
+    queryset = ValuationRecord.objects.all()
+    if as_of is not None:
+        queryset = queryset.filter(recorded_at__lte=as_of)
+    if artist is not None:
+        queryset = queryset.filter(artist=artist)
+    if category is not None:
+        queryset = queryset.filter(category=category)
+    return queryset
+
+
+def latest_checkpoint(as_of=None):
+    """The newest checkpoint taken at or before ``as_of`` (default now), or None."""
+    queryset = ValuationCheckpoint.objects.order_by('-as_of')
+    if as_of is not None:
+        queryset = queryset.filter(as_of__lte=as_of)
+    return queryset.first()
+
+
+def _since_checkpoint(as_of=None, artist=None, category=None):
+    """(checkpoint totals, ledger tail) that together make up the value at ``as_of``."""
+    checkpoint = latest_checkpoint(as_of)
+    tail = _ledger(as_of, artist, category)
+    if checkpoint is None:
+        return ValuationCheckpointTotal.objects.none(), tail
+    totals = ValuationCheckpointTotal.objects.filter(checkpoint=checkpoint)
+    if artist is not None:
+        totals = totals.filter(artist=artist)
+    if category is not None:
+        totals = totals.filter(category=category)
+    return totals, tail.filter(recorded_at__gt=checkpoint.as_of)
+
+
+def _sum(queryset, field):
+    return queryset.aggregate(
+        total=Coalesce(Sum(field), Value(ZERO), output_field=DecimalField(max_digits=16, decimal_places=2)),
+    )['total']
+
+
+def _combine(*groupings):
+    """{key: total} over querysets of (*key, total) rows, in whole cents (SQLite sums through floats)."""
+    combined = defaultdict(lambda: ZERO)
+    for rows in groupings:
+        for *key, total in rows:
+            combined[tuple(key)] += total
+    return {key: total.quantize(ZERO) for key, total in combined.items()}
+
+
+def _grouped(queryset, fields, field):
+    return queryset.order_by().values_list(*fields).annotate(total=Sum(field))
+
+
+def create_checkpoint(as_of=None):
+    """Store per artist and category totals up to ``as_of`` (default ``CHECKPOINT_LAG`` ago).
+
+    Built from the previous checkpoint plus the entries since, so taking one
+    costs as much as a query does.
+    """
+    as_of = as_of or timezone.now() - CHECKPOINT_LAG
+    pair = ('artist_id', 'category_id')
+    totals, tail = _since_checkpoint(as_of)
+    combined = _combine(_grouped(totals, pair, 'total'), _grouped(tail, pair, 'change'))
+    with transaction.atomic():
+        checkpoint, created = ValuationCheckpoint.objects.get_or_create(as_of=as_of)
+        if created:
+            ValuationCheckpointTotal.objects.bulk_create(
+                [
+                    ValuationCheckpointTotal(
+                        checkpoint=checkpoint, artist_id=artist_id, category_id=category_id, total=total,
+                    )
+                    for (artist_id, category_id), total in combined.items()
+                    if total
+                ],
+                batch_size=BATCH_SIZE,
+            )
+    return checkpoint
+
+
+def portfolio_value(as_of=None, artist=None, category=None):
+    """Total estimated value at ``as_of`` (default now), optionally for one artist or category."""
+    totals, tail = _since_checkpoint(as_of, artist, category)
+    return (_sum(totals, 'total') + _sum(tail, 'change')).quantize(ZERO)
+
+
+def value_rollup(by, as_of=None, limit=None):
+    """[(artist or category id, total value)] at ``as_of``, largest first."""
+    field = {'artist': 'artist_id', 'category': 'category_id'}[by]
+    totals, tail = _since_checkpoint(as_of)
+    combined = _combine(_grouped(totals, [field], 'total'), _grouped(tail, [field], 'change'))
+    rollup = sorted(((key, total) for (key,), total in combined.items() if total > 0), key=lambda row: -row[1])
+    return rollup[:limit] if limit else rollup
+
+
+def value_series(start, end, period='month', artist=None, category=None):
+    """[(period start, value at the end of that period)] for periods with changes in (start, end]."""
+    opening = portfolio_value(start, artist, category)
+    nets = (
+        _ledger(end, artist, category).filter(recorded_at__gt=start).order_by()
+        .annotate(period=PERIODS[period]('recorded_at')).values('period')
+        .annotate(net=Sum('change')).order_by('period')
+    )
+    nets = list(nets)
+    running = accumulate((row['net'] for row in nets), initial=opening)
+    next(running)
+    return [(row['period'], total) for row, total in zip(nets, running)]
+
+
+def artwork_values_as_of(as_of, artwork_pks=None):
+    """{artwork pk: estimated value} at ``as_of`` for artworks that had one."""
+    return {
+        record.artwork_id: record.value
+        for record in latest_valuations(artwork_pks, as_of).only('artwork_id', 'value')
+        if record.value is not None
+    }
@@ -1,9 +1,22 @@
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
 from django.urls import reverse_lazy
 from django.contrib import messages
+from django.utils import timezone
+from artvault.concurrency import VersionedUpdateMixin
 from django.db.models import Q
+from artists.eras import artwork_timeline, artworks_made, cached_timeline
+from artists.models import Artist
 from .models import Artwork, Category
-from .forms import ArtworkForm, CategoryForm, ArtworkFilterForm
+from .forms import ArtworkForm, CategoryForm, ArtworkFilterForm, ColourSearchForm, ValuationReportForm
+from .categories import tree_order, with_artwork_counts
+from .catalogue_index import IndexedArtworkList, get_catalogue_index, index_enabled
+from .image_hashes import possible_duplicates
+from .palettes import artworks_near_colour
+from .tagging import filter_by_tags, tag_cloud
+from .valuations import portfolio_value, value_rollup, value_series
 
 
 # ─── Artwork CRUD ─────────────────────────────────────────────────────────────
@@ -22,16 +35,39 @@ class ArtworkListView(ListView):
             category = form.cleaned_data.get('category')
             on_display = form.cleaned_data.get('on_display')
             sort = form.cleaned_data.get('sort') or '-year_created'
+            tags = form.cleaned_data.get('tags')
+            nationality = form.cleaned_data.get('nationality')
+            period = form.cleaned_data.get('period')
+            if not (q or category or tags or on_display or nationality or period):
+                self.timeline = cached_timeline('artworks', lambda: artwork_timeline(Artwork.objects.all()))
+            # Text, tag, nationality and era filters are answered by the database.
+            if index_enabled() and not (q or tags or nationality or period):
+                return IndexedArtworkList(
+                    get_catalogue_index(),
+                    sort=sort,
+                    category_ids=list(category.subtree().values_list('pk', flat=True)) if category else None,
+                    on_display={'yes': True, 'no': False}.get(on_display),
+                )
             if q:
                 queryset = queryset.filter(
                     Q(title__icontains=q) | Q(description__icontains=q)
                 )
             if category:
-                queryset = queryset.filter(category=category)
+                # The category and all of its subcategories.
+                queryset = queryset.filter(category__in=category.subtree())
+            if tags:
+                queryset = filter_by_tags(queryset, *tags)
             if on_display == 'yes':
                 queryset = queryset.filter(is_on_display=True)
             elif on_display == 'no':
                 queryset = queryset.filter(is_on_display=False)
+            if nationality:
+                queryset = queryset.filter(artist__nationality=nationality)
+            if nationality or period:
+                # Counts every period the other filters allow.
+                self.timeline = artwork_timeline(queryset, period)
+            if period:
+                queryset = artworks_made(queryset, *period)
             if sort:
                 queryset = queryset.order_by(sort)
         return queryset
@@ -39,6 +75,31 @@ class ArtworkListView(ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['filter_form'] = ArtworkFilterForm(self.request.GET)
+        # Kiosks read the snapshot, which carries no tags.
+        context['tag_cloud'] = [] if settings.CATALOGUE_SNAPSHOT_READS else tag_cloud()
+        context['timeline'] = getattr(self, 'timeline', None)
+        return context
+
+
+class ArtworkColourSearchView(ListView):
+    template_name = 'artworks/artwork_colour_search.html'
+    context_object_name = 'artworks'
+    result_limit = 24
+
+    def get_queryset(self):
+        self.form = ColourSearchForm(self.request.GET or None)
+        if not self.form.is_valid():
+            return []
+        ranking = artworks_near_colour(self.form.cleaned_data['colour'], limit=self.result_limit)
+        artworks = (
+            Artwork.objects.select_related('artist', 'category', 'palette')
+            .in_bulk([pk for pk, _distance in ranking])
+        )
+        return [artworks[pk] for pk, _distance in ranking if pk in artworks]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['colour_form'] = self.form
         return context
 
 
@@ -54,8 +115,41 @@ class ArtworkDetailView(DetailView):
             Artwork.objects
             .filter(artist=self.object.artist)
             .exclude(pk=self.object.pk)
-            .select_related('category')[:4]
+            .select_related('artist', 'category')[:4]
         )
+        context['tags'] = [] if settings.CATALOGUE_SNAPSHOT_READS else self.object.tags.all()
+        # Valuations are finance data, kept off the kiosk snapshot.
+        if not settings.CATALOGUE_SNAPSHOT_READS:
+            context['valuations'] = self.object.valuations.order_by('-recorded_at', '-id')[:10]
+            # Image hashes are not in the snapshot either.
+            context['possible_duplicates'] = possible_duplicates(self.object)
+        return context
+
+
+class ValuationReportView(TemplateView):
+    """Collection value at a point in time, answered from the valuation ledger."""
+    template_name = 'artworks/valuation_report.html'
+    top_limit = 10
+    series_months = 12
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        form = ValuationReportForm(self.request.GET or None)
+        as_of = timezone.now()
+        if form.is_valid() and form.cleaned_data['as_of']:
+            as_of = timezone.make_aware(datetime.combine(form.cleaned_data['as_of'], time.max))
+        top_artists = value_rollup('artist', as_of, limit=self.top_limit)
+        top_categories = value_rollup('category', as_of, limit=self.top_limit)
+        artists = Artist.objects.in_bulk([pk for pk, _total in top_artists])
+        categories = Category.objects.in_bulk([pk for pk, _total in top_categories if pk is not None])
+        context.update({
+            'form': form,
+            'as_of': as_of,
+            'total_value': portfolio_value(as_of),
+            'top_artists': [(artists.get(pk), total) for pk, total in top_artists],
+            'top_categories': [(categories.get(pk), total) for pk, total in top_categories],
+            'series': value_series(as_of - timedelta(days=30 * self.series_months), as_of),
+        })
         return context
 
 
@@ -80,7 +174,7 @@ class ArtworkCreateView(CreateView):
         return super().form_invalid(form)
 
 
-class ArtworkUpdateView(UpdateView):
+class ArtworkUpdateView(VersionedUpdateMixin, UpdateView):
     model = Artwork
     form_class = ArtworkForm
     template_name = 'artworks/artwork_form.html'
@@ -92,9 +186,8 @@ class ArtworkUpdateView(UpdateView):
         context['submit_label'] = 'Save Changes'
         return context
 
-    def form_valid(self, form):
-        messages.success(self.request, f'"{form.instance.title}" was updated.')
-        return super().form_valid(form)
+    def get_success_message(self, form):
+        return f'"{form.instance.title}" was updated.'
 
     def form_invalid(self, form):
         messages.error(self.request, 'Please correct the errors below.')
@@ -122,7 +215,7 @@ class CategoryListView(ListView):
     context_object_name = 'categories'
 
     def get_queryset(self):
-        return Category.objects.all().prefetch_related('artworks')
+        return with_artwork_counts(tree_order(Category.objects.all()))
 
 
 class CategoryCreateView(CreateView):
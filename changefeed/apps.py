@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ChangefeedConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'changefeed'
+    verbose_name = 'Change Feed'
+
+    def ready(self):
+        from . import signals  # noqa: F401
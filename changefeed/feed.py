@@ -0,0 +1,135 @@
+"""
+Append-only change log for incremental sync.
+
+Every save and delete of a catalogue model, and every exhibition membership
+change, appends a ``Change`` row on the same connection as the write (and
+so in its transaction: requests run atomically, as do admin saves, deletes
+and bulk merges). Consumers keep the last cursor they processed and ask
+for what follows it, so a sync costs O(changes) rather than a full
+catalogue download.
+
+Cursors must only ever move past committed rows. Ids are allocated when a
+row is inserted, not when its transaction commits, so every transaction
+that records changes first takes one transaction-scoped lock and holds it
+until it commits. On PostgreSQL that is an advisory lock; SQLite already
+admits one writing transaction at a time. Change-writing transactions
+therefore commit in id order, and every id below the highest visible one
+is final. Readers never wait on the lock.
+
+Recording a change also purges the cached pages of the objects involved
+(see artvault.page_cache) once the transaction commits.
+"""
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import connections, router, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from artvault.page_cache import purge_objects
+
+from .models import Change
+
+RECORD_BATCH_SIZE = 1000
+# Key of the PostgreSQL advisory lock that orders change-writing transactions.
+FEED_LOCK_KEY = 0x63686e67
+
+
+def feed_models():
+    from artists.models import Artist
+    from artworks.models import Artwork, Category
+    from exhibitions.models import Exhibition
+    return {model._meta.model_name: model for model in (Artist, Artwork, Category, Exhibition)}
+
+
+def snapshot(instance):
+    return {field.attname: field.value_from_object(instance) for field in instance._meta.concrete_fields}
+
+
+@contextmanager
+def _feed_write():
+    """Run inside a transaction that holds the feed lock until it commits."""
+    using = router.db_for_write(Change)
+    with transaction.atomic(using=using, savepoint=False):
+        connection = connections[using]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [FEED_LOCK_KEY])
+        yield
+
+
+def record(instance, action):
+    with _feed_write():
+        Change.objects.create(
+            model=instance._meta.model_name,
+            object_id=instance.pk,
+            action=action,
+            data=None if action == Change.Action.DELETED else snapshot(instance),
+        )
+    purge_objects(instance._meta.model_name, [instance.pk])
+
+
+def record_many(model, pks, action):
+    """Log one change per pk, for bulk writes that bypass model signals."""
+    pks = sorted(set(pks))
+    label = model._meta.model_name
+    if not pks:
+        return
+    with _feed_write():
+        for start in range(0, len(pks), RECORD_BATCH_SIZE):
+            chunk = pks[start:start + RECORD_BATCH_SIZE]
+            if action == Change.Action.DELETED:
+                changes = [Change(model=label, object_id=pk, action=action) for pk in chunk]
+            else:
+                changes = [
+                    Change(model=label, object_id=instance.pk, action=action, data=snapshot(instance))
+                    for instance in model.objects.filter(pk__in=chunk).order_by('pk')
+                ]
+            Change.objects.bulk_create(changes)
+    purge_objects(label, pks)
+
+
+def record_membership(pairs, action):
+    """Log (exhibition pk, artwork pk) pairs being linked or unlinked."""
+    if not pairs:
+        return
+    with _feed_write():
+        Change.objects.bulk_create(
+            [
+                Change(model='exhibition', object_id=exhibition_pk, action=action, related_id=artwork_pk)
+                for exhibition_pk, artwork_pk in pairs
+            ],
+            batch_size=RECORD_BATCH_SIZE,
+        )
+    purge_objects('exhibition', {exhibition_pk for exhibition_pk, _artwork_pk in pairs})
+
+
+def latest_cursor():
+    """Highest committed cursor; no change at or below it can still appear."""
+    return Change.objects.aggregate(latest=Max('pk'))['latest'] or 0
+
+
+def changes_since(cursor, limit=500, models=None):
+    """Changes after ``cursor``, oldest first.
+
+    Returns (changes, next cursor, has_more, resync) where
+    ``resync`` means rows after ``cursor`` may have been pruned and the
+    consumer must download the catalogue again.
+    """
+    oldest = Change.objects.aggregate(oldest=Min('pk'))['oldest']
+    resync = oldest is not None and cursor < oldest - 1
+    queryset = Change.objects.filter(pk__gt=cursor).order_by('pk')
+    if models:
+        queryset = queryset.filter(model__in=models)
+    changes = list(queryset[:limit + 1])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    next_cursor = changes[-1].pk if changes else cursor
+    return changes, next_cursor, has_more, resync
+
+
+def prune(days):
+    """Delete changes older than ``days``; returns the number removed."""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = Change.objects.filter(changed_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,48 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from changefeed.feed import changes_since, feed_models, latest_cursor, prune
+
+
+class Command(BaseCommand):
+    help = 'Print catalogue changes after a cursor as JSON lines, or prune old changes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=int, default=None, help='Cursor to read after.')
+        parser.add_argument('--limit', type=int, default=None,
+                            help='Stop after this many changes (default: read to the end).')
+        parser.add_argument('--model', action='append', dest='models',
+                            help=f'Only these models (repeatable): {", ".join(feed_models())}.')
+        parser.add_argument('--latest', action='store_true', help='Print the latest cursor and exit.')
+        parser.add_argument('--prune-days', type=int, default=None,
+                            help='Delete changes older than this many days and exit.')
+
+    def handle(self, *args, **options):
+        if options['latest']:
+            self.stdout.write(str(latest_cursor()))
+            return
+        if options['prune_days'] is not None:
+            deleted = prune(options['prune_days'])
+            self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} changes.'))
+            return
+        if options['since'] is None:
+            raise CommandError('Give --since CURSOR (or --latest / --prune-days).')
+        unknown = set(options['models'] or []) - set(feed_models())
+        if unknown:
+            raise CommandError(f'Unknown model: {", ".join(sorted(unknown))}')
+
+        cursor, remaining = options['since'], options['limit']
+        while remaining is None or remaining > 0:
+            page = 500 if remaining is None else min(500, remaining)
+            changes, cursor, has_more, resync = changes_since(cursor, page, options['models'])
+            if resync:
+                raise CommandError('Changes after this cursor have been pruned; resync the full catalogue.')
+            for change in changes:
+                self.stdout.write(json.dumps(change.as_dict(), cls=DjangoJSONEncoder))
+            if remaining is not None:
+                remaining -= len(changes)
+            if not has_more:
+                break
+        self.stderr.write(f'next cursor: {cursor}')
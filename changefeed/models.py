@@ -0,0 +1,48 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class Change(models.Model):
+    """One entry in the append-only catalogue change log; its id is the feed cursor."""
+
+    class Action(models.TextChoices):
+        CREATED = 'created', 'Created'
+        UPDATED = 'updated', 'Updated'
+        DELETED = 'deleted', 'Deleted'
+        LINKED = 'linked', 'Linked'
+        UNLINKED = 'unlinked', 'Unlinked'
+
+    model = models.CharField(max_length=30, help_text='Model label, e.g. artwork or exhibition.')
+    object_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=10, choices=Action.choices)
+    related_id = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        help_text='For linked/unlinked: the artwork added to or removed from the exhibition.',
+    )
+    data = models.JSONField(
+        null=True,
+        blank=True,
+        encoder=DjangoJSONEncoder,
+        help_text='Field values after the change; empty for deletes and membership changes.',
+    )
+    changed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Change'
+        verbose_name_plural = 'Changes'
+
+    def __str__(self):
+        return f'#{self.pk} {self.model}:{self.object_id} {self.action}'
+
+    def as_dict(self):
+        return {
+            'cursor': self.pk,
+            'model': self.model,
+            'id': self.object_id,
+            'action': self.action,
+            'related_id': self.related_id,
+            'data': self.data,
+            'changed_at': self.changed_at,
+        }
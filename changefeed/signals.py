@@ -0,0 +1,65 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from artists.models import Artist
+from artworks.models import Artwork, Category
+from exhibitions.models import Exhibition
+
+from .feed import record, record_many, record_membership
+from .models import Change
+
+FEED_SENDERS = (Artist, Artwork, Category, Exhibition)
+
+
+@receiver(post_save)
+def log_save(sender, instance, created, raw=False, **kwargs):
+    if sender in FEED_SENDERS and not raw:
+        record(instance, Change.Action.CREATED if created else Change.Action.UPDATED)
+
+
+@receiver(post_delete)
+def log_delete(sender, instance, **kwargs):
+    if sender in FEED_SENDERS:
+        record(instance, Change.Action.DELETED)
+
+
+@receiver(pre_delete, sender=Category)
+def remember_categorised_artworks(sender, instance, **kwargs):
+    # Deleting a category nulls Artwork.category in one UPDATE, without signals.
+    instance._changefeed_artwork_pks = list(instance.artworks.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Category)
+def log_uncategorised_artworks(sender, instance, **kwargs):
+    record_many(Artwork, getattr(instance, '_changefeed_artwork_pks', []), Change.Action.UPDATED)
+
+
+@receiver(post_save, sender=Category)
+def log_moved_subcategories(sender, instance, raw=False, **kwargs):
+    # Moving a category rewrites its descendants' paths in one UPDATE, without signals.
+    moved_from = getattr(instance, '_moved_from', None)
+    if moved_from and not raw:
+        descendants = instance.subtree().exclude(pk=instance.pk).values_list('pk', flat=True)
+        record_many(Category, descendants, Change.Action.UPDATED)
+
+
+@receiver(m2m_changed, sender=Exhibition.artworks.through)
+def log_membership(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # pk_set is not supplied for clear(), so note the members beforehand.
+        related = instance.artworks if not reverse else instance.exhibitions
+        instance._changefeed_cleared_pks = set(related.values_list('pk', flat=True))
+        return
+    if action == 'post_clear':
+        pk_set, change = getattr(instance, '_changefeed_cleared_pks', set()), Change.Action.UNLINKED
+    elif action == 'post_add':
+        change = Change.Action.LINKED
+    elif action == 'post_remove':
+        change = Change.Action.UNLINKED
+    else:
+        return
+    if reverse:
+        pairs = [(exhibition_pk, instance.pk) for exhibition_pk in pk_set]
+    else:
+        pairs = [(instance.pk, artwork_pk) for artwork_pk in pk_set]
+    record_membership(sorted(pairs), change)
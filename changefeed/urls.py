@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+app_name = 'changefeed'
+
+urlpatterns = [
+    path('', views.ChangeFeedView.as_view(), name='changes'),
+]
@@ -0,0 +1,30 @@
+from django.http import JsonResponse
+from django.views import View
+
+from .feed import changes_since, feed_models, latest_cursor
+
+MAX_LIMIT = 1000
+
+
+class ChangeFeedView(View):
+    """JSON page of catalogue changes after ``?since=<cursor>``."""
+
+    def get(self, request):
+        try:
+            since = int(request.GET.get('since', 0))
+            limit = min(int(request.GET.get('limit', 500)), MAX_LIMIT)
+        except ValueError:
+            return JsonResponse({'error': 'since and limit must be integers.'}, status=400)
+        models = [label for value in request.GET.getlist('model') for label in value.split(',') if label]
+        unknown = set(models) - set(feed_models())
+        if since < 0 or limit < 1 or unknown:
+            return JsonResponse({'error': 'Invalid since, limit or model.'}, status=400)
+
+        changes, next_cursor, has_more, resync = changes_since(since, limit, models)
+        return JsonResponse({
+            'changes': [change.as_dict() for change in changes],
+            'next_cursor': next_cursor,
+            'has_more': has_more,
+            'resync': resync,
+            'latest_cursor': latest_cursor(),
+        })
@@ -1,5 +1,8 @@
-from django.contrib import admin
-from .models import Exhibition
+from django.contrib import admin, messages
+
+from artvault.paginators import EstimatedCountPaginator
+from .archive import restore_exhibitions
+from .models import ArchivedExhibition, Exhibition
 
 
 @admin.register(Exhibition)
@@ -7,5 +10,26 @@ class ExhibitionAdmin(admin.ModelAdmin):
     list_display = ('title', 'location', 'start_date', 'end_date', 'is_active')
     list_filter = ('is_active',)
     search_fields = ('title', 'location')
-    filter_horizontal = ('artworks',)
+    autocomplete_fields = ('artworks',)
     readonly_fields = ('created_at',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(ArchivedExhibition)
+class ArchivedExhibitionAdmin(admin.ModelAdmin):
+    list_display = ('title', 'location', 'start_date', 'end_date', 'archived_at')
+    search_fields = ('title', 'location')
+    date_hierarchy = 'end_date'
+    actions = ('restore',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description='Restore selected exhibitions')
+    def restore(self, request, queryset):
+        restored = sum(restore_exhibitions(queryset.values_list('pk', flat=True)))
+        messages.success(request, f'{restored} exhibition(s) restored.')
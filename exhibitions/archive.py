@@ -0,0 +1,145 @@
+"""
+Moving retired exhibitions out of the live tables and back.
+
+Hidden exhibitions that closed more than ``EXHIBITION_ARCHIVE_AFTER_DAYS``
+ago are copied, with their membership rows, into ``ArchivedExhibition``
+and ``ArchivedExhibitionArtwork`` and deleted from the live tables, so
+public list queries and their indexes only cover current data. Each chunk
+is its own short transaction. On PostgreSQL, rows locked by an edit in
+progress are skipped (``FOR UPDATE SKIP LOCKED``) and picked up on the
+next run rather than waited for. Restoring is the same move in reverse and
+keeps ids, timestamps and memberships.
+
+The change feed sees an archived exhibition as deleted and a restored one
+as created, with its artworks linked again.
+
+``LiveAndArchived`` lists both tables as one, newest first, a page at a
+time: each table is read in ``start_date`` order only as far as the page
+ends, and only the page's own rows are loaded.
+"""
+import heapq
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from changefeed.feed import record_many, record_membership
+from changefeed.models import Change
+
+from .models import ArchivedExhibition, ArchivedExhibitionArtwork, Exhibition
+
+CHUNK_SIZE = 200
+Membership = Exhibition.artworks.through
+FIELDS = [field.attname for field in Exhibition._meta.concrete_fields]
+
+
+def retired_exhibitions(days=None):
+    """Live exhibitions eligible for the archive: hidden and closed for ``days``."""
+    days = settings.EXHIBITION_ARCHIVE_AFTER_DAYS if days is None else days
+    cutoff = timezone.now().date() - timedelta(days=days)
+    return Exhibition.objects.filter(is_active=False, end_date__lt=cutoff)
+
+
+def _chunks(pks, size):
+    pks = sorted(set(pks))
+    for start in range(0, len(pks), size):
+        yield pks[start:start + size]
+
+
+def _lock(queryset):
+    if connection.features.has_select_for_update_skip_locked:
+        return queryset.select_for_update(skip_locked=True)
+    return queryset
+
+
+def archive_exhibitions(pks, chunk_size=CHUNK_SIZE, pause=0.0, eligible=None):
+    """Move exhibitions into the archive; yields the number moved per chunk.
+
+    Each chunk is re-read under lock from ``eligible`` (any live exhibition
+    by default), so one shown again or re-dated since ``pks`` were listed
+    stays live.
+    """
+    eligible = Exhibition.objects.all() if eligible is None else eligible
+    for chunk in _chunks(pks, chunk_size):
+        now = timezone.now()
+        with transaction.atomic():
+            rows = list(_lock(eligible.filter(pk__in=chunk).order_by('pk')).values(*FIELDS))
+            moved = [row['id'] for row in rows]
+            members = Membership.objects.filter(exhibition_id__in=moved).values_list('exhibition_id', 'artwork_id')
+            ArchivedExhibition.objects.bulk_create([ArchivedExhibition(**row, archived_at=now) for row in rows])
+            ArchivedExhibitionArtwork.objects.bulk_create([
+                ArchivedExhibitionArtwork(exhibition_id=exhibition_pk, artwork_id=artwork_pk)
+                for exhibition_pk, artwork_pk in members
+            ])
+            # Sends post_delete, so the change feed logs each one as deleted.
+            Exhibition.objects.filter(pk__in=moved).delete()
+        yield len(moved)
+        if pause:
+            time.sleep(pause)
+
+
+def restore_exhibitions(pks, chunk_size=CHUNK_SIZE, pause=0.0):
+    """Move archived exhibitions back into the live tables; yields the number moved per chunk."""
+    for chunk in _chunks(pks, chunk_size):
+        with transaction.atomic():
+            rows = list(_lock(ArchivedExhibition.objects.filter(pk__in=chunk).order_by('pk')).values(*FIELDS))
+            moved = [row['id'] for row in rows]
+            members = list(
+                ArchivedExhibitionArtwork.objects.filter(exhibition_id__in=moved)
+                .order_by('exhibition_id', 'artwork_id').values_list('exhibition_id', 'artwork_id')
+            )
+            exhibitions = [Exhibition(**row) for row in rows]
+            Exhibition.objects.bulk_create(exhibitions)
+            # bulk_create stamped auto_now(_add) fields with the current time.
+            for exhibition, row in zip(exhibitions, rows):
+                exhibition.created_at, exhibition.updated_at = row['created_at'], row['updated_at']
+            Exhibition.objects.bulk_update(exhibitions, ['created_at', 'updated_at'])
+            Membership.objects.bulk_create([
+                Membership(exhibition_id=exhibition_pk, artwork_id=artwork_pk)
+                for exhibition_pk, artwork_pk in members
+            ])
+            ArchivedExhibition.objects.filter(pk__in=moved).delete()
+            record_many(Exhibition, moved, Change.Action.CREATED)
+            record_membership(members, Change.Action.LINKED)
+        yield len(moved)
+        if pause:
+            time.sleep(pause)
+
+
+class LiveAndArchived:
+    """Live and archived exhibitions, newest first, sliced by a Paginator without loading the rest."""
+
+    ordered = True
+
+    def __init__(self, live, archived):
+        self.querysets = [live.order_by('-start_date', '-pk'), archived.order_by('-start_date', '-pk')]
+
+    def count(self):
+        return sum(queryset.count() for queryset in self.querysets)
+
+    def __len__(self):
+        return self.count()
+
+    @staticmethod
+    def _keys(position, queryset):
+        for start_date, pk in queryset.values_list('start_date', 'pk'):
+            yield start_date, pk, position
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        # Each table in the page's order, cut off where the page ends at the latest.
+        keys = heapq.merge(
+            *(self._keys(position, queryset[:stop]) for position, queryset in enumerate(self.querysets)),
+            reverse=True,
+        )
+        page = list(islice(keys, start, stop))
+        rows = [
+            queryset.in_bulk([pk for _start_date, pk, source in page if source == position])
+            for position, queryset in enumerate(self.querysets)
+        ]
+        return [rows[position][pk] for _start_date, pk, position in page]
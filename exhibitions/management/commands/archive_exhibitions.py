@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from exhibitions.archive import CHUNK_SIZE, archive_exhibitions, restore_exhibitions, retired_exhibitions
+from exhibitions.models import ArchivedExhibition
+
+
+class Command(BaseCommand):
+    help = 'Move hidden exhibitions that closed long ago into the archive tables, or restore them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Archive exhibitions closed more than this many days ago '
+                                 '(default: EXHIBITION_ARCHIVE_AFTER_DAYS).')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help='Exhibitions moved per transaction.')
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help='Seconds to sleep between chunks, to leave room for other writers.')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be archived.')
+        parser.add_argument('--restore', type=int, nargs='+', metavar='PK',
+                            help='Move these archived exhibitions back instead.')
+        parser.add_argument('--restore-all', action='store_true', help='Move every archived exhibition back.')
+
+    def handle(self, *args, **options):
+        if options['restore'] or options['restore_all']:
+            pks = options['restore'] or ArchivedExhibition.objects.values_list('pk', flat=True)
+            missing = set(options['restore'] or ()) - set(
+                ArchivedExhibition.objects.filter(pk__in=options['restore'] or ()).values_list('pk', flat=True)
+            )
+            if missing:
+                raise CommandError(f'Not in the archive: {", ".join(map(str, sorted(missing)))}')
+            self.report('Restored', restore_exhibitions(pks, options['chunk_size'], options['pause']))
+            return
+        retired = retired_exhibitions(options['days'])
+        pks = list(retired.values_list('pk', flat=True))
+        if options['dry_run']:
+            self.stdout.write(f'{len(pks)} exhibitions would be archived.')
+            return
+        self.report('Archived', archive_exhibitions(pks, options['chunk_size'], options['pause'], eligible=retired))
+
+    def report(self, verb, chunks):
+        total = 0
+        for moved in chunks:
+            total += moved
+            self.stdout.write(f'{total} exhibitions…')
+        self.stdout.write(self.style.SUCCESS(f'{verb} {total} exhibitions.'))
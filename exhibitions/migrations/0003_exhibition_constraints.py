@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:40
+
+import django.db.models.functions.text
+import django.db.models.lookups
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artworks', '0005_artwork_category_constraints'),
+        ('exhibitions', '0002_exhibition_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='exhibition',
+            constraint=models.CheckConstraint(condition=django.db.models.lookups.GreaterThanOrEqual(django.db.models.functions.text.Length('title'), 3), name='exhibition_title_min_length', violation_error_message='The title must be at least 3 characters long.'),
+        ),
+        migrations.AddConstraint(
+            model_name='exhibition',
+            constraint=models.CheckConstraint(condition=django.db.models.lookups.GreaterThanOrEqual(django.db.models.functions.text.Length('description'), 20), name='exhibition_description_min_length', violation_error_message='The description must be at least 20 characters long.'),
+        ),
+        migrations.AddConstraint(
+            model_name='exhibition',
+            constraint=models.CheckConstraint(condition=models.Q(('end_date__gte', models.F('start_date'))), name='exhibition_end_date_after_start_date', violation_error_message='End date must be on or after the start date.'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:58
+
+import django.db.models.deletion
+import django.utils.timezone
+import exhibitions.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artworks', '0007_tags'),
+        ('exhibitions', '0003_exhibition_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedExhibition',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('tagline', models.CharField(blank=True, max_length=300)),
+                ('description', models.TextField()),
+                ('location', models.CharField(max_length=200)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('cover_image_url', models.URLField(blank=True)),
+                ('admission_price', models.DecimalField(decimal_places=2, default=0.0, max_digits=8)),
+                ('is_active', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Archived Exhibition',
+                'verbose_name_plural': 'Archived Exhibitions',
+                'ordering': ['-start_date'],
+            },
+            bases=(exhibitions.models.ExhibitionDatesMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name='ArchivedExhibitionArtwork',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('artwork', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_exhibition_memberships', to='artworks.artwork')),
+                ('exhibition', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='exhibitions.archivedexhibition')),
+            ],
+            options={
+                'verbose_name': 'Archived Exhibition Artwork',
+                'verbose_name_plural': 'Archived Exhibition Artworks',
+            },
+        ),
+        migrations.AddField(
+            model_name='archivedexhibition',
+            name='artworks',
+            field=models.ManyToManyField(blank=True, related_name='archived_exhibitions', through='exhibitions.ArchivedExhibitionArtwork', to='artworks.artwork'),
+        ),
+        migrations.AddConstraint(
+            model_name='archivedexhibitionartwork',
+            constraint=models.UniqueConstraint(fields=('exhibition', 'artwork'), name='archived_exhibition_artwork_unique'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exhibitions', '0004_exhibition_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedexhibition',
+            name='broken_cover_image_url',
+            field=models.URLField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='exhibition',
+            name='broken_cover_image_url',
+            field=models.URLField(blank=True, editable=False, help_text='Set by check_image_urls to the cover image URL when it stopped loading.'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artworks', '0013_public_list_indexes'),
+        ('exhibitions', '0005_broken_cover_image_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exhibition',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-start_date'], name='exhibition_active_start'),
+        ),
+    ]
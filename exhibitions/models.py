@@ -1,9 +1,28 @@
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Length
+from django.db.models.lookups import GreaterThanOrEqual
 from django.core.validators import MinLengthValidator
+from django.utils import timezone
 from artworks.models import Artwork
+from artvault.concurrency import OptimisticLockMixin
 
 
-class Exhibition(models.Model):
+class ExhibitionDatesMixin:
+    """Date helpers shared by live and archived exhibitions."""
+
+    is_archived = False
+
+    def is_ongoing(self):
+        today = timezone.now().date()
+        return self.start_date <= today <= self.end_date
+
+    def get_duration_days(self):
+        delta = self.end_date - self.start_date
+        return delta.days
+
+
+class Exhibition(ExhibitionDatesMixin, OptimisticLockMixin, models.Model):
     title = models.CharField(
         max_length=255,
         validators=[MinLengthValidator(3)],
@@ -34,6 +53,11 @@ class Exhibition(models.Model):
         blank=True,
         help_text='Optional URL to a banner/cover image.',
     )
+    broken_cover_image_url = models.URLField(
+        blank=True,
+        editable=False,
+        help_text='Set by check_image_urls to the cover image URL when it stopped loading.',
+    )
     admission_price = models.DecimalField(
         max_digits=8,
         decimal_places=2,
@@ -45,25 +69,108 @@ class Exhibition(models.Model):
         help_text='Uncheck to hide this exhibition from the public listing.',
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-start_date']
         verbose_name = 'Exhibition'
         verbose_name_plural = 'Exhibitions'
+        # The field validators and clean(), enforced by the database too so
+        # that bulk writes can skip full_clean().
+        constraints = [
+            models.CheckConstraint(
+                condition=GreaterThanOrEqual(Length('title'), 3),
+                name='exhibition_title_min_length',
+                violation_error_message='The title must be at least 3 characters long.',
+            ),
+            models.CheckConstraint(
+                condition=GreaterThanOrEqual(Length('description'), 20),
+                name='exhibition_description_min_length',
+                violation_error_message='The description must be at least 20 characters long.',
+            ),
+            models.CheckConstraint(
+                condition=Q(end_date__gte=F('start_date')),
+                name='exhibition_end_date_after_start_date',
+                violation_error_message='End date must be on or after the start date.',
+            ),
+        ]
+        indexes = [
+            # The public list: active exhibitions, newest first.
+            models.Index(fields=['-start_date'], condition=Q(is_active=True), name='exhibition_active_start'),
+        ]
 
     def __str__(self):
         return self.title
 
-    def is_ongoing(self):
-        from django.utils import timezone
-        today = timezone.now().date()
-        return self.start_date <= today <= self.end_date
-
-    def get_duration_days(self):
-        delta = self.end_date - self.start_date
-        return delta.days
+    @property
+    def display_cover_image_url(self):
+        """The cover image to show: empty if check_image_urls found it broken."""
+        return '' if self.cover_image_url == self.broken_cover_image_url else self.cover_image_url
 
     def clean(self):
         from django.core.exceptions import ValidationError
         if self.start_date and self.end_date and self.end_date < self.start_date:
             raise ValidationError({'end_date': 'End date must be on or after the start date.'})
+
+
+# ─── Archive ─────────────────────────────────────────────────────────────────
+
+class ArchivedExhibition(ExhibitionDatesMixin, models.Model):
+    """A retired exhibition moved out of the live tables by ``manage.py archive_exhibitions``.
+
+    Mirrors ``Exhibition`` field for field and keeps its id, so restoring it
+    brings back the same URLs.
+    """
+
+    is_archived = True
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    tagline = models.CharField(max_length=300, blank=True)
+    description = models.TextField()
+    location = models.CharField(max_length=200)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    artworks = models.ManyToManyField(
+        Artwork,
+        through='ArchivedExhibitionArtwork',
+        related_name='archived_exhibitions',
+        blank=True,
+    )
+    cover_image_url = models.URLField(blank=True)
+    broken_cover_image_url = models.URLField(blank=True)
+    admission_price = models.DecimalField(max_digits=8, decimal_places=2, default=0.00)
+    is_active = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['-start_date']
+        verbose_name = 'Archived Exhibition'
+        verbose_name_plural = 'Archived Exhibitions'
+
+    def __str__(self):
+        return self.title
+
+    @property
+    def display_cover_image_url(self):
+        """The cover image to show: empty if check_image_urls found it broken."""
+        return '' if self.cover_image_url == self.broken_cover_image_url else self.cover_image_url
+
+
+class ArchivedExhibitionArtwork(models.Model):
+    """An archived exhibition's membership row."""
+
+    # Covered by the unique constraint.
+    exhibition = models.ForeignKey(
+        ArchivedExhibition, on_delete=models.CASCADE, related_name='memberships', db_index=False,
+    )
+    artwork = models.ForeignKey(Artwork, on_delete=models.CASCADE, related_name='archived_exhibition_memberships')
+
+    class Meta:
+        verbose_name = 'Archived Exhibition Artwork'
+        verbose_name_plural = 'Archived Exhibition Artworks'
+        constraints = [
+            models.UniqueConstraint(fields=['exhibition', 'artwork'], name='archived_exhibition_artwork_unique'),
+        ]
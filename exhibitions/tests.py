@@ -0,0 +1,64 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .archive import archive_exhibitions, retired_exhibitions
+from .models import ArchivedExhibition, Exhibition
+
+
+# Templates resolve static URLs without running collectstatic first.
+@override_settings(STORAGES={
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class ExhibitionChangelistQueryTests(TestCase):
+    """The exhibition changelist runs a fixed number of queries however large the table is."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_catalogue', artists=50, artworks=300, exhibitions=300, seed=1, stdout=StringIO())
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        # Stand in for a large PostgreSQL table, whose size comes from the planner's estimate.
+        patcher = mock.patch('artvault.paginators.estimated_row_count', return_value=100_000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_changelist(self):
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('admin:exhibitions_exhibition_changelist'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_change_form(self):
+        # The artworks widget is an autocomplete, not a list of every artwork.
+        exhibition = Exhibition.objects.filter(artworks__isnull=False).first()
+        with self.assertNumQueries(8):
+            response = self.client.get(reverse('admin:exhibitions_exhibition_change', args=[exhibition.pk]))
+        self.assertEqual(response.status_code, 200)
+
+
+class ArchiveTests(TestCase):
+    """Archiving re-checks eligibility for exhibitions edited after they were listed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_catalogue', artists=10, artworks=30, exhibitions=20, seed=1, stdout=StringIO())
+        Exhibition.objects.update(is_active=False, start_date='2000-01-01', end_date='2000-02-01')
+
+    def test_exhibition_shown_again_stays_live(self):
+        retired = retired_exhibitions(days=30)
+        pks = list(retired.values_list('pk', flat=True))
+        shown, redated = Exhibition.objects.filter(pk__in=pks[:2])
+        shown.is_active = True
+        shown.save()
+        Exhibition.objects.filter(pk=redated.pk).update(end_date=timezone.now().date())
+        self.assertEqual(sum(archive_exhibitions(pks, chunk_size=5, eligible=retired)), len(pks) - 2)
+        self.assertEqual(set(Exhibition.objects.values_list('pk', flat=True)), {shown.pk, redated.pk})
+        self.assertEqual(ArchivedExhibition.objects.count(), len(pks) - 2)
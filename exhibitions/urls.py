@@ -9,4 +9,6 @@ urlpatterns = [
     path('<int:pk>/', views.ExhibitionDetailView.as_view(), name='detail'),
     path('<int:pk>/edit/', views.ExhibitionUpdateView.as_view(), name='update'),
     path('<int:pk>/delete/', views.ExhibitionDeleteView.as_view(), name='delete'),
+    path('archive/<int:pk>/', views.ArchivedExhibitionDetailView.as_view(), name='archived-detail'),
+    path('archive/<int:pk>/restore/', views.ArchivedExhibitionRestoreView.as_view(), name='archived-restore'),
 ]
@@ -1,7 +1,12 @@
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, View
+from django.views.generic.detail import SingleObjectMixin
 from django.urls import reverse_lazy
 from django.contrib import messages
-from .models import Exhibition
+from django.http import Http404
+from django.shortcuts import redirect
+from artvault.concurrency import VersionedUpdateMixin
+from .archive import LiveAndArchived, restore_exhibitions
+from .models import ArchivedExhibition, Exhibition
 from .forms import ExhibitionForm
 
 
@@ -9,16 +14,23 @@ class ExhibitionListView(ListView):
     model = Exhibition
     template_name = 'exhibitions/exhibition_list.html'
     context_object_name = 'exhibitions'
+    paginate_by = 12
 
     def get_queryset(self):
         status = self.request.GET.get('status', 'active')
         if status == 'all':
-            return Exhibition.objects.prefetch_related('artworks').all()
+            exhibitions = Exhibition.objects.prefetch_related('artworks').all()
+            if self.request.GET.get('archive') == 'include':
+                # Archived exhibitions are all hidden, so only "All" can show them.
+                archived = ArchivedExhibition.objects.prefetch_related('artworks')
+                return LiveAndArchived(exhibitions, archived)
+            return exhibitions
         return Exhibition.objects.filter(is_active=True).prefetch_related('artworks')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['status_filter'] = self.request.GET.get('status', 'active')
+        context['include_archive'] = self.request.GET.get('archive') == 'include'
         return context
 
 
@@ -27,12 +39,42 @@ class ExhibitionDetailView(DetailView):
     template_name = 'exhibitions/exhibition_detail.html'
     context_object_name = 'exhibition'
 
+    def get(self, request, *args, **kwargs):
+        try:
+            return super().get(request, *args, **kwargs)
+        except Http404:
+            # Links to an exhibition keep working after it is archived.
+            if ArchivedExhibition.objects.filter(pk=kwargs['pk']).exists():
+                return redirect('exhibitions:archived-detail', pk=kwargs['pk'])
+            raise
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['artworks'] = self.object.artworks.select_related('artist', 'category').all()
         return context
 
 
+class ArchivedExhibitionDetailView(DetailView):
+    model = ArchivedExhibition
+    template_name = 'exhibitions/exhibition_detail.html'
+    context_object_name = 'exhibition'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['artworks'] = self.object.artworks.select_related('artist', 'category').all()
+        return context
+
+
+class ArchivedExhibitionRestoreView(SingleObjectMixin, View):
+    model = ArchivedExhibition
+
+    def post(self, request, *args, **kwargs):
+        exhibition = self.get_object()
+        list(restore_exhibitions([exhibition.pk]))
+        messages.success(request, f'Exhibition "{exhibition.title}" restored from the archive.')
+        return redirect('exhibitions:detail', pk=exhibition.pk)
+
+
 class ExhibitionCreateView(CreateView):
     model = Exhibition
     form_class = ExhibitionForm
@@ -54,7 +96,7 @@ class ExhibitionCreateView(CreateView):
         return super().form_invalid(form)
 
 
-class ExhibitionUpdateView(UpdateView):
+class ExhibitionUpdateView(VersionedUpdateMixin, UpdateView):
     model = Exhibition
     form_class = ExhibitionForm
     template_name = 'exhibitions/exhibition_form.html'
@@ -66,9 +108,8 @@ class ExhibitionUpdateView(UpdateView):
         context['submit_label'] = 'Save Changes'
         return context
 
-    def form_valid(self, form):
-        messages.success(self.request, f'Exhibition "{form.instance.title}" updated.')
-        return super().form_valid(form)
+    def get_success_message(self, form):
+        return f'Exhibition "{form.instance.title}" updated.'
 
     def form_invalid(self, form):
         messages.error(self.request, 'Please correct the errors below.')
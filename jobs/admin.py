@@ -0,0 +1,30 @@
+from django.contrib import admin, messages
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from artvault.paginators import EstimatedCountPaginator
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name', 'status', 'attempts', 'run_at', 'finished_at', 'worker')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'dedupe_key')
+    readonly_fields = ('created_at', 'started_at', 'finished_at', 'worker', 'last_error')
+    actions = ('retry_jobs',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @admin.action(description='Retry selected failed jobs now')
+    def retry_jobs(self, request, queryset):
+        retried = 0
+        for job in queryset.filter(status=Job.Status.FAILED):
+            try:
+                with transaction.atomic():
+                    retried += Job.objects.filter(pk=job.pk).update(
+                        status=Job.Status.QUEUED, attempts=0, run_at=timezone.now(), finished_at=None,
+                    )
+            except IntegrityError:
+                pass  # The same work is already queued.
+        messages.success(request, f'{retried} job(s) queued again.')
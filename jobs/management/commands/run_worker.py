@@ -0,0 +1,90 @@
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from django.db.models import Count, Min
+
+from jobs.models import Job
+from jobs.queue import claim_job, prune_jobs, requeue_stale_jobs, run_job
+
+HOUSEKEEPING_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs until stopped (Ctrl+C or SIGTERM finishes the running jobs first).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=1, help='Worker threads (default 1).')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds an idle thread waits before looking for jobs again.')
+        parser.add_argument('--burst', action='store_true', help='Exit once no job is due.')
+        parser.add_argument('--stats', action='store_true', help='Print queue counts per task and exit.')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.print_stats()
+            return
+        self.stopping = threading.Event()
+        self.counts = {}
+        self.lock = threading.Lock()
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stopping.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: self.stopping.set())
+
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f'Requeued {requeued} jobs left running by a stopped worker.')
+        name = f'{socket.gethostname()}:{os.getpid()}'
+        threads = [
+            threading.Thread(target=self.work, args=(f'{name}:{i}', options), name=f'job-worker-{i}')
+            for i in range(options['concurrency'])
+        ]
+        self.stdout.write(f'Worker {name} started with {len(threads)} thread(s).')
+        for thread in threads:
+            thread.start()
+        last_housekeeping = time.monotonic()
+        while any(thread.is_alive() for thread in threads):
+            if self.stopping.wait(1):
+                self.stdout.write('Stopping after the running jobs finish…')
+                break
+            if time.monotonic() - last_housekeeping > HOUSEKEEPING_INTERVAL:
+                last_housekeeping = time.monotonic()
+                requeue_stale_jobs()
+                prune_jobs()
+                connections.close_all()
+        for thread in threads:
+            thread.join()
+        summary = ', '.join(f'{count} {outcome}' for outcome, count in sorted(self.counts.items()))
+        self.stdout.write(self.style.SUCCESS(f'Worker stopped. {summary or "No jobs run."}'))
+
+    def work(self, worker, options):
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                job = claim_job(worker)
+                if job is None:
+                    if options['burst']:
+                        return
+                    self.stopping.wait(options['poll_interval'])
+                    continue
+                outcome = run_job(job)
+                with self.lock:
+                    self.counts[outcome] = self.counts.get(outcome, 0) + 1
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'{worker} #{job.pk} {job.name}: {outcome}')
+        finally:
+            connections.close_all()
+
+    def print_stats(self):
+        rows = (
+            Job.objects.order_by().values('name', 'status')
+            .annotate(jobs=Count('pk'), oldest=Min('run_at')).order_by('name', 'status')
+        )
+        self.stdout.write(f'{"task":<56} {"status":<10} {"jobs":>8}  oldest run_at')
+        for row in rows:
+            self.stdout.write(
+                f'{row["name"]:<56} {row["status"]:<10} {row["jobs"]:>8}  {row["oldest"]:%Y-%m-%d %H:%M:%S}'
+            )
@@ -0,0 +1,51 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """A unit of follow-up work queued in the database and run by ``manage.py run_worker``."""
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        SUCCEEDED = 'succeeded', 'Succeeded'
+        FAILED = 'failed', 'Failed'
+
+    name = models.CharField(max_length=200, help_text='Registered task name, e.g. artworks.tasks.extract_artwork_palette.')
+    kwargs = models.JSONField(default=dict, blank=True, help_text='Keyword arguments for the task.')
+    dedupe_key = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text='Jobs queued with the same key collapse into one until it starts running.',
+    )
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now, help_text='Not started before this time.')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    worker = models.CharField(max_length=100, blank=True, help_text='The worker thread running the last attempt.')
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Job'
+        verbose_name_plural = 'Jobs'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedupe_key'],
+                condition=Q(status='queued') & ~Q(dedupe_key=''),
+                name='job_dedupe_queued',
+            ),
+        ]
+        indexes = [
+            # Partial indexes stay as small as the queue, not the job history.
+            models.Index(fields=['run_at'], condition=Q(status='queued'), name='job_ready'),
+            models.Index(fields=['started_at'], condition=Q(status='running'), name='job_running'),
+            models.Index(fields=['status', 'finished_at'], name='job_finished'),
+        ]
+
+    def __str__(self):
+        return f'#{self.pk} {self.name} ({self.status})'
@@ -0,0 +1,166 @@
+"""
+A job queue kept in the application database.
+
+Views and signals ``enqueue()`` follow-up work as ``Job`` rows, written in
+the same transaction as the change that caused them, and ``manage.py
+run_worker`` runs them. Each worker thread claims the oldest due job:
+
+* On PostgreSQL with ``SELECT ... FOR UPDATE SKIP LOCKED``, so concurrent
+  workers pass over each other's rows instead of queueing behind them.
+* Elsewhere (SQLite) by a conditional ``UPDATE ... WHERE status = 'queued'``
+  that only one worker can win; the loser moves on to the next job.
+
+A job that raises is retried after an exponential backoff until it runs
+out of attempts. Jobs queued with the same ``dedupe_key`` collapse into one
+while it waits, so saving an artwork five times queues one job, but a save
+made while the job is running queues a new one. A worker that dies leaves
+its job running; once ``JOBS_LEASE_SECONDS`` pass the job is queued again.
+"""
+import logging
+import random
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from artvault.metrics import record_job
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+def task(func=None, *, max_attempts=None):
+    """Register a function as a task; jobs name it by its dotted path."""
+    def register(func):
+        func.task_name = f'{func.__module__}.{func.__qualname__}'
+        func.max_attempts = max_attempts or settings.JOBS_MAX_ATTEMPTS
+        TASKS[func.task_name] = func
+        return func
+    return register(func) if func is not None else register
+
+
+def enqueue(func, dedupe_key='', delay=None, **kwargs):
+    """Queue ``func(**kwargs)``; kwargs must be JSON-serialisable.
+
+    With a ``dedupe_key``, nothing is added while a job with that key is
+    still queued.
+    """
+    job = Job(
+        name=func.task_name,
+        kwargs=kwargs,
+        dedupe_key=dedupe_key,
+        max_attempts=func.max_attempts,
+        run_at=timezone.now() + (delay or timedelta()),
+    )
+    # ON CONFLICT DO NOTHING / INSERT OR IGNORE against the partial unique index.
+    Job.objects.bulk_create([job], ignore_conflicts=bool(dedupe_key))
+
+
+def backoff(attempts):
+    """Seconds before retry number ``attempts``: doubling from JOBS_RETRY_DELAY, jittered, capped."""
+    delay = min(settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1), settings.JOBS_RETRY_MAX_DELAY)
+    return delay * random.uniform(0.75, 1.25)
+
+
+# ─── Workers ─────────────────────────────────────────────────────────────────
+
+def _claim_fields(worker, now):
+    return {'status': Job.Status.RUNNING, 'worker': worker, 'started_at': now, 'attempts': F('attempts') + 1}
+
+
+def claim_job(worker):
+    """Mark the oldest due job as running for ``worker`` and return it, or None."""
+    now = timezone.now()
+    due = Job.objects.filter(status=Job.Status.QUEUED, run_at__lte=now).order_by('run_at', 'pk')
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = due.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            Job.objects.filter(pk=job.pk).update(**_claim_fields(worker, now))
+    else:
+        for job in due[:10]:
+            if Job.objects.filter(pk=job.pk, status=Job.Status.QUEUED).update(**_claim_fields(worker, now)):
+                break
+        else:
+            return None
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job):
+    """Run a claimed job and record its outcome: succeeded, retried or failed."""
+    func = TASKS.get(job.name)
+    started = time.perf_counter()
+    try:
+        if func is None:
+            raise LookupError(f'No task registered as {job.name!r}.')
+        func(**job.kwargs)
+    except Exception:  # noqa: BLE001 - any failure is recorded on the job and retried
+        error = traceback.format_exc()
+        outcome = _fail(job, error)
+        logger.warning('Job %s (%s) %s after attempt %d:\n%s', job.pk, job.name, outcome, job.attempts, error)
+    else:
+        outcome = 'succeeded'
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.SUCCEEDED, finished_at=timezone.now(), last_error='',
+        )
+    record_job(job.name, outcome, time.perf_counter() - started, (job.started_at - job.run_at).total_seconds())
+    return outcome
+
+
+def _fail(job, error):
+    now = timezone.now()
+    if job.attempts >= job.max_attempts:
+        Job.objects.filter(pk=job.pk).update(status=Job.Status.FAILED, finished_at=now, last_error=error)
+        return 'failed'
+    try:
+        with transaction.atomic():
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.Status.QUEUED,
+                run_at=now + timedelta(seconds=backoff(job.attempts)),
+                last_error=error,
+            )
+    except IntegrityError:
+        # The same work was queued again while this attempt ran; that job
+        # will do it, so this one is dropped instead of retried.
+        Job.objects.filter(pk=job.pk).delete()
+        return 'superseded'
+    return 'retried'
+
+
+def requeue_stale_jobs():
+    """Queue again the jobs of workers that stopped mid-job; returns how many."""
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.Status.RUNNING, started_at__lt=now - timedelta(seconds=settings.JOBS_LEASE_SECONDS),
+    )
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.Status.FAILED, finished_at=now, last_error='Worker stopped before the job finished.',
+    )
+    requeued = 0
+    for pk in stale.values_list('pk', flat=True):
+        try:
+            with transaction.atomic():
+                requeued += Job.objects.filter(pk=pk, status=Job.Status.RUNNING).update(
+                    status=Job.Status.QUEUED, run_at=now,
+                )
+        except IntegrityError:
+            Job.objects.filter(pk=pk).delete()
+    return failed + requeued
+
+
+def prune_jobs(days=None):
+    """Delete jobs that succeeded more than ``days`` ago; failed jobs are kept for inspection."""
+    days = settings.JOBS_KEEP_DAYS if days is None else days
+    deleted, _ = Job.objects.filter(
+        status=Job.Status.SUCCEEDED, finished_at__lt=timezone.now() - timedelta(days=days),
+    ).delete()
+    return deleted
@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import SavedSearch, SavedSearchMatch
+
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ('name', 'q', 'category', 'on_display', 'tags', 'created_at')
+    list_filter = ('on_display',)
+    list_select_related = ('category',)
+    search_fields = ('name', 'q', 'tags')
+    autocomplete_fields = ('category',)
+    readonly_fields = ('term_key', 'created_at')
+
+
+@admin.register(SavedSearchMatch)
+class SavedSearchMatchAdmin(admin.ModelAdmin):
+    list_display = ('saved_search', 'artwork', 'matched_at')
+    list_select_related = ('saved_search', 'artwork')
+    raw_id_fields = ('saved_search', 'artwork')
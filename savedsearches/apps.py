@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SavedsearchesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'savedsearches'
+    verbose_name = 'Saved Searches'
+
+    def ready(self):
+        from . import signals  # noqa: F401
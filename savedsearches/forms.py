@@ -0,0 +1,54 @@
+from django import forms
+
+from artworks.forms import CategoryChoiceField
+from artworks.tagging import parse_tag_query
+
+from .models import SavedSearch
+
+
+class SavedSearchForm(forms.ModelForm):
+    """Saves the artwork list's filters; its GET parameters are accepted as initial data."""
+
+    class Meta:
+        model = SavedSearch
+        fields = ['name', 'q', 'category', 'on_display', 'tags']
+        field_classes = {'category': CategoryChoiceField}
+        widgets = {
+            'name': forms.TextInput(attrs={
+                'class': 'form-control',
+                'placeholder': 'e.g. New Impressionist landscapes',
+            }),
+            'q': forms.TextInput(attrs={
+                'class': 'form-control',
+                'placeholder': 'Search title or description…',
+            }),
+            'category': forms.Select(attrs={'class': 'form-select'}),
+            'on_display': forms.Select(attrs={'class': 'form-select'}),
+            'tags': forms.TextInput(attrs={
+                'class': 'form-control',
+                'placeholder': 'landscape, oil | tempera, -portrait',
+            }),
+        }
+        labels = {
+            'q': 'Search Text',
+            'on_display': 'Display Status',
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['category'].empty_label = 'All Categories'
+        self.fields['on_display'].choices = [('', 'All'), *SavedSearch.Display.choices]
+
+    def clean_q(self):
+        return ' '.join(self.cleaned_data['q'].split())
+
+    def clean_tags(self):
+        tags = self.cleaned_data['tags']
+        parse_tag_query(tags)
+        return tags
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not any(cleaned_data.get(field) for field in ('q', 'category', 'on_display', 'tags')):
+            raise forms.ValidationError('Choose at least one filter to save; this search would match everything.')
+        return cleaned_data
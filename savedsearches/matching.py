@@ -0,0 +1,83 @@
+"""
+Incremental matching of saved searches against one artwork at a time.
+
+Re-running every saved search whenever an artwork is saved costs
+O(saved searches × catalogue). Instead each search is indexed by its
+``(term_key, category, on_display)`` predicate and a saved artwork asks
+the index for the few searches it could possibly satisfy:
+
+* ``term_key`` is up to three characters of the search text (from its
+  longest word), so a match must contain that gram. The artwork supplies
+  the set of every 1-, 2- and 3-gram of its title and description words;
+  searches without text have an empty key.
+* ``category`` must be empty or one of the artwork's category ancestors,
+  read straight off ``Category.path``.
+* ``on_display`` must be empty or equal to the artwork's display flag.
+
+Only those candidates are checked in full (the whole search text and the
+tag query) before their matches are recorded.
+"""
+from django.db.models import Q
+from django.utils import timezone
+
+from artworks.models import Artwork
+from artworks.tagging import parse_tag_query
+
+from .models import SavedSearch, SavedSearchMatch
+
+GRAM_SIZE = 3
+
+
+def term_key(q):
+    """The indexed gram of a search text: the start of its longest word."""
+    words = q.lower().split()
+    return max(words, key=len)[:GRAM_SIZE] if words else ''
+
+
+def text_keys(*texts):
+    """Every gram of up to three characters inside the words of ``texts``."""
+    keys = set()
+    for text in texts:
+        for word in set(text.lower().split()):
+            for size in range(1, GRAM_SIZE + 1):
+                keys.update(word[start:start + size] for start in range(len(word) - size + 1))
+    return keys
+
+
+def candidate_searches(artwork):
+    """Saved searches whose indexed predicate admits ``artwork``."""
+    category_ids = artwork.category.path_ids() if artwork.category_id else []
+    return SavedSearch.objects.filter(
+        Q(category__isnull=True) | Q(category_id__in=category_ids),
+        term_key__in=text_keys(artwork.title, artwork.description) | {''},
+        on_display__in=['', SavedSearch.Display.YES if artwork.is_on_display else SavedSearch.Display.NO],
+    )
+
+
+def matches(search, artwork, tag_names):
+    """Whether ``artwork`` (with tags ``tag_names``) satisfies the rest of ``search``."""
+    q = search.q.lower()
+    if q and q not in artwork.title.lower() and q not in artwork.description.lower():
+        return False
+    if search.tags:
+        groups, excluded = parse_tag_query(search.tags)
+        if excluded & tag_names or not all(group & tag_names for group in groups):
+            return False
+    return True
+
+
+def match_artwork(artwork_pk):
+    """Record the saved searches a newly added or edited artwork matches; returns how many."""
+    artwork = Artwork.objects.select_related('category').filter(pk=artwork_pk).first()
+    if artwork is None:
+        return 0
+    tag_names = set(artwork.tags.values_list('name', flat=True))
+    now = timezone.now()
+    found = [
+        SavedSearchMatch(saved_search=search, artwork=artwork, matched_at=now)
+        for search in candidate_searches(artwork).only('q', 'tags').iterator()
+        if matches(search, artwork, tag_names)
+    ]
+    # An artwork edited again keeps its first match, so it is not re-announced.
+    SavedSearchMatch.objects.bulk_create(found, ignore_conflicts=True, batch_size=1000)
+    return len(found)
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:52
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('artworks', '0007_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='A name to recognise this search by.', max_length=100)),
+                ('q', models.CharField(blank=True, help_text='Text that must appear in the title or description.', max_length=200)),
+                ('on_display', models.CharField(blank=True, choices=[('yes', 'On Display'), ('no', 'Not on Display')], max_length=3)),
+                ('tags', models.CharField(blank=True, help_text='Tag query, as on the artwork list (e.g. "landscape, oil | tempera, -portrait").', max_length=200)),
+                ('term_key', models.CharField(blank=True, editable=False, help_text='Up to three characters every match must contain; indexes the search text.', max_length=3)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_viewed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('category', models.ForeignKey(blank=True, help_text='Matches this category and its subcategories.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to='artworks.category')),
+            ],
+            options={
+                'verbose_name': 'Saved Search',
+                'verbose_name_plural': 'Saved Searches',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedSearchMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('matched_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('artwork', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_search_matches', to='artworks.artwork')),
+                ('saved_search', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='savedsearches.savedsearch')),
+            ],
+            options={
+                'verbose_name': 'Saved Search Match',
+                'verbose_name_plural': 'Saved Search Matches',
+                'ordering': ['-matched_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=models.Index(fields=['term_key', 'category', 'on_display'], name='savedsearch_predicate'),
+        ),
+        migrations.AddIndex(
+            model_name='savedsearchmatch',
+            index=models.Index(fields=['saved_search', '-matched_at'], name='savedsearch_match_recent'),
+        ),
+        migrations.AddConstraint(
+            model_name='savedsearchmatch',
+            constraint=models.UniqueConstraint(fields=('saved_search', 'artwork'), name='savedsearch_match_unique'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+from urllib.parse import urlencode
+
+from django.db import models
+from django.utils import timezone
+
+from artworks.models import Artwork, Category
+
+
+class SavedSearch(models.Model):
+    """An artwork list filter saved by a collector and matched against every new or edited artwork."""
+
+    class Display(models.TextChoices):
+        YES = 'yes', 'On Display'
+        NO = 'no', 'Not on Display'
+
+    name = models.CharField(max_length=100, help_text='A name to recognise this search by.')
+    q = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text='Text that must appear in the title or description.',
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='saved_searches',
+        help_text='Matches this category and its subcategories.',
+    )
+    on_display = models.CharField(max_length=3, choices=Display.choices, blank=True)
+    tags = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text='Tag query, as on the artwork list (e.g. "landscape, oil | tempera, -portrait").',
+    )
+    term_key = models.CharField(
+        max_length=3,
+        blank=True,
+        editable=False,
+        help_text='Up to three characters every match must contain; indexes the search text.',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_viewed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Saved Search'
+        verbose_name_plural = 'Saved Searches'
+        indexes = [
+            # The matcher looks up candidates by these three, most selective first.
+            models.Index(fields=['term_key', 'category', 'on_display'], name='savedsearch_predicate'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        from .matching import term_key
+        self.term_key = term_key(self.q)
+        super().save(*args, **kwargs)
+
+    def get_query_string(self):
+        """The artwork list query this search was saved from."""
+        params = {
+            'q': self.q, 'category': self.category_id or '', 'on_display': self.on_display, 'tags': self.tags,
+        }
+        return urlencode({key: value for key, value in params.items() if value})
+
+
+class SavedSearchMatch(models.Model):
+    """An artwork that matched a saved search when it was added or edited."""
+
+    # Covered by the unique constraint and the recent-matches index.
+    saved_search = models.ForeignKey(
+        SavedSearch, on_delete=models.CASCADE, related_name='matches', db_index=False,
+    )
+    artwork = models.ForeignKey(Artwork, on_delete=models.CASCADE, related_name='saved_search_matches')
+    matched_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-matched_at']
+        verbose_name = 'Saved Search Match'
+        verbose_name_plural = 'Saved Search Matches'
+        constraints = [
+            models.UniqueConstraint(fields=['saved_search', 'artwork'], name='savedsearch_match_unique'),
+        ]
+        indexes = [models.Index(fields=['saved_search', '-matched_at'], name='savedsearch_match_recent')]
+
+    def __str__(self):
+        return f'{self.artwork_id} matched {self.saved_search_id}'
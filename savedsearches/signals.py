@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from artworks.models import Artwork
+from jobs.queue import enqueue
+
+from .tasks import match_saved_searches
+
+
+@receiver(post_save, sender=Artwork)
+def queue_saved_search_matching(sender, instance, raw=False, **kwargs):
+    # The job is written in the same transaction, so the worker sees the
+    # artwork's tags too. Repeated saves share one queued job.
+    if not raw:
+        enqueue(match_saved_searches, dedupe_key=f'match:{instance.pk}', artwork_pk=instance.pk)
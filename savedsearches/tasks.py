@@ -0,0 +1,8 @@
+from jobs.queue import task
+
+from .matching import match_artwork
+
+
+@task
+def match_saved_searches(artwork_pk):
+    match_artwork(artwork_pk)
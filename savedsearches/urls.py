@@ -0,0 +1,11 @@
+from django.urls import path
+from . import views
+
+app_name = 'savedsearches'
+
+urlpatterns = [
+    path('', views.SavedSearchListView.as_view(), name='list'),
+    path('add/', views.SavedSearchCreateView.as_view(), name='create'),
+    path('<int:pk>/', views.SavedSearchDetailView.as_view(), name='detail'),
+    path('<int:pk>/delete/', views.SavedSearchDeleteView.as_view(), name='delete'),
+]
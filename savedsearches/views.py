@@ -0,0 +1,74 @@
+from django.contrib import messages
+from django.db.models import Count, F, Q
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.views.generic import CreateView, DeleteView, DetailView, ListView
+
+from .forms import SavedSearchForm
+from .models import SavedSearch
+
+
+class SavedSearchListView(ListView):
+    model = SavedSearch
+    template_name = 'savedsearches/savedsearch_list.html'
+    context_object_name = 'saved_searches'
+    paginate_by = 20
+
+    def get_queryset(self):
+        return SavedSearch.objects.select_related('category').annotate(
+            new_match_count=Count('matches', filter=Q(matches__matched_at__gt=F('last_viewed_at'))),
+        ).order_by('name')
+
+
+class SavedSearchDetailView(DetailView):
+    model = SavedSearch
+    template_name = 'savedsearches/savedsearch_detail.html'
+    context_object_name = 'saved_search'
+    match_limit = 24
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['matches'] = (
+            self.object.matches.select_related('artwork__artist', 'artwork__category')[:self.match_limit]
+        )
+        context['match_count'] = self.object.matches.count()
+        context['last_viewed_at'] = self.object.last_viewed_at
+        # Everything shown now counts as seen.
+        SavedSearch.objects.filter(pk=self.object.pk).update(last_viewed_at=timezone.now())
+        return context
+
+
+class SavedSearchCreateView(CreateView):
+    model = SavedSearch
+    form_class = SavedSearchForm
+    template_name = 'savedsearches/savedsearch_form.html'
+
+    def get_initial(self):
+        # Arrives from the artwork list with its filters in the query string.
+        initial = super().get_initial()
+        for field in ('q', 'category', 'on_display', 'tags'):
+            if self.request.GET.get(field):
+                initial[field] = self.request.GET[field]
+        return initial
+
+    def get_success_url(self):
+        return reverse('savedsearches:detail', kwargs={'pk': self.object.pk})
+
+    def form_valid(self, form):
+        messages.success(
+            self.request, f'Saved search "{form.instance.name}" created. New matching artworks will appear here.',
+        )
+        return super().form_valid(form)
+
+
+class SavedSearchDeleteView(DeleteView):
+    model = SavedSearch
+    template_name = 'savedsearches/savedsearch_confirm_delete.html'
+    success_url = reverse_lazy('savedsearches:list')
+    context_object_name = 'saved_search'
+
+    def form_valid(self, form):
+        name = self.object.name
+        result = super().form_valid(form)
+        messages.success(self.request, f'Saved search "{name}" deleted.')
+        return result
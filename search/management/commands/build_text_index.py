@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from search.text_index import CORPORA, build_text_index
+
+
+class Command(BaseCommand):
+    help = 'Vectorize artwork descriptions and artist biographies into the on-disk text index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('corpus', nargs='*', help=f'One of {", ".join(CORPORA)}; defaults to all.')
+        parser.add_argument('--min-df', type=int, default=1, help='Drop terms found in fewer documents.')
+
+    def handle(self, *args, **options):
+        unknown = set(options['corpus']) - set(CORPORA)
+        if unknown:
+            raise CommandError(f'Unknown corpus: {", ".join(sorted(unknown))}')
+        for corpus in options['corpus'] or CORPORA:
+            started = time.perf_counter()
+            documents, terms = build_text_index(corpus, min_df=options['min_df'])
+            self.stdout.write(self.style.SUCCESS(
+                f'{corpus}: {documents} documents, {terms} terms in {time.perf_counter() - started:.2f}s'
+            ))
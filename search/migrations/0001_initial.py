@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TextIndexDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('corpus', models.CharField(max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('weights', models.JSONField(default=dict, help_text='Term id to weight; empty when the document was deleted.')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Text Index Delta',
+                'verbose_name_plural': 'Text Index Deltas',
+                'constraints': [models.UniqueConstraint(fields=('corpus', 'object_id'), name='unique_text_index_delta')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='textindexdelta',
+            name='build',
+            field=models.CharField(blank=True, help_text='Index build whose term ids the weights use.', max_length=64),
+        ),
+    ]
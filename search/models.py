@@ -0,0 +1,28 @@
+from django.db import models
+
+
+class TextIndexDelta(models.Model):
+    """Term weights for a document edited since its text index was last built."""
+
+    corpus = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    weights = models.JSONField(
+        default=dict,
+        help_text='Term id to weight; empty when the document was deleted.',
+    )
+    build = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text='Index build whose term ids the weights use.',
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Text Index Delta'
+        verbose_name_plural = 'Text Index Deltas'
+        constraints = [
+            models.UniqueConstraint(fields=['corpus', 'object_id'], name='unique_text_index_delta'),
+        ]
+
+    def __str__(self):
+        return f'{self.corpus}:{self.object_id}'
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from artists.models import Artist
+from artworks.models import Artwork
+
+from .text_index import CORPORA, record_deletion, record_delta
+
+CORPUS_BY_MODEL = {Artwork: 'artworks', Artist: 'artists'}
+
+
+@receiver(post_save, sender=Artwork)
+@receiver(post_save, sender=Artist)
+def update_text_index(sender, instance, update_fields=None, **kwargs):
+    corpus = CORPUS_BY_MODEL[sender]
+    _model, fields = CORPORA[corpus]
+    if update_fields is not None and not set(fields) & set(update_fields):
+        return
+    record_delta(corpus, instance)
+
+
+@receiver(post_delete, sender=Artwork)
+@receiver(post_delete, sender=Artist)
+def remove_from_text_index(sender, instance, **kwargs):
+    record_deletion(CORPUS_BY_MODEL[sender], instance.pk)
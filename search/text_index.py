@@ -0,0 +1,283 @@
+"""
+TF-IDF index over artwork descriptions and artist biographies.
+
+``build_text_index`` writes each corpus as a pair of sparse matrices (CSR,
+one row per document, and CSC, one posting list per term) into flat binary
+files that queries memory-map. Documents edited after a build are kept as
+``TextIndexDelta`` rows and override the on-disk rows until the next build.
+A delta's term ids belong to the build it was written against, so queries
+ignore deltas from other builds, and a rebuild re-vectorizes the documents
+edited while it ran against the new vocabulary.
+"""
+import json
+import math
+import mmap
+import re
+import shutil
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from heapq import nlargest
+
+from django.apps import apps
+from django.conf import settings
+from django.utils import timezone
+
+CORPORA = {
+    'artworks': ('artworks.Artwork', ('title', 'medium', 'description')),
+    'artists': ('artists.Artist', ('name', 'nationality', 'biography')),
+}
+
+ARRAYS = {
+    'pks': 'q',
+    'row_ptr': 'q',
+    'row_terms': 'i',
+    'row_weights': 'f',
+    'term_ptr': 'q',
+    'term_rows': 'i',
+    'term_weights': 'f',
+}
+
+TOKEN_RE = re.compile(r'[^\W\d_]{2,}|\d{4}')
+STOP_WORDS = frozenset('''
+    a an and are as at be but by for from has have he her his in into is it its of on or she
+    that the their them they this to was were which while who with
+'''.split())
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def document_text(instance, corpus):
+    _model, fields = CORPORA[corpus]
+    return ' '.join(str(getattr(instance, field) or '') for field in fields)
+
+
+def index_root():
+    return settings.TEXT_INDEX_DIR
+
+
+def _normalise(vector):
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if not norm:
+        return {}
+    return {term: weight / norm for term, weight in vector.items()}
+
+
+def _map(path, typecode):
+    with open(path, 'rb') as fh:
+        try:
+            buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped.
+            return memoryview(array(typecode))
+    return memoryview(buffer).cast(typecode)
+
+
+class TextIndex:
+    """A read-only, memory-mapped build of one corpus."""
+
+    def __init__(self, corpus, build):
+        self.corpus = corpus
+        self.build = build
+        path = index_root() / build
+        meta = json.loads((path / 'meta.json').read_text())
+        self.idf = meta['idf']
+        self.vocabulary = {term: i for i, term in enumerate(meta['terms'])}
+        for name, typecode in ARRAYS.items():
+            setattr(self, name, _map(path / f'{name}.bin', typecode))
+
+    def vectorize(self, text):
+        counts = Counter(
+            self.vocabulary[token] for token in tokenize(text) if token in self.vocabulary
+        )
+        return _normalise({
+            term: (1 + math.log(tf)) * self.idf[term] for term, tf in counts.items()
+        })
+
+    def row_vector(self, pk):
+        row = bisect_left(self.pks, pk)
+        if row == len(self.pks) or self.pks[row] != pk:
+            return {}
+        lo, hi = self.row_ptr[row], self.row_ptr[row + 1]
+        return dict(zip(self.row_terms[lo:hi], self.row_weights[lo:hi]))
+
+    def scores(self, vector, deltas):
+        """Cosine similarity of ``vector`` against every document with a shared term."""
+        accumulator = defaultdict(float)
+        for term, query_weight in vector.items():
+            lo, hi = self.term_ptr[term], self.term_ptr[term + 1]
+            for row, weight in zip(self.term_rows[lo:hi], self.term_weights[lo:hi]):
+                accumulator[row] += query_weight * weight
+        scores = {
+            self.pks[row]: score for row, score in accumulator.items()
+            if self.pks[row] not in deltas
+        }
+        for pk, weights in deltas.items():
+            score = sum(weight * weights.get(term, 0.0) for term, weight in vector.items())
+            if score > 0:
+                scores[pk] = score
+        return scores
+
+
+_loaded = {}
+
+
+def load_text_index(corpus):
+    """The current build of ``corpus``, or None if it has never been built."""
+    try:
+        build = (index_root() / f'{corpus}.current').read_text().strip()
+    except FileNotFoundError:
+        return None
+    index = _loaded.get(corpus)
+    if index is None or index.build != build:
+        index = _loaded[corpus] = TextIndex(corpus, build)
+    return index
+
+
+def _load_deltas(index):
+    """Edited documents of ``index``'s corpus; deletions apply to any build, term weights only to their own."""
+    from .models import TextIndexDelta
+    rows = TextIndexDelta.objects.filter(corpus=index.corpus).values_list('object_id', 'weights', 'build')
+    return {
+        object_id: {int(term): weight for term, weight in weights.items()}
+        for object_id, weights, build in rows
+        if build == index.build or not weights
+    }
+
+
+def _ranked(scores, limit):
+    return nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+
+
+def search(corpus, text, limit=20):
+    """Rank documents in ``corpus`` against free text; returns (pk, score) pairs."""
+    index = load_text_index(corpus)
+    if index is None:
+        return []
+    vector = index.vectorize(text)
+    if not vector:
+        return []
+    return _ranked(index.scores(vector, _load_deltas(index)), limit)
+
+
+def more_like_this(corpus, pk, limit=8):
+    """Documents whose text is closest to document ``pk``; returns (pk, score) pairs."""
+    index = load_text_index(corpus)
+    if index is None:
+        return []
+    deltas = _load_deltas(index)
+    vector = deltas[pk] if pk in deltas else index.row_vector(pk)
+    scores = index.scores(vector, deltas)
+    scores.pop(pk, None)
+    return _ranked(scores, limit)
+
+
+def record_delta(corpus, instance):
+    """Re-vectorize one saved document against the current build."""
+    from .models import TextIndexDelta
+    index = load_text_index(corpus)
+    if index is None:
+        return
+    weights = index.vectorize(document_text(instance, corpus))
+    TextIndexDelta.objects.update_or_create(
+        corpus=corpus, object_id=instance.pk, defaults={'weights': weights, 'build': index.build},
+    )
+
+
+def record_deletion(corpus, pk):
+    from .models import TextIndexDelta
+    index = load_text_index(corpus)
+    if index is None:
+        return
+    TextIndexDelta.objects.update_or_create(
+        corpus=corpus, object_id=pk, defaults={'weights': {}, 'build': index.build},
+    )
+
+
+def build_text_index(corpus, min_df=1):
+    """Vectorize a whole corpus into a new build and make it current."""
+    from .models import TextIndexDelta
+    started = timezone.now()
+    model_label, fields = CORPORA[corpus]
+    rows = (
+        apps.get_model(model_label).objects.order_by('pk')
+        .values_list('pk', *fields).iterator(chunk_size=5000)
+    )
+    pks = array('q')
+    documents = []
+    document_frequency = Counter()
+    for pk, *values in rows:
+        counts = Counter(tokenize(' '.join(str(value or '') for value in values)))
+        pks.append(pk)
+        documents.append(counts)
+        document_frequency.update(counts.keys())
+
+    terms = sorted(term for term, df in document_frequency.items() if df >= min_df)
+    vocabulary = {term: i for i, term in enumerate(terms)}
+    total = len(documents)
+    idf = [math.log((1 + total) / (1 + document_frequency[term])) + 1 for term in terms]
+
+    row_ptr, row_terms, row_weights = array('q', [0]), array('i'), array('f')
+    postings = [0] * len(terms)
+    for counts in documents:
+        vector = _normalise({
+            vocabulary[term]: (1 + math.log(tf)) * idf[vocabulary[term]]
+            for term, tf in counts.items() if term in vocabulary
+        })
+        for term in sorted(vector):
+            row_terms.append(term)
+            row_weights.append(vector[term])
+            postings[term] += 1
+        row_ptr.append(len(row_terms))
+    del documents
+
+    # Transpose CSR into CSC so queries walk one posting list per term.
+    term_ptr = array('q', [0])
+    for n in postings:
+        term_ptr.append(term_ptr[-1] + n)
+    term_rows = array('i', [0]) * len(row_terms)
+    term_weights = array('f', [0.0]) * len(row_terms)
+    cursor = list(term_ptr[:-1])
+    for row in range(total):
+        for i in range(row_ptr[row], row_ptr[row + 1]):
+            term = row_terms[i]
+            term_rows[cursor[term]] = row
+            term_weights[cursor[term]] = row_weights[i]
+            cursor[term] += 1
+
+    build = f'{corpus}-{time.time_ns()}'
+    path = index_root() / build
+    path.mkdir(parents=True)
+    (path / 'meta.json').write_text(json.dumps({'terms': terms, 'idf': idf}))
+    arrays = {
+        'pks': pks, 'row_ptr': row_ptr, 'row_terms': row_terms, 'row_weights': row_weights,
+        'term_ptr': term_ptr, 'term_rows': term_rows, 'term_weights': term_weights,
+    }
+    for name, values in arrays.items():
+        with open(path / f'{name}.bin', 'wb') as fh:
+            values.tofile(fh)
+
+    pointer = index_root() / f'{corpus}.current'
+    previous = pointer.read_text().strip() if pointer.exists() else None
+    staged = index_root() / f'{corpus}.current.tmp'
+    staged.write_text(build)
+    staged.replace(pointer)
+    TextIndexDelta.objects.filter(corpus=corpus, updated_at__lt=started).delete()
+    # Edits that landed while this build was reading rows were vectorized
+    # against the previous vocabulary; redo them against this one.
+    # Deletions hold no term ids and stay as they are.
+    edited = (
+        TextIndexDelta.objects.filter(corpus=corpus).exclude(build=build).exclude(weights={})
+        .values_list('object_id', flat=True)
+    )
+    for instance in apps.get_model(model_label).objects.filter(pk__in=list(edited)):
+        record_delta(corpus, instance)
+
+    # Keep the previous build for workers that still have it mapped.
+    for stale in index_root().glob(f'{corpus}-*'):
+        if stale.name not in (build, previous):
+            shutil.rmtree(stale, ignore_errors=True)
+    return total, len(terms)
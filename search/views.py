@@ -0,0 +1,52 @@
+from django.views.generic import DetailView, TemplateView
+from artists.models import Artist
+from artworks.models import Artwork
+from .text_index import more_like_this, search
+
+
+def _ranked_objects(queryset, ranking):
+    """Fetch ranked pks in one query, keeping rank order and attaching scores."""
+    objects = queryset.in_bulk([pk for pk, _score in ranking])
+    results = []
+    for pk, score in ranking:
+        if pk in objects:
+            objects[pk].score = score
+            results.append(objects[pk])
+    return results
+
+
+class SearchView(TemplateView):
+    template_name = 'search/search_results.html'
+    result_limit = 24
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        q = self.request.GET.get('q', '').strip()
+        context['search_query'] = q
+        context['artworks'] = []
+        context['artists'] = []
+        if q:
+            context['artworks'] = _ranked_objects(
+                Artwork.objects.select_related('artist', 'category'),
+                search('artworks', q, limit=self.result_limit),
+            )
+            context['artists'] = _ranked_objects(
+                Artist.objects.all(),
+                search('artists', q, limit=self.result_limit),
+            )
+        return context
+
+
+class SimilarArtworksView(DetailView):
+    model = Artwork
+    template_name = 'search/similar_artworks.html'
+    context_object_name = 'artwork'
+    result_limit = 12
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['similar_artworks'] = _ranked_objects(
+            Artwork.objects.select_related('artist', 'category'),
+            more_like_this('artworks', self.object.pk, limit=self.result_limit),
+        )
+        return context